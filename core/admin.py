@@ -1,7 +1,72 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.db.models import Avg, Count, Max, Q
+from django.db.models.expressions import RawSQL
 from django.forms import BaseInlineFormSet
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
 
-from .models import Category, SeriesCategory, ModelCategory, Product, ProductImage, ProductVideo
+from . import profiling, search, stock
+from .catalog_io import CONTENT_TYPES, CatalogImportError, detect_format, export_rows, import_catalog, iter_csv
+from .models import (
+    Category, SeriesCategory, ModelCategory, Product, ProductImage, ProductVideo, ProfileCapture, StockMovement,
+)
+from .taxonomy import taxonomy_tree
+
+
+# ======================
+# Kategori Ağacı Filtreleri
+# ======================
+
+class TaxonomyListFilter(admin.SimpleListFilter):
+    """
+    Seçenekler core.taxonomy ağacından gelir; RelatedFieldListFilter gibi her
+    liste sayfasında ilişkili tabloları (seri__kategori JOIN'i dahil) sorgulamaz.
+    Üst düzey seçiliyse yalnızca onun altındaki düğümler listelenir.
+    """
+    level = None
+    parent_level = None
+
+    def lookups(self, request, model_admin):
+        tree = taxonomy_tree()
+        parent = None
+        if self.parent_level and request.GET.get(self.parent_level, '').isdigit():
+            parent = tree.get(self.parent_level, int(request.GET[self.parent_level]))
+        # ürün listesinde düğüm başına ürün sayısı da gösterilir
+        with_counts = model_admin.model is Product
+        return [
+            (node.pk, f'{node.name} ({node.product_count})' if with_counts else node.name)
+            for node in tree.choices(self.level, parent)
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset
+        if not self.value().isdigit():
+            raise IncorrectLookupParameters(self.value())
+        return queryset.filter(**{f'{self.level}_id': int(self.value())})
+
+
+class CategoryFilter(TaxonomyListFilter):
+    title = 'Kategori'
+    parameter_name = level = 'category'
+
+
+class SeriesFilter(TaxonomyListFilter):
+    title = 'Seri'
+    parameter_name = level = 'series'
+    parent_level = 'category'
+
+
+class ModelFilter(TaxonomyListFilter):
+    title = 'Model'
+    parameter_name = level = 'model'
+    parent_level = 'series'
 
 
 # ======================
@@ -33,7 +98,8 @@ class ProductImageInline(admin.TabularInline):
 class ProductVideoInline(admin.TabularInline):
     model = ProductVideo
     extra = 0
-    fields = ('video', 'alt_text')
+    fields = ('video', 'alt_text', 'duration', 'width', 'height', 'is_processed')
+    readonly_fields = ('duration', 'width', 'height', 'is_processed')
     verbose_name = "Ürün Videosu"
     verbose_name_plural = "Ürün Videoları"
 
@@ -42,18 +108,41 @@ class ProductVideoInline(admin.TabularInline):
 # Ürün Admini
 # ======================
 
+class CatalogImportForm(forms.Form):
+    file = forms.FileField(label="Dosya", help_text="CSV, XLSX ya da JSONL; stok koduna (sku) göre eşleştirilir.")
+    images = forms.FileField(label="Görseller (zip)", required=False)
+
+
+class StockAdjustForm(forms.Form):
+    # depo API'siyle aynı sınır; büyük değer SQLite INTEGER'ı taşırır
+    delta = forms.IntegerField(label="Miktar", help_text="Eklenecek (+) ya da düşülecek (-) adet.",
+                               min_value=-stock.MAX_DELTA, max_value=stock.MAX_DELTA)
+    reason = forms.ChoiceField(label="Neden", choices=StockMovement.REASON_CHOICES, initial=StockMovement.MANUAL)
+    note = forms.CharField(label="Not", max_length=255, required=False)
+    allow_negative = forms.BooleanField(label="Eksi stoka izin ver", required=False)
+
+    def clean_delta(self):
+        if self.cleaned_data['delta'] == 0:
+            raise forms.ValidationError("Miktar sıfır olamaz.")
+        return self.cleaned_data['delta']
+
+
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     inlines = [ProductImageInline, ProductVideoInline]
+    change_list_template = 'admin/core/product/change_list.html'
+    actions = ['export_csv', 'adjust_stock']
 
-    list_display = ('name', 'category', 'series', 'model', 'stock', 'updated')
-    list_filter = ('category', 'series', 'model')
-    search_fields = ('name', 'category__name', 'series__name', 'description')
+    list_display = ('name', 'sku', 'category', 'series', 'model', 'stock', 'updated')
+    list_filter = (CategoryFilter, SeriesFilter, ModelFilter)
+    search_fields = ('name', 'sku', 'category__name', 'series__name', 'description')
     readonly_fields = ('created', 'updated')
+    # id ile tam sıralama: admin '-pk' eklemez, (name, id) indeksi sıralamayı karşılar
+    ordering = ('name', 'id')
 
     fieldsets = (
         ("Ürün Bilgileri", {
-            'fields': ('name', 'category', 'series', 'model', 'description')
+            'fields': ('name', 'sku', 'category', 'series', 'model', 'description')
         }),
         ("Ölçüler ve Stok", {
             'fields': ('width', 'height', 'depth', 'stock')
@@ -63,6 +152,91 @@ class ProductAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        # SQLite'ta LIKE '%...%' taraması yerine FTS5 indeksi kullanılır; SKU
+        # indekste yoktur, tam eşleşmesi benzersiz indeksten ayrıca aranır
+        if not search_term or not search.is_available():
+            return super().get_search_results(request, queryset, search_term)
+        condition = Q(sku=search_term.strip())
+        subquery = search.matching_ids_sql(search_term)
+        if subquery is not None:
+            condition |= Q(pk__in=RawSQL(*subquery))
+        return queryset.filter(condition), False
+
+    def get_readonly_fields(self, request, obj=None):
+        # mevcut ürünün stoku formdan değil, stok hareketleriyle değişir
+        if obj is not None:
+            return self.readonly_fields + ('stock',)
+        return self.readonly_fields
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change and obj.stock:
+            StockMovement.objects.create(
+                product=obj, delta=obj.stock, balance_after=obj.stock, note="İlk stok")
+
+    def save_related(self, request, form, formsets, change):
+        # inline görseller kaydedildikten sonra kapak aynı transaction içinde netleşir
+        super().save_related(request, form, formsets, change)
+        form.instance.refresh_cover_image()
+
+    @admin.action(description="Seçili ürünleri CSV olarak dışa aktar")
+    def export_csv(self, request, queryset):
+        # satırlar üretildikçe gönderilir; büyük seçimlerde bellek sabit kalır
+        response = StreamingHttpResponse(iter_csv(export_rows(queryset)), content_type=CONTENT_TYPES['csv'])
+        response.headers['Content-Disposition'] = 'attachment; filename="urunler.csv"'
+        return response
+
+    @admin.action(description="Seçili ürünlerin stokunu düzelt")
+    def adjust_stock(self, request, queryset):
+        form = StockAdjustForm(request.POST if 'apply' in request.POST else None)
+        if form.is_valid():
+            try:
+                result = stock.adjust_stock(queryset.only('pk'), **form.cleaned_data)
+            except stock.StockError as exc:
+                names = ', '.join(Product.objects.filter(pk__in=exc.product_ids).values_list('name', flat=True))
+                self.message_user(request, f"{exc} {names}", messages.ERROR)
+            else:
+                self.message_user(request, str(result), messages.SUCCESS)
+            return None
+        context = {
+            **self.admin_site.each_context(request),
+            'title': "Stok düzeltme",
+            'opts': self.model._meta,
+            'form': form,
+            'queryset': queryset,
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(request, 'admin/core/product/adjust_stock.html', context)
+
+    def get_urls(self):
+        return [
+            path('import/', self.admin_site.admin_view(self.import_view), name='core_product_import'),
+            *super().get_urls(),
+        ]
+
+    def import_view(self, request):
+        if not self.has_add_permission(request) or not self.has_change_permission(request):
+            return redirect('admin:core_product_changelist')
+        form = CatalogImportForm(request.POST or None, request.FILES or None)
+        report = None
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                report = import_catalog(upload.file, detect_format(upload.name), images=form.cleaned_data['images'])
+            except CatalogImportError as exc:
+                form.add_error('file', str(exc))
+            else:
+                self.message_user(request, str(report), messages.WARNING if report.errors else messages.SUCCESS)
+        context = {
+            **self.admin_site.each_context(request),
+            'title': "Ürünleri içe aktar",
+            'opts': self.model._meta,
+            'form': form,
+            'report': report,
+        }
+        return TemplateResponse(request, 'admin/core/product/import.html', context)
+
 
 # ======================
 # Kategori / Seri / Model Adminleri
@@ -80,7 +254,7 @@ class CategoryAdmin(admin.ModelAdmin):
 @admin.register(SeriesCategory)
 class SeriesCategoryAdmin(admin.ModelAdmin):
     list_display = ('name', 'category', 'created', 'updated')
-    list_filter = ('category',)
+    list_filter = (CategoryFilter,)
     search_fields = ('name', 'category__name')
     ordering = ('category', 'name')
     verbose_name = "Seri"
@@ -89,9 +263,12 @@ class SeriesCategoryAdmin(admin.ModelAdmin):
 
 @admin.register(ModelCategory)
 class ModelCategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'series', 'created', 'updated')
-    list_filter = ('series', 'series__category')
-    search_fields = ('name', 'series__name', 'series__category__name')
+    list_display = ('name', 'series', 'category', 'created', 'updated')
+    # category seriyle tutarlı tutulur (ModelCategory.save); seri üzerinden JOIN gerekmez
+    list_filter = (CategoryFilter, SeriesFilter)
+    search_fields = ('name', 'series__name', 'category__name')
+    # kategori seçilen seriden türetilir
+    exclude = ('category',)
     ordering = ('series', 'name')
     verbose_name = "Model"
     verbose_name_plural = "Modeller"
@@ -109,9 +286,104 @@ class ProductImageAdmin(admin.ModelAdmin):
     ordering = ('product',)
 
 
+@admin.register(StockMovement)
+class StockMovementAdmin(admin.ModelAdmin):
+    # defter yalnızca okunur; hareketler core.stock üzerinden yazılır
+    list_display = ('product', 'delta', 'balance_after', 'reason', 'reference', 'created')
+    list_filter = ('reason',)
+    list_select_related = ('product',)
+    search_fields = ('reference', 'product__name', 'product__sku')
+    ordering = ('-id',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(ProductVideo)
 class ProductVideoAdmin(admin.ModelAdmin):
     list_display = ('product', 'alt_text', 'created_date')
     list_filter = ('product',)
     search_fields = ('product__name',)
     ordering = ('product', '-created_date')
+
+
+# ======================
+# Profil Kayıtları
+# ======================
+
+@admin.register(ProfileCapture)
+class ProfileCaptureAdmin(admin.ModelAdmin):
+    # kayıtlar core.profiling tarafından yazılır; admin yalnızca inceler ve siler
+    change_list_template = 'admin/core/profilecapture/change_list.html'
+    list_display = ('path', 'method', 'route', 'duration_ms', 'samples', 'status', 'trigger', 'label', 'created')
+    list_filter = ('trigger', 'view', 'route')
+    search_fields = ('path', 'view', 'route', 'label')
+    ordering = ('-id',)
+    exclude = ('stacks',)
+    readonly_fields = ('downloads', 'hot_code', 'hot_templates')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        # view başına kayıt sayısı ve süreler; satırlar o view'a filtrelenmiş listeye bağlanır
+        groups = (ProfileCapture.objects.values('view', 'route')
+                  .annotate(count=Count('id'), avg_ms=Avg('duration_ms'), max_ms=Max('duration_ms'))
+                  .order_by('-count')[:50])
+        return super().changelist_view(request, {**(extra_context or {}), 'view_groups': groups})
+
+    def get_urls(self):
+        return [
+            path('<int:pk>/collapsed/', self.admin_site.admin_view(self.download_view),
+                 {'fmt': 'collapsed'}, name='core_profilecapture_collapsed'),
+            path('<int:pk>/speedscope/', self.admin_site.admin_view(self.download_view),
+                 {'fmt': 'speedscope'}, name='core_profilecapture_speedscope'),
+            *super().get_urls(),
+        ]
+
+    def download_view(self, request, pk, fmt):
+        capture = get_object_or_404(ProfileCapture, pk=pk)
+        if not self.has_view_permission(request, capture):
+            return redirect('admin:core_profilecapture_changelist')
+        if fmt == 'speedscope':
+            response = HttpResponse(profiling.speedscope(capture), content_type='application/json')
+            filename = f'profil-{capture.pk}.speedscope.json'
+        else:
+            response = HttpResponse(capture.stacks, content_type='text/plain; charset=utf-8')
+            filename = f'profil-{capture.pk}.collapsed.txt'
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @admin.display(description="İndir")
+    def downloads(self, obj):
+        return format_html(
+            '<a href="{}">speedscope</a> (speedscope.app) · <a href="{}">collapsed</a> (flamegraph.pl)',
+            reverse('admin:core_profilecapture_speedscope', args=[obj.pk]),
+            reverse('admin:core_profilecapture_collapsed', args=[obj.pk]),
+        )
+
+    def frame_table(self, rows):
+        if not rows:
+            return "Örnek yok."
+        return format_html(
+            '<table><thead><tr><th>Çerçeve</th><th>Kendi %</th><th>Toplam %</th></tr></thead><tbody>{}</tbody></table>',
+            format_html_join('', '<tr><td><code>{}</code></td><td>{}</td><td>{}</td></tr>',
+                             ((row['frame'], row['self'], row['total']) for row in rows)),
+        )
+
+    @admin.display(description="En çok çalışan kod")
+    def hot_code(self, obj):
+        return self.frame_table(profiling.hot_frames(profiling.load_stacks(obj.stacks)))
+
+    @admin.display(description="Şablon düğümleri")
+    def hot_templates(self, obj):
+        return self.frame_table(profiling.hot_frames(profiling.load_stacks(obj.stacks), order='total', templates=True))
@@ -5,3 +5,16 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
     verbose_name = 'Ürün Bilgileri'
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.backends.signals import connection_created
+
+        from . import signals  # noqa: F401
+        from .db import configure_connection
+
+        connection_created.connect(configure_connection, dispatch_uid='core-sqlite-pragmas')
+
+        if getattr(settings, 'REQUEST_METRICS', False):
+            from . import instrumentation
+            instrumentation.install()
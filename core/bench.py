@@ -0,0 +1,205 @@
+"""
+Performans ölçümleri için küçük yardımcılar (bench_* yönetim komutları kullanır).
+"""
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from django.conf import settings
+from django.db import connection, connections
+
+
+class Timing:
+    def __init__(self, label, samples, size=None):
+        self.label = label
+        self.samples = samples
+        # örnek başına işlenen bayt; verilirse MB/s hesaplanır
+        self.size = size
+
+    @property
+    def best(self):
+        return min(self.samples)
+
+    @property
+    def median(self):
+        return statistics.median(self.samples)
+
+    @property
+    def throughput(self):
+        if not self.size:
+            return None
+        return self.size / self.median / (1024 * 1024)
+
+    def __str__(self):
+        line = f"{self.label:<40} medyan {self.median * 1000:9.2f} ms  en iyi {self.best * 1000:9.2f} ms"
+        if self.throughput is not None:
+            line += f"  {self.throughput:9.1f} MB/s"
+        return line
+
+
+def measure(label, func, repeat=5, warmup=1, size=None):
+    """func'ı warmup + repeat kez çalıştırır; ölçüm yalnızca repeat turunu kapsar."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return Timing(label, samples, size)
+
+
+def consume(response):
+    """Yanıt gövdesini sonuna kadar okur; okunan bayt sayısını döner."""
+    if response.streaming:
+        total = sum(len(chunk) for chunk in response.streaming_content)
+    else:
+        total = len(response.content)
+    response.close()
+    return total
+
+
+def read_timed(chunks, start, marker=None):
+    """
+    Gövdeyi parça parça okur: (ilk baytın geldiği an, `marker` görüldüğü an)
+    `start`'tan itibaren saniye olarak. marker yoksa ya da hiç gelmezse ikincisi None.
+    """
+    first = seen = None
+    received = b''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if first is None:
+            first = time.perf_counter() - start
+        if marker is not None and seen is None:
+            # parça sınırına denk gelen işaret de bulunsun
+            received = received[-len(marker):] + chunk
+            if marker in received:
+                seen = time.perf_counter() - start
+    return first, seen
+
+
+class LoadResult:
+    """Eşzamanlı yük altında gecikme dağılımı ve saniyedeki istek sayısı."""
+
+    def __init__(self, label, latencies, elapsed, errors=0):
+        self.label = label
+        self.latencies = sorted(latencies)
+        self.elapsed = elapsed
+        self.errors = errors
+
+    def percentile(self, p):
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100, method='inclusive')[p - 1]
+
+    @property
+    def rps(self):
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'requests': len(self.latencies), 'errors': self.errors, 'rps': round(self.rps, 1),
+            'mean_ms': round(statistics.fmean(self.latencies) * 1000, 2) if self.latencies else 0.0,
+            **{f'p{p}_ms': round(self.percentile(p) * 1000, 2) for p in (50, 90, 99)},
+        }
+
+    def __str__(self):
+        return (f"{self.label:<28} p50 {self.percentile(50) * 1000:8.2f} ms  p99 {self.percentile(99) * 1000:8.2f} ms"
+                f"  {self.rps:8.1f} istek/sn  hata {self.errors}")
+
+
+@contextmanager
+def temporary_database(verbosity=0, on_disk=False):
+    """
+    Ölçüm için geçici, migrate edilmiş bir test veritabanı açar; çıkışta siler.
+    on_disk: SQLite'ta bellek yerine geçici dosya. Bellekteki paylaşımlı
+    veritabanı, başka thread'lerde açık bağlantı kaldıkça silinmez.
+    """
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_test_name = test_settings.get('NAME')
+    directory = None
+    if on_disk and connection.vendor == 'sqlite':
+        directory = tempfile.mkdtemp()
+        test_settings['NAME'] = os.path.join(directory, 'bench.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    # aynı dosyanın okuma bağlantıları (TEST MIRROR) da geçici veritabanına yönelir
+    mirrors = {}
+    for alias in connections:
+        mirror = connections[alias]
+        if alias != connection.alias and mirror.settings_dict.get('TEST', {}).get('MIRROR') == connection.alias:
+            mirror.close()
+            mirrors[alias] = mirror.settings_dict['NAME']
+            mirror.creation.set_as_test_mirror(connection.settings_dict)
+    try:
+        yield
+    finally:
+        for alias, name in mirrors.items():
+            connections[alias].close()
+            connections[alias].settings_dict['NAME'] = name
+        connection.creation.destroy_test_db(old_name, verbosity)
+        if directory:
+            test_settings['NAME'] = old_test_name
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def seed_products(count):
+    """Kategori/seri/model ağacıyla birlikte `count` ürün oluşturur (sinyaller tetiklenmez)."""
+    from .models import Category, ModelCategory, Product, SeriesCategory
+
+    category = Category.objects.create(name='Dolap')
+    series = SeriesCategory.objects.create(category=category, name='Predator')
+    model = ModelCategory.objects.create(category=category, series=series, name='P-100')
+    Product.objects.bulk_create(
+        [Product(name=f'Ürün {i:06d}', category=category, series=series, model=model,
+                 width=60, height=180, depth=50, description='<p>Açıklama</p>', stock=i % 3)
+         for i in range(count)],
+        batch_size=1000,
+    )
+
+
+def peak_rss_mb():
+    """Sürecin şimdiye kadarki en yüksek bellek kullanımı (Linux'ta ru_maxrss KB'dir)."""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def git_revision():
+    """Raporları commit'lerle eşleştirmek için (kısa özet, çalışma ağacı kirli mi)."""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=settings.BASE_DIR,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return revision, dirty
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def wsgi_server(application):
+    """Gerçek bir HTTP sunucusu (wsgiref, istek başına thread) açar; adresini verir."""
+    server = make_server('127.0.0.1', 0, application, server_class=_ThreadingWSGIServer, handler_class=_QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
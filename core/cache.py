@@ -0,0 +1,198 @@
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, urlencode
+from django.views.decorators.http import condition
+
+CONTENT_VERSION_KEY = 'site:content-version'
+CONTENT_MODIFIED_KEY = 'site:content-modified'
+PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def content_version():
+    """
+    Ana sayfa içeriğinin sürüm numarası. Anahtar yoksa (ilk açılış ya da
+    cache temizlendiyse) zaman damgasıyla başlatılır; böylece eski sürümlere
+    ait sayfalar asla tekrar kullanılmaz.
+    """
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        cache.add(CONTENT_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CONTENT_VERSION_KEY)
+    return version
+
+
+async def acontent_version():
+    version = await cache.aget(CONTENT_VERSION_KEY)
+    if version is None:
+        await cache.aadd(CONTENT_VERSION_KEY, time.time_ns(), timeout=None)
+        version = await cache.aget(CONTENT_VERSION_KEY)
+    return version
+
+
+def bump_content_version(**kwargs):
+    """Sinyal alıcısı olarak da kullanılabilir; içerik değişince sürümü artırır."""
+    # silme işlemleri zaman damgalarında iz bırakmaz; değişiklik anını ayrıca tutuyoruz
+    cache.set(CONTENT_MODIFIED_KEY, timezone.now(), timeout=None)
+    try:
+        return cache.incr(CONTENT_VERSION_KEY)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(CONTENT_VERSION_KEY, version, timeout=None)
+        return version
+
+
+def content_last_modified():
+    """
+    Ana sayfadaki modellerin en son değişiklik zamanı. Normalde sinyallerin
+    yazdığı değer cache'ten okunur; cache boşsa modellerin updated/updated_at
+    alanlarından hesaplanıp saklanır.
+    """
+    modified = cache.get(CONTENT_MODIFIED_KEY)
+    if modified is None:
+        from .signals import HOMEPAGE_MODELS
+
+        stamps = []
+        for model in HOMEPAGE_MODELS:
+            field = 'updated' if hasattr(model, 'updated') else 'updated_at'
+            stamps.append(model.objects.aggregate(last=Max(field))['last'])
+        modified = max(filter(None, stamps), default=timezone.now())
+        cache.add(CONTENT_MODIFIED_KEY, modified, timeout=None)
+    return modified
+
+
+def content_etag(request, *args, **kwargs):
+    return f'"{content_version()}"'
+
+
+def content_last_modified_for_request(request, *args, **kwargs):
+    return content_last_modified()
+
+
+def content_condition(view_func):
+    """
+    İçerik sürümünden ETag, son değişiklik zamanından Last-Modified üretip
+    koşullu GET'e 304 döner. Async görünümlerde bu değerler thread'de hesaplanır;
+    cache boşsa son değişiklik zamanı ORM ile bulunur ve event loop'ta çalışamaz.
+    """
+    if not iscoroutinefunction(view_func):
+        return condition(etag_func=content_etag, last_modified_func=content_last_modified_for_request)(view_func)
+
+    @wraps(view_func)
+    async def _wrapped(request, *args, **kwargs):
+        etag = f'"{await acontent_version()}"'
+        last_modified = int((await sync_to_async(content_last_modified)()).timestamp())
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await view_func(request, *args, **kwargs)
+        if request.method in ('GET', 'HEAD'):
+            if not response.has_header('Last-Modified'):
+                response.headers['Last-Modified'] = http_date(last_modified)
+            response.headers.setdefault('ETag', etag)
+        return response
+    return _wrapped
+
+
+def _page_key(prefix, version, request, query_params):
+    """
+    Yol ve izin verilen sorgu parametrelerinden anahtar; listede olmayan bir
+    parametre varsa None (sayfa cache'i atlanır). Tam URL anahtar olsaydı her
+    rastgele sorgu dizesi ayrı bir kayıt açar, cache sınırsız büyürdü.
+    """
+    if any(name not in query_params for name in request.GET):
+        return None
+    query = urlencode(sorted((name, request.GET.getlist(name)) for name in request.GET), doseq=True)
+    return f'page:{prefix}:{version}:{request.path}?{query}'
+
+
+def _is_cacheable(response):
+    return response.status_code == 200 and not response.cookies
+
+
+def _cache_stream(response, key, timeout):
+    """
+    Akışlı yanıtın parçaları istemciye gönderilirken biriktirilir; sayfa
+    ancak akış sonuna kadar okunursa saklanır, yarıda kesilen yanıt saklanmaz.
+    """
+    content_type = response['Content-Type']
+
+    def tee(content):
+        chunks = []
+        for chunk in content:
+            chunks.append(chunk)
+            yield chunk
+        cache.set(key, (b''.join(chunks), content_type), timeout)
+
+    async def atee(content):
+        chunks = []
+        async for chunk in content:
+            chunks.append(chunk)
+            yield chunk
+        await cache.aset(key, (b''.join(chunks), content_type), timeout)
+
+    content = response.streaming_content
+    response.streaming_content = atee(content) if response.is_async else tee(content)
+
+
+def versioned_cache_page(prefix, timeout=PAGE_CACHE_TIMEOUT, query_params=()):
+    """
+    Sayfayı içerik sürümüne bağlı anahtarla saklar. Anahtara yalnızca
+    query_params'taki sorgu parametreleri girer; başka parametreli istekler
+    cache'e bakılmadan görünüme gider. İsabet halinde görünüm
+    çağrılmaz ve veritabanına hiç gidilmez; sürüm artınca eski kayıtlar
+    kendiliğinden devre dışı kalır ve zaman aşımıyla silinir. Akışlı yanıtlar
+    gönderildikçe biriktirilir; isabet tek parça HttpResponse olarak döner.
+    Senkron ve async görünümlerde çalışır.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _async_wrapped(request, *args, **kwargs):
+                key = None
+                if request.method in ('GET', 'HEAD'):
+                    key = _page_key(prefix, await acontent_version(), request, query_params)
+                if key is None:
+                    return await view_func(request, *args, **kwargs)
+
+                cached = await cache.aget(key)
+                if cached is not None:
+                    content, content_type = cached
+                    return HttpResponse(content, content_type=content_type)
+
+                response = await view_func(request, *args, **kwargs)
+                if _is_cacheable(response):
+                    if response.streaming:
+                        _cache_stream(response, key, timeout)
+                    else:
+                        await cache.aset(key, (response.content, response['Content-Type']), timeout)
+                return response
+            return _async_wrapped
+
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            key = None
+            if request.method in ('GET', 'HEAD'):
+                key = _page_key(prefix, content_version(), request, query_params)
+            if key is None:
+                return view_func(request, *args, **kwargs)
+
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            response = view_func(request, *args, **kwargs)
+            if _is_cacheable(response):
+                if response.streaming:
+                    _cache_stream(response, key, timeout)
+                else:
+                    cache.set(key, (response.content, response['Content-Type']), timeout)
+            return response
+        return _wrapped
+    return decorator
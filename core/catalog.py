@@ -0,0 +1,227 @@
+"""
+Ürün kataloğu: filtreleme ve (name, id) üzerinden keyset sayfalama.
+
+OFFSET kullanılmaz; her sayfa bir önceki sayfanın son (name, id) çiftinden
+devam eder. Böylece 1. sayfa ile 1000. sayfa aynı maliyettedir.
+"""
+import base64
+import bisect
+import json
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import QueryDict
+from django.urls import reverse
+
+from .models import Product
+
+PAGE_SIZE = getattr(settings, 'CATALOG_PAGE_SIZE', 12)
+MAX_PAGE_SIZE = 100
+
+ID_FILTERS = ('category', 'series', 'model')
+RANGE_FILTERS = ('width', 'height', 'depth')
+# ölçü facet'lerinin aralık sınırları (cm); '40-60' = 40 <= x < 60, '-40' ve '120-' uçlar
+DIMENSION_BUCKETS = getattr(settings, 'CATALOG_DIMENSION_BUCKETS', {
+    'width': (40, 60, 80, 100, 120),
+    'height': (60, 100, 150, 200),
+    'depth': (30, 40, 50, 60),
+})
+IN_STOCK, OUT_OF_STOCK = 'in_stock', 'out_of_stock'
+# id'ler SQLite INTEGER'a (64 bit) sığmalı; büyük sayı sorguda OverflowError (500) verir
+MIN_ID, MAX_ID = -2 ** 63, 2 ** 63 - 1
+AVAILABILITY = (IN_STOCK, OUT_OF_STOCK)
+
+
+class InvalidCatalogQuery(ValueError):
+    pass
+
+
+def encode_cursor(product):
+    raw = json.dumps([product.name, product.pk], ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        name, pk = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCatalogQuery("Geçersiz sayfa imleci.")
+    if not isinstance(name, str) or not isinstance(pk, int) or not MIN_ID <= pk <= MAX_ID:
+        raise InvalidCatalogQuery("Geçersiz sayfa imleci.")
+    return name, pk
+
+
+def dimension_buckets(key):
+    """[(anahtar, alt, üst), ...]; alt sınır dahil, üst hariç, uçlarda None."""
+    bounds = [None, *DIMENSION_BUCKETS[key], None]
+    return [
+        (f"{'' if low is None else f'{low:g}'}-{'' if high is None else f'{high:g}'}", low, high)
+        for low, high in zip(bounds, bounds[1:])
+    ]
+
+
+_BUCKET_KEYS = {key: [bucket for bucket, low, high in dimension_buckets(key)] for key in DIMENSION_BUCKETS}
+
+
+def bucket_for(key, value):
+    return _BUCKET_KEYS[key][bisect.bisect_right(DIMENSION_BUCKETS[key], value)]
+
+
+def _bucket_q(key, bucket):
+    for name, low, high in dimension_buckets(key):
+        if name == bucket:
+            lookups = {}
+            if low is not None:
+                lookups[f'{key}__gte'] = low
+            if high is not None:
+                lookups[f'{key}__lt'] = high
+            return Q(**lookups)
+    raise InvalidCatalogQuery(f"Geçersiz '{key}' aralığı: {bucket}")
+
+
+def _getlist(params, key):
+    values = params.getlist(key) if hasattr(params, 'getlist') else [params.get(key)]
+    return [value for value in values if value not in (None, '')]
+
+
+def _number(params, key, cast):
+    value = params.get(key)
+    if value in (None, ''):
+        return None
+    try:
+        return cast(value)
+    except ValueError:
+        raise InvalidCatalogQuery(f"'{key}' sayısal olmalı.")
+
+
+def parse_filters(params):
+    """
+    GET parametrelerinden filtre sözlüğü üretir; hatalı değerde InvalidCatalogQuery.
+    Kategori/seri/model ve ölçü aralıkları (facet'ler) birden çok kez verilebilir:
+    aynı facet içinde VEYA, facet'ler arasında VE uygulanır.
+    """
+    filters = {}
+    for key in ID_FILTERS:
+        values = _getlist(params, key)
+        try:
+            values = [int(value) for value in values]
+        except ValueError:
+            raise InvalidCatalogQuery(f"'{key}' sayısal olmalı.")
+        if not all(MIN_ID <= value <= MAX_ID for value in values):
+            raise InvalidCatalogQuery(f"'{key}' geçerli bir kimlik değil.")
+        if values:
+            filters[key] = values
+    for key in RANGE_FILTERS:
+        for bound in (f'{key}_min', f'{key}_max'):
+            value = _number(params, bound, float)
+            if value is not None:
+                filters[bound] = value
+        buckets = _getlist(params, key)
+        for bucket in buckets:
+            if bucket not in _BUCKET_KEYS[key]:
+                raise InvalidCatalogQuery(f"Geçersiz '{key}' aralığı: {bucket}")
+        if buckets:
+            filters[key] = buckets
+    availability = set(_getlist(params, 'availability'))
+    if params.get('in_stock') in ('1', 'true', 'on'):
+        availability.add(IN_STOCK)
+    if not availability <= set(AVAILABILITY):
+        raise InvalidCatalogQuery("'availability' in_stock ya da out_of_stock olmalı.")
+    if availability == {IN_STOCK}:
+        filters['in_stock'] = True
+    elif availability == {OUT_OF_STOCK}:
+        filters['in_stock'] = False
+    return filters
+
+
+def parse_limit(params):
+    try:
+        return int(params.get('limit', PAGE_SIZE))
+    except ValueError:
+        raise InvalidCatalogQuery("'limit' sayısal olmalı.")
+
+
+def next_page_url(url_name, cursor, params=None):
+    """Mevcut filtreleri koruyarak sonraki sayfanın adresini üretir."""
+    if not cursor:
+        return None
+    query = params.copy() if params is not None else QueryDict(mutable=True)
+    query['cursor'] = cursor
+    query.pop('html', None)
+    return f'{reverse(url_name)}?{query.urlencode()}'
+
+
+def filter_products(filters, queryset=None):
+    queryset = Product.objects.all() if queryset is None else queryset
+    lookups = {}
+    for key in ID_FILTERS:
+        value = filters.get(key)
+        if isinstance(value, int):
+            lookups[f'{key}_id'] = value
+        elif value:
+            # tek değerde = (bileşik indeks eşitlikle kullanılır), çok değerde IN
+            lookups[f'{key}_id' if len(value) == 1 else f'{key}_id__in'] = value[0] if len(value) == 1 else value
+    for key in RANGE_FILTERS:
+        if f'{key}_min' in filters:
+            lookups[f'{key}__gte'] = filters[f'{key}_min']
+        if f'{key}_max' in filters:
+            lookups[f'{key}__lte'] = filters[f'{key}_max']
+    if filters.get('in_stock') is True:
+        lookups['stock__gt'] = 0
+    elif filters.get('in_stock') is False:
+        lookups['stock__lte'] = 0
+    queryset = queryset.filter(**lookups)
+    for key in RANGE_FILTERS:
+        if filters.get(key):
+            queryset = queryset.filter(reduce(or_, (_bucket_q(key, bucket) for bucket in filters[key])))
+    return queryset
+
+
+def _page_queryset(filters, cursor, limit, queryset):
+    if queryset is None:
+        queryset = Product.objects.select_related('category', 'series', 'model', 'cover_image')
+    queryset = filter_products(filters or {}, queryset).order_by('name', 'id')
+    if cursor:
+        name, pk = decode_cursor(cursor)
+        # OR yerine aralık + dışlama: SQLite (name, id) indeksinde aralık taraması yapabilsin
+        queryset = queryset.filter(name__gte=name).exclude(name=name, id__lte=pk)
+    return queryset[:limit + 1]
+
+
+def _split_page(products, limit):
+    next_cursor = encode_cursor(products[limit - 1]) if len(products) > limit else None
+    return products[:limit], next_cursor
+
+
+def catalog_page(filters=None, cursor=None, limit=PAGE_SIZE, queryset=None):
+    """
+    (ürünler, sonraki_imleç) döner. Sonraki sayfa yoksa imleç None'dır.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    return _split_page(list(_page_queryset(filters, cursor, limit, queryset)), limit)
+
+
+async def acatalog_page(filters=None, cursor=None, limit=PAGE_SIZE, queryset=None):
+    """catalog_page'in async ORM ile çalışan karşılığı."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    return _split_page([product async for product in _page_queryset(filters, cursor, limit, queryset)], limit)
+
+
+def product_as_dict(product):
+    cover = product.cover_image
+    return {
+        'id': product.pk,
+        'name': product.name,
+        'category': product.category.name if product.category else None,
+        'series': product.series.name if product.series else None,
+        'model': product.model.name if product.model else None,
+        'width': product.width,
+        'height': product.height,
+        'depth': product.depth,
+        'stock': product.stock,
+        'in_stock': product.stock > 0,
+        'image': cover.image.url if cover else None,
+    }
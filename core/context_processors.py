@@ -0,0 +1,14 @@
+from django.utils.functional import SimpleLazyObject
+
+from .site_settings import site_settings as load_site_settings
+from .taxonomy import taxonomy_tree
+
+
+def site_settings(request):
+    """Her şablona company, hero ve about (süreç içi önbellekten, sorgusuz)."""
+    return load_site_settings()
+
+
+def taxonomy(request):
+    """Menüler için kategori ağacı; yalnızca şablon kullanırsa yüklenir."""
+    return {'taxonomy': SimpleLazyObject(taxonomy_tree)}
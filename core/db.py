@@ -0,0 +1,81 @@
+"""
+SQLite üretim modu (settings.SQLITE_PRODUCTION, ortamdan SQLITE_PRODUCTION=1).
+
+  * Her yeni bağlantıda (connection_created) SQLITE_PRAGMAS uygulanır: WAL
+    ile okuyucular yazarı, yazar okuyucuları beklemez; synchronous=NORMAL
+    WAL'da commit başına fsync'i kaldırır; mmap ve sayfa cache'i okumaları
+    bellekten karşılar; busy_timeout kilit anında hemen hata vermek yerine bekler.
+  * Bağlantılar kalıcıdır (CONN_MAX_AGE); istek başına açılıp kapanmaz.
+  * Aynı dosyaya ikinci bir 'replica' bağlantısı tanımlanır ve query_only ile
+    salt okunur açılır. ReadWriteRouter herkese açık okumaları ona, yazmaları,
+    admin ve POST isteklerini (bkz. core.middleware.DatabaseRoutingMiddleware)
+    ve transaction içindeki okumaları yazar bağlantısına ('default') yönlendirir.
+    Aynı dosya olduğundan replikasyon gecikmesi yoktur; commit edilen yazı bir
+    sonraki okumada görünür.
+
+Yazar bağlantısı transaction'ı BEGIN IMMEDIATE ile açar (OPTIONS
+transaction_mode); WAL'da okumadan yazmaya geçen iki transaction'ın
+"database is locked" ile düşmesi böyle önlenir.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+WRITE_ALIAS = 'default'
+READ_ALIAS = 'replica'
+DEFAULT_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # eksi değer KiB: bağlantı başına 20 MB
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+}
+
+_writer = ContextVar('database_writer', default=False)
+
+
+def pragmas():
+    return getattr(settings, 'SQLITE_PRAGMAS', DEFAULT_PRAGMAS)
+
+
+def configure_connection(sender, connection, **kwargs):
+    """connection_created alıcısı; CoreConfig.ready'de bağlanır."""
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_PRODUCTION', False):
+        return
+    # ham sqlite3 bağlantısı: pragmalar istek ölçümlerine sorgu olarak yazılmaz
+    for name, value in pragmas().items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+    if connection.alias == READ_ALIAS:
+        connection.connection.execute('PRAGMA query_only = ON')
+
+
+@contextmanager
+def writer():
+    """Bu blok içindeki okumalar da yazar bağlantısından yapılır (yazdığını okuma)."""
+    token = _writer.set(True)
+    try:
+        yield
+    finally:
+        _writer.reset(token)
+
+
+class ReadWriteRouter:
+    def db_for_read(self, model, **hints):
+        # transaction içindeki okumalar henüz commit edilmemiş yazıyı görmeli
+        if _writer.get() or connections[WRITE_ALIAS].in_atomic_block:
+            return WRITE_ALIAS
+        return READ_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return WRITE_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # iki bağlantı da aynı dosyadır
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == WRITE_ALIAS
@@ -0,0 +1,292 @@
+"""
+Ürün kataloğu için facet sayıları (kategori, seri, model, ölçü aralıkları, stok).
+
+Her süreç bellekte bir bitmap indeksi tutar: facet değeri başına, ürün
+kimliğinin bit konumu olduğu bir Python int'i. Seçili filtrelerin eşleştiği
+ürünler bitmap'lerin VE/VEYA'sıdır; bir seçeneğin sayısı, o facet dışındaki
+seçimlerle kesişiminin bit sayısıdır (aynı facet içindeki seçimler sayıyı
+daraltmaz). Böylece her filtre değişikliğinde GROUP BY çalışmaz.
+
+Güncelleme artımlıdır: ürün kaydı/silinmesi ve toplu yazımlar (stok, içe
+aktarım) FacetChange günlüğüne ürün kimliği ekler ve commit sonrası cache'teki
+sürümü artırır. Süreçler sürüm farkını görünce yalnızca günlükteki yeni
+ürünleri tek sorguyla okur. SQLite'ta yazma transaction'ları sıralı olduğundan
+günlük kimlikleri commit sırasıyla artar. Günlük 'facets.prune' işiyle budanır;
+budama süresinden uzun süre senkronize olmamış süreç indeksi baştan kurar.
+"""
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from jobs.queue import enqueue
+
+from .catalog import AVAILABILITY, DIMENSION_BUCKETS, ID_FILTERS, IN_STOCK, OUT_OF_STOCK, bucket_for, dimension_buckets
+from .models import FacetChange, Product
+from .taxonomy import taxonomy_tree
+
+FACETS_VERSION_KEY = 'catalog:facets-version'
+FACETS = (*ID_FILTERS, *DIMENSION_BUCKETS, 'availability')
+FACET_TITLES = {
+    'category': 'Kategori', 'series': 'Seri', 'model': 'Model',
+    'width': 'Genişlik', 'height': 'Yükseklik', 'depth': 'Derinlik', 'availability': 'Stok Durumu',
+}
+AVAILABILITY_LABELS = {IN_STOCK: 'Stokta', OUT_OF_STOCK: 'Stokta yok'}
+CHANGE_RETENTION = timedelta(seconds=getattr(settings, 'FACET_CHANGE_RETENTION_SECONDS', 24 * 60 * 60))
+ROW_FIELDS = ('pk', 'category_id', 'series_id', 'model_id', 'width', 'height', 'depth', 'stock')
+
+
+def facet_values(row):
+    """values_list(*ROW_FIELDS) satırından FACETS sırasıyla değerler."""
+    pk, category_id, series_id, model_id, width, height, depth, stock = row
+    return (
+        category_id, series_id, model_id,
+        bucket_for('width', width), bucket_for('height', height), bucket_for('depth', depth),
+        IN_STOCK if stock > 0 else OUT_OF_STOCK,
+    )
+
+
+def _bitmap(pks):
+    """Kimlik listesinden bitmap; bitleri tek tek OR'lamaktan (her seferinde yeni int) çok daha hızlı."""
+    if not pks:
+        return 0
+    data = bytearray(max(pks) // 8 + 1)
+    for pk in pks:
+        data[pk >> 3] |= 1 << (pk & 7)
+    return int.from_bytes(data, 'little')
+
+
+class FacetIndex:
+    def __init__(self, rows=()):
+        self.rows = {}
+        postings = {facet: defaultdict(list) for facet in FACETS}
+        for row in rows:
+            values = facet_values(row)
+            self.rows[row[0]] = row
+            for facet, value in zip(FACETS, values):
+                if value is not None:
+                    postings[facet][value].append(row[0])
+        self.bitmaps = {facet: {value: _bitmap(pks) for value, pks in values.items()}
+                        for facet, values in postings.items()}
+        self.all = _bitmap(list(self.rows))
+        self.last_change = 0
+
+    def remove(self, pk):
+        row = self.rows.pop(pk, None)
+        if row is None:
+            return
+        mask = ~(1 << pk)
+        for facet, value in zip(FACETS, facet_values(row)):
+            if value is not None:
+                self.bitmaps[facet][value] &= mask
+        self.all &= mask
+
+    def add(self, row):
+        pk = row[0]
+        self.remove(pk)
+        self.rows[pk] = row
+        bit = 1 << pk
+        for facet, value in zip(FACETS, facet_values(row)):
+            if value is not None:
+                self.bitmaps[facet][value] = self.bitmaps[facet].get(value, 0) | bit
+        self.all |= bit
+
+    def _range_mask(self, filters):
+        """width_min/max gibi serbest aralıklar bitmap'te yok; satırlar taranır (nadir yol)."""
+        bounds = [(index, filters.get(f'{key}_min'), filters.get(f'{key}_max'))
+                  for index, key in ((4, 'width'), (5, 'height'), (6, 'depth'))
+                  if f'{key}_min' in filters or f'{key}_max' in filters]
+        if not bounds:
+            return None
+        return _bitmap([
+            pk for pk, row in self.rows.items()
+            if all((low is None or row[i] >= low) and (high is None or row[i] <= high) for i, low, high in bounds)
+        ])
+
+    def counts(self, filters):
+        """
+        (toplam, {facet: {değer: sayı}}). filters core.catalog.parse_filters
+        çıktısıdır; sayılar filter_products ile aynı anlamdadır.
+        """
+        selections = selected_values(filters)
+        masks = {}
+        for facet, values in selections.items():
+            bitmaps = self.bitmaps[facet]
+            mask = 0
+            for value in values:
+                mask |= bitmaps.get(value, 0)
+            masks[facet] = mask
+        base = self.all
+        range_mask = self._range_mask(filters)
+        if range_mask is not None:
+            base &= range_mask
+
+        total = base
+        for mask in masks.values():
+            total &= mask
+        counts = {}
+        for facet in FACETS:
+            # bu facet'in kendi seçimi hariç diğer tüm seçimler
+            others = base
+            for other, mask in masks.items():
+                if other != facet:
+                    others &= mask
+            counts[facet] = {value: (bitmap & others).bit_count() for value, bitmap in self.bitmaps[facet].items()}
+        return total.bit_count(), counts
+
+
+def selected_values(filters):
+    selections = {}
+    for facet in (*ID_FILTERS, *DIMENSION_BUCKETS):
+        value = filters.get(facet)
+        if value:
+            selections[facet] = [value] if isinstance(value, int) else value
+    if filters.get('in_stock') is True:
+        selections['availability'] = [IN_STOCK]
+    elif filters.get('in_stock') is False:
+        selections['availability'] = [OUT_OF_STOCK]
+    return selections
+
+
+def _load_rows(product_ids=None):
+    products = Product.objects.all()
+    if product_ids is not None:
+        products = products.filter(pk__in=product_ids)
+    return products.order_by().values_list(*ROW_FIELDS).iterator(chunk_size=5000)
+
+
+class FacetEngine:
+    """Süreç içi indeks; sürüm değiştiyse günlükteki yeni değişiklikleri uygular."""
+
+    def __init__(self):
+        self.index = None
+        self.version = None
+        self.synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def _version(self):
+        """(sürüm, yeni mi). Anahtar cache'ten düşmüşse aradaki artışlar bilinemez."""
+        version = cache.get(FACETS_VERSION_KEY)
+        if version is None:
+            cache.add(FACETS_VERSION_KEY, time.time_ns(), timeout=None)
+            return cache.get(FACETS_VERSION_KEY), True
+        return version, False
+
+    def _rebuild(self):
+        # önce günlüğün sonu okunur; kurulum sırasında gelen değişiklikler sonra tekrar uygulanır
+        last_change = FacetChange.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        index = FacetIndex(_load_rows())
+        index.last_change = last_change
+        return index
+
+    def _sync(self, index):
+        changes = list(FacetChange.objects.filter(pk__gt=index.last_change).order_by('pk')
+                       .values_list('pk', 'product_id'))
+        if not changes:
+            return index
+        product_ids = {product_id for pk, product_id in changes}
+        if None in product_ids:
+            return self._rebuild()
+        rows = {row[0]: row for row in _load_rows(product_ids)}
+        for product_id in product_ids:
+            if product_id in rows:
+                index.add(rows[product_id])
+            else:
+                index.remove(product_id)
+        index.last_change = changes[-1][0]
+        return index
+
+    def get(self):
+        version, reset = self._version()
+        index = self.index
+        if index is not None and self.version == version:
+            self.synced_at = time.monotonic()
+            return index
+        with self._lock:
+            if self.index is not None and self.version == version:
+                return self.index
+            stale = time.monotonic() - self.synced_at > CHANGE_RETENTION.total_seconds() / 2
+            if self.index is None or stale or reset:
+                self.index = self._rebuild()
+            else:
+                self.index = self._sync(self.index)
+            self.version = version
+            self.synced_at = time.monotonic()
+            return self.index
+
+
+_engine = FacetEngine()
+
+
+def facet_index():
+    return _engine.get()
+
+
+def _bump():
+    try:
+        cache.incr(FACETS_VERSION_KEY)
+    except ValueError:
+        cache.set(FACETS_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def record_changes(product_ids):
+    """Ürünleri günlüğe yazar (çağıranın transaction'ında); sürüm commit sonrası artar."""
+    FacetChange.objects.bulk_create([FacetChange(product_id=pk) for pk in product_ids])
+    transaction.on_commit(_bump)
+    transaction.on_commit(partial(
+        enqueue, 'facets.prune', key='facets.prune', delay=int(CHANGE_RETENTION.total_seconds()),
+        keep_schedule=True))
+
+
+def request_rebuild():
+    """Kategori ağacı gibi çok ürünü etkileyen değişikliklerde tüm indeks yeniden kurulur."""
+    record_changes([None])
+
+
+def prune_changes():
+    return FacetChange.objects.filter(created__lt=timezone.now() - CHANGE_RETENTION).delete()[0]
+
+
+# ======================
+# Görünüm yardımcıları
+# ======================
+
+def _options(facet, counts, selected):
+    if facet in ID_FILTERS:
+        nodes = taxonomy_tree().choices(facet)
+        options = [(node.pk, node.name) for node in nodes]
+    elif facet in DIMENSION_BUCKETS:
+        options = [(bucket, _bucket_label(low, high)) for bucket, low, high in dimension_buckets(facet)]
+    else:
+        options = [(value, AVAILABILITY_LABELS[value]) for value in AVAILABILITY]
+    return [
+        {'value': value, 'label': label, 'count': counts.get(value, 0), 'selected': value in selected}
+        # boş seçenekler gizlenir; seçili olan sayısı 0 olsa da görünür
+        for value, label in options if counts.get(value, 0) or value in selected
+    ]
+
+
+def _bucket_label(low, high):
+    if low is None:
+        return f'{high:g} cm altı'
+    if high is None:
+        return f'{low:g} cm ve üzeri'
+    return f'{low:g}–{high:g} cm'
+
+
+def facet_groups(filters):
+    """(toplam, [{'name', 'title', 'options': [...]}, ...]); JSON ve kenar çubuğu için."""
+    total, counts = facet_index().counts(filters)
+    selections = selected_values(filters)
+    groups = [
+        {'name': facet, 'title': FACET_TITLES[facet],
+         'options': _options(facet, counts[facet], set(selections.get(facet, ())))}
+        for facet in FACETS
+    ]
+    return total, groups
@@ -0,0 +1,307 @@
+"""
+İstek başına performans ölçümleri (bkz. core.middleware.InstrumentationMiddleware).
+
+Middleware her istek için bir RequestMetrics açar ve ContextVar'a koyar;
+ölçüm noktaları yalnızca etkin bir ölçüm varsa iş yapar:
+  * veritabanı: her bağlantıya (connection_created) bir execute_wrapper
+    eklenir; sorgunun süresi, metni ve kaynağı (şablon satırı, yoksa proje
+    içindeki çağıran satır) kaydedilir,
+  * şablonlar: Template.render sarılır; include'lar dıştaki render'a dahildir,
+  * cache: yapılandırılmış backend'lerin get/get_many metotları sarılır.
+
+Sonuç Server-Timing başlığına ve 'core.metrics' logger'ına tek satır JSON
+olarak yazılır. REQUEST_METRICS_SLOW_MS'yi aşan isteklerde en yavaş SELECT'lerin
+EXPLAIN çıktısı da loga eklenir (uyarı düzeyinde). ASGI'de sync_to_async
+context'i kopyaladığından thread havuzundaki sorgular da aynı ölçüme yazılır.
+"""
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import FileResponse
+from django.template.base import Template
+
+logger = logging.getLogger('core.metrics')
+
+EXPLAIN_LIMIT = getattr(settings, 'REQUEST_METRICS_EXPLAIN_LIMIT', 3)
+PROJECT_ROOT = str(settings.BASE_DIR) + os.sep
+SQL_PREVIEW = 300
+
+_current = ContextVar('request_metrics', default=None)
+_MISSING = object()
+
+
+class QueryRecord:
+    __slots__ = ('alias', 'sql', 'params', 'duration', 'origin')
+
+    def __init__(self, alias, sql, params, duration, origin):
+        self.alias = alias
+        self.sql = sql
+        self.params = params
+        self.duration = duration
+        self.origin = origin
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.duration = None
+        self.queries = []
+        self.template_time = 0.0
+        self.rendering = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def sql_time(self):
+        return sum(query.duration for query in self.queries)
+
+    def duplicates(self):
+        """Aynı SQL ve parametrelerle tekrar çalışan sorgu sayısı."""
+        counts = Counter((query.sql, repr(query.params)) for query in self.queries)
+        return sum(count - 1 for count in counts.values())
+
+    def similar(self, limit=5):
+        """Aynı SQL'in farklı parametrelerle tekrarı (N+1 adayı); en sık olanlar önce."""
+        groups = defaultdict(list)
+        for query in self.queries:
+            groups[query.sql].append(query)
+        repeated = sorted((group for group in groups.values() if len(group) > 1), key=len, reverse=True)
+        return [
+            {'sql': group[0].sql[:SQL_PREVIEW], 'count': len(group),
+             'origin': Counter(query.origin for query in group).most_common(1)[0][0]}
+            for group in repeated[:limit]
+        ]
+
+
+# ======================
+# Ölçüm noktaları
+# ======================
+
+def _origin():
+    """En içteki şablon düğümünün satırı, yoksa proje içindeki ilk çağıran."""
+    caller = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin, token = getattr(node, 'origin', None), getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                return f'{origin.template_name or origin.name}:{token.lineno}'
+        elif (caller is None and code.co_filename.startswith(PROJECT_ROOT) and code.co_filename != __file__
+              and 'site-packages' not in code.co_filename):
+            caller = f'{code.co_filename[len(PROJECT_ROOT):]}:{frame.f_lineno} {code.co_name}'
+        frame = frame.f_back
+    return caller or '?'
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries.append(QueryRecord(
+            context['connection'].alias, sql, None if many else params, time.perf_counter() - start, _origin()))
+
+
+def _install_query_wrapper(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _wrap_template_render():
+    original = Template.render
+
+    def render(self, context):
+        metrics = _current.get()
+        if metrics is None or metrics.rendering:
+            return original(self, context)
+        metrics.rendering = True
+        start = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            metrics.template_time += time.perf_counter() - start
+            metrics.rendering = False
+
+    render.instrumented = True
+    Template.render = render
+
+
+def _wrap_cache_backend(backend_class):
+    original_get = backend_class.get
+
+    def get(self, key, default=None, version=None):
+        value = original_get(self, key, _MISSING, version=version)
+        metrics = _current.get()
+        if metrics is not None:
+            if value is _MISSING:
+                metrics.cache_misses += 1
+            else:
+                metrics.cache_hits += 1
+        return default if value is _MISSING else value
+
+    get.instrumented = True
+    backend_class.get = get
+
+    # BaseCache.get_many zaten get'i çağırır; yalnızca kendi get_many'si olan backend'ler sarılır
+    if backend_class.get_many is not BaseCache.get_many:
+        original_get_many = backend_class.get_many
+
+        def get_many(self, keys, version=None):
+            keys = list(keys)
+            values = original_get_many(self, keys, version=version)
+            metrics = _current.get()
+            if metrics is not None:
+                metrics.cache_hits += len(values)
+                metrics.cache_misses += len(keys) - len(values)
+            return values
+
+        backend_class.get_many = get_many
+
+
+def install():
+    """CoreConfig.ready'den bir kez çağrılır."""
+    connection_created.connect(_install_query_wrapper, dispatch_uid='core-metrics-queries')
+    for connection in connections.all(initialized_only=True):
+        _install_query_wrapper(None, connection)
+    if not getattr(Template.render, 'instrumented', False):
+        _wrap_template_render()
+
+
+def _instrument_caches():
+    # backend sınıfı ayarlarla değişebilir; yeni sınıflar ilk istekte sarılır
+    for alias in settings.CACHES:
+        backend_class = type(caches[alias])
+        if not getattr(backend_class.get, 'instrumented', False):
+            _wrap_cache_backend(backend_class)
+
+
+# ======================
+# İstek başı / sonu
+# ======================
+
+def begin():
+    _instrument_caches()
+    metrics = RequestMetrics()
+    _current.set(metrics)
+    return metrics
+
+
+def _explain(query):
+    connection = connections[query.alias]
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + query.sql, query.params)
+            return [' '.join(str(column) for column in row) for row in cursor.fetchall()]
+    except Exception as exc:
+        # tanı amaçlı; hiçbir hata yanıtı bozmamalı
+        return [f'EXPLAIN başarısız: {exc}']
+
+
+def slow_queries(metrics, limit=EXPLAIN_LIMIT):
+    selects = [query for query in metrics.queries
+               if query.params is not None and query.sql.lstrip().upper().startswith('SELECT')]
+    selects.sort(key=lambda query: query.duration, reverse=True)
+    return [
+        {'sql': query.sql[:SQL_PREVIEW], 'ms': round(query.duration * 1000, 2), 'origin': query.origin,
+         'plan': _explain(query)}
+        for query in selects[:limit]
+    ]
+
+
+def server_timing(metrics):
+    return ', '.join((
+        f'db;dur={metrics.sql_time * 1000:.2f};desc="{len(metrics.queries)} queries, {metrics.duplicates()} dup"',
+        f'tpl;dur={metrics.template_time * 1000:.2f}',
+        f'cache;desc="{metrics.cache_hits} hit, {metrics.cache_misses} miss"',
+        f'app;dur={(time.perf_counter() - metrics.started) * 1000:.2f}',
+    ))
+
+
+def _show_header(request):
+    # 'all': her yanıtta, 'staff': yalnızca yönetici oturumlarında
+    audience = getattr(settings, 'REQUEST_METRICS_HEADER', 'staff')
+    if audience == 'all':
+        return True
+    user = getattr(request, 'user', None)
+    return audience == 'staff' and user is not None and user.is_staff
+
+
+def view_name(request):
+    """(view fonksiyonunun tam adı, url adı); çözümlenmemiş isteklerde (None, None)."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None, None
+    func = match.func
+    return f'{func.__module__}.{getattr(func, "__qualname__", func.__class__.__name__)}', match.view_name
+
+
+def log(request, response, metrics):
+    # EXPLAIN sorguları ölçüme yazılmasın
+    _current.set(None)
+    duration = metrics.duration if metrics.duration is not None else time.perf_counter() - metrics.started
+    view, route = view_name(request)
+    record = {
+        'method': request.method, 'path': request.path, 'status': response.status_code,
+        'view': view, 'route': route, 'ms': round(duration * 1000, 2),
+        'queries': len(metrics.queries), 'sql_ms': round(metrics.sql_time * 1000, 2),
+        'duplicates': metrics.duplicates(), 'similar': metrics.similar(),
+        'template_ms': round(metrics.template_time * 1000, 2),
+        'cache_hits': metrics.cache_hits, 'cache_misses': metrics.cache_misses,
+    }
+    if duration * 1000 >= getattr(settings, 'REQUEST_METRICS_SLOW_MS', 1000):
+        record['slow_queries'] = slow_queries(metrics)
+        logger.warning(json.dumps(record, ensure_ascii=False, default=str))
+    else:
+        logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+def _stream(request, response, metrics, content):
+    # gövde üretilirken çalışan sorgular da ölçülür; log akış bitince yazılır
+    _current.set(metrics)
+    try:
+        yield from content
+    finally:
+        metrics.duration = time.perf_counter() - metrics.started
+        log(request, response, metrics)
+
+
+async def _astream(request, response, metrics, content):
+    _current.set(metrics)
+    try:
+        async for chunk in content:
+            yield chunk
+    finally:
+        metrics.duration = time.perf_counter() - metrics.started
+        await sync_to_async(log)(request, response, metrics)
+
+
+def end(request, response, metrics):
+    """Başlığı ekler ve logu yazar; akışlı yanıtlarda log gövde bitince yazılır."""
+    _current.set(None)
+    if _show_header(request):
+        response.headers['Server-Timing'] = server_timing(metrics)
+    # dosya yanıtlarında sorgu çalışmaz; sarmak sendfile (wsgi.file_wrapper) yolunu kapatırdı
+    if response.streaming and not isinstance(response, FileResponse):
+        stream = _astream if response.is_async else _stream
+        response.streaming_content = stream(request, response, metrics, response.streaming_content)
+    else:
+        metrics.duration = time.perf_counter() - metrics.started
+        log(request, response, metrics)
+    return response
@@ -0,0 +1,126 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from companyinfo.models import Branch, BranchPhoneNumber
+from homepage.models import Statistics_area, Our_values, Faq, Business_partner
+
+from .catalog import acatalog_page, catalog_page, next_page_url
+from .taxonomy import taxonomy_tree
+
+
+def homepage_products():
+    """
+    Portfolyo listesinin ilk sayfası: kategori/seri/model ve kapak görseli tek
+    JOIN'li sorguyla gelir. Devamı "daha fazla" ile katalog API'sinden yüklenir.
+    """
+    products, next_cursor = catalog_page()
+    return products, next_page_url('catalog_api', next_cursor)
+
+
+async def ahomepage_products():
+    products, next_cursor = await acatalog_page()
+    return products, next_page_url('catalog_api', next_cursor)
+
+
+def homepage_sections():
+    """
+    Birbirinden bağımsız ana sayfa sorguları: (context anahtarı, QuerySet, tek kayıt mı).
+    Senkron ve async yükleyiciler aynı listeyi kullanır. Firma, hero ve hakkında
+    kayıtları core.context_processors.site_settings ile, kategori/seri/model
+    ağacı core.taxonomy'den gelir.
+    """
+    return (
+        ('statistic_area', Statistics_area.objects.all(), False),
+        ('our_values', Our_values.objects.all(), False),
+        ('faq', Faq.objects.all(), False),
+        ('business_partner', Business_partner.objects.all(), False),
+        ('branches', Branch.objects.all(), False),
+        ('phone_number', BranchPhoneNumber.objects.all(), False),
+    )
+
+
+def _taxonomy_context(tree):
+    return {'categories': tree.categories, 'series': tree.series, 'series_models': tree.series_models()}
+
+
+def _homepage_context(sections, tree, products, products_next_url):
+    return {
+        **sections,
+        **_taxonomy_context(tree),
+        'products': products,
+        'products_next_url': products_next_url,
+    }
+
+
+def homepage_context():
+    """
+    Ana sayfanın tüm context'ini sabit sayıda sorguyla hazırlar.
+    Her QuerySet burada listeye çevrilir; şablon içinde lazy sorgu kalmaz.
+    """
+    sections = {
+        key: queryset.first() if single else list(queryset)
+        for key, queryset, single in homepage_sections()
+    }
+    return _homepage_context(sections, taxonomy_tree(), *homepage_products())
+
+
+# Akışlı ana sayfa (views.index): şablon parçaları ve her parçadan hemen önce
+# yüklenen veriler. 'taxonomy' kategori/seri/model ağacı, 'products' portfolyo
+# listesidir; diğerleri homepage_sections anahtarlarıdır.
+HOMEPAGE_PARTS = (
+    ('core/index/head.html', ()),
+    ('core/index/header.html', ()),
+    ('core/index/hero.html', ()),
+    ('core/index/catalog.html', ('statistic_area', 'taxonomy', 'products')),
+    ('core/index/sections.html', ('our_values', 'business_partner', 'faq')),
+    ('core/index/contact.html', ('branches', 'phone_number')),
+    ('core/index/footer.html', ()),
+)
+
+
+def homepage_parts():
+    """
+    HOMEPAGE_PARTS sırasıyla (şablon adı, context eki) üretir. Bir parçanın
+    sorguları ancak önceki parça istendikten sonra çalışır; akış böylece ilk
+    sorgudan önce başlar. Toplam sorgu sayısı homepage_context ile aynıdır.
+    """
+    sections = {key: (queryset, single) for key, queryset, single in homepage_sections()}
+    for template_name, keys in HOMEPAGE_PARTS:
+        data = {}
+        for key in keys:
+            if key == 'taxonomy':
+                data.update(_taxonomy_context(taxonomy_tree()))
+            elif key == 'products':
+                data['products'], data['products_next_url'] = homepage_products()
+            else:
+                queryset, single = sections[key]
+                data[key] = queryset.first() if single else list(queryset)
+        yield template_name, data
+
+
+async def alist(queryset):
+    return [obj async for obj in queryset]
+
+
+async def _afetch(queryset, single):
+    return await queryset.afirst() if single else await alist(queryset)
+
+
+async def ahomepage_context():
+    """
+    homepage_context'in async karşılığı: bağımsız bölümler asyncio.gather ile
+    aynı anda istenir. Django'nun async ORM'u sorguları hâlâ thread havuzunda
+    çalıştırır; kazanç, event loop'un sorgular beklenirken başka istekleri
+    işleyebilmesidir.
+    """
+    sections = homepage_sections()
+    results = await asyncio.gather(
+        ahomepage_products(),
+        sync_to_async(taxonomy_tree)(),
+        *(_afetch(queryset, single) for key, queryset, single in sections),
+    )
+    (products, products_next_url), tree = results[:2]
+    return _homepage_context(
+        {key: value for (key, queryset, single), value in zip(sections, results[2:])},
+        tree, products, products_next_url,
+    )
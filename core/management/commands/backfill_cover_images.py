@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.models import backfill_cover_images
+
+
+class Command(BaseCommand):
+    help = "Mevcut ürünlerin kapak görseli (cover_image) alanını doldurur."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        changed = backfill_cover_images(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{changed} ürünün kapak görseli güncellendi."))
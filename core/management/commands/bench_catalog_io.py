@@ -0,0 +1,62 @@
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from core.bench import temporary_database
+from core.catalog_io import BATCH_SIZE, FIELDS, export_catalog, import_catalog
+
+
+class _NullWriter:
+    def write(self, value):
+        pass
+
+
+def write_sample_csv(path, rows):
+    """10 kategori, 50 seri ve 200 model altında `rows` ürünlük örnek dosya."""
+    with open(path, 'w', encoding='utf-8', newline='') as fp:
+        writer = csv.writer(fp)
+        writer.writerow(FIELDS)
+        for i in range(rows):
+            model = i % 200
+            writer.writerow([
+                f'SKU-{i:07d}', f'Ürün {i:07d}', f'Kategori {model % 10}', f'Seri {model % 50}',
+                f'Model {model}', 60, 180.5, 50, i % 7, '<p>Açıklama</p>', '',
+            ])
+
+
+class Command(BaseCommand):
+    help = ("Toplu içe aktarımın (oluşturma ve güncelleme) ve dışa aktarımın satır/sn hızını "
+            "geçici bir test veritabanında ölçer; dışa aktarımda en yüksek bellek kullanımını da gösterir.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def report(self, label, rows, elapsed, extra=''):
+        self.stdout.write(f"{label:<28} {rows:>8} satır  {elapsed:8.2f} sn  {rows / elapsed:10.0f} satır/sn{extra}")
+
+    def handle(self, *args, **options):
+        rows, batch_size = options['rows'], options['batch_size']
+        with tempfile.TemporaryDirectory() as directory, temporary_database():
+            path = os.path.join(directory, 'katalog.csv')
+            write_sample_csv(path, rows)
+
+            for label in ('İçe aktarım (oluşturma)', 'İçe aktarım (güncelleme)'):
+                start = time.perf_counter()
+                with open(path, 'rb') as fp:
+                    report = import_catalog(fp, 'csv', batch_size=batch_size)
+                self.report(label, report.rows, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            count = export_catalog(_NullWriter(), 'csv')
+            elapsed = time.perf_counter() - start
+            # tracemalloc ölçümü yavaşlatır; bellek ayrı bir turda ölçülür
+            tracemalloc.start()
+            export_catalog(_NullWriter(), 'csv')
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.report('Dışa aktarım (CSV)', count, elapsed, f"  en yüksek bellek {peak / (1024 * 1024):.1f} MB")
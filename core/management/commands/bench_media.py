@@ -0,0 +1,52 @@
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.views import static
+
+from core import media
+from core.bench import consume, measure
+
+
+class Command(BaseCommand):
+    help = ("Medya sunumunu ölçer: django.views.static.serve ile core.media.serve "
+            "(tam dosya ve video ileri sarma gibi aralık istekleri).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=64, help="Test dosyası boyutu (MB).")
+        parser.add_argument('--range-size', type=int, default=1, help="Aralık isteği boyutu (MB).")
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        size = options['size'] * 1024 * 1024
+        range_size = options['range_size'] * 1024 * 1024
+        repeat = options['repeat']
+        factory = RequestFactory()
+
+        with tempfile.TemporaryDirectory() as root:
+            with open(os.path.join(root, 'video.mp4'), 'wb') as fp:
+                for _ in range(size // (1024 * 1024)):
+                    fp.write(os.urandom(1024 * 1024))
+
+            def get(view, **headers):
+                def run():
+                    assert consume(view(factory.get('/media/video.mp4', headers=headers), 'video.mp4', root))
+                return run
+
+            middle = size // 2
+            range_header = f'bytes={middle}-{middle + range_size - 1}'
+            results = [
+                measure('static.serve: tam dosya', get(static.serve), repeat, size=size),
+                measure('media.serve: tam dosya', get(media.serve), repeat, size=size),
+                # static.serve Range'i yok sayar; ileri sarmada tüm dosya yeniden iner
+                measure('static.serve: ortadan 1 aralık', get(static.serve, range=range_header), repeat, size=range_size),
+                measure('media.serve: ortadan 1 aralık', get(media.serve, range=range_header), repeat, size=range_size),
+            ]
+
+        self.stdout.write(f"Dosya: {options['size']} MB, aralık: {options['range_size']} MB, tekrar: {repeat}")
+        for result in results:
+            self.stdout.write(str(result))
+        self.stdout.write(
+            "Not: WSGI altında (gunicorn) media.serve dosyayı os.sendfile ile gönderir; "
+            "buradaki ölçüm Python içinden okuma maliyetini gösterir.")
@@ -0,0 +1,141 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.test import RequestFactory, override_settings
+from django.urls import path
+
+from core import views
+from core.bench import LoadResult, seed_products, temporary_database
+
+HOST = 'localhost'
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class URLConf:
+    """ROOT_URLCONF yerine geçen modül benzeri nesne (get_resolver hashable ister)."""
+
+    def __init__(self, index, catalog, catalog_api):
+        self.urlpatterns = [
+            path('', index, name='index'),
+            path('katalog/', catalog, name='catalog'),
+            path('api/katalog/', catalog_api, name='catalog_api'),
+            path('urun/<int:pk>/', views.product_detail, name='product_detail'),
+            path('api/arama/', views.product_search, name='product_search'),
+        ]
+
+
+WSGI_URLCONF = URLConf(views.index, views.catalog, views.catalog_api)
+ASGI_URLCONF = URLConf(views.index_async, views.catalog_async, views.catalog_api_async)
+
+
+def run_wsgi(paths, concurrency):
+    """gunicorn --threads benzeri: thread havuzu WSGIHandler'ı çağırır."""
+    application = get_wsgi_application()
+    factory = RequestFactory()
+
+    def one(url):
+        status = []
+        start = time.perf_counter()
+        body = application(factory.get(url, headers={'host': HOST}).environ,
+                           lambda code, headers, exc_info=None: status.append(code))
+        for chunk in body:
+            pass
+        if hasattr(body, 'close'):
+            body.close()
+        return time.perf_counter() - start, status[0].startswith('200')
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, paths))
+    return results, time.perf_counter() - start
+
+
+async def _asgi_request(application, url):
+    parts = urlsplit(url)
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': parts.path, 'raw_path': parts.path.encode(), 'root_path': '',
+        'query_string': parts.query.encode(), 'headers': [(b'host', HOST.encode())],
+        'client': ('127.0.0.1', 0), 'server': (HOST, 80),
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # istemci bağlantıyı kesmez; Django yanıt bitince bu bekleyişi iptal eder
+        await asyncio.Future()
+
+    status = []
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    start = time.perf_counter()
+    await application(scope, receive, send)
+    return time.perf_counter() - start, status[0] == 200
+
+
+async def _run_asgi(paths, concurrency):
+    application = get_asgi_application()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(url):
+        async with semaphore:
+            return await _asgi_request(application, url)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(limited(url) for url in paths))
+    return results, time.perf_counter() - start
+
+
+def run_asgi(paths, concurrency):
+    """uvicorn benzeri: tek event loop, eşzamanlı en fazla `concurrency` istek."""
+    return asyncio.run(_run_asgi(paths, concurrency))
+
+
+class Command(BaseCommand):
+    help = ("WSGI (senkron görünümler, thread havuzu) ile ASGI (async görünümler, event loop) "
+            "yollarının eşzamanlı yük altında p50/p99 gecikme ve istek/sn değerlerini karşılaştırır.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', help="Ölçülecek adres(ler); varsayılan '/' ve '/api/katalog/'.")
+        parser.add_argument('--requests', type=int, default=200, help="Yol başına istek sayısı.")
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--page-cache', action='store_true',
+                            help="Sayfa cache'i devrede kalsın (varsayılan: her istek görünümü çalıştırır).")
+        parser.add_argument('--test-db', action='store_true',
+                            help="Geçici bir test veritabanında --products kadar ürünle ölç.")
+        parser.add_argument('--products', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['test_db']:
+            with temporary_database():
+                seed_products(options['products'])
+                self.benchmark(options)
+        else:
+            self.benchmark(options)
+
+    def benchmark(self, options):
+        count, concurrency = options['requests'], options['concurrency']
+        for url in options['path'] or ['/', '/api/katalog/']:
+            separator = '&' if '?' in url else '?'
+            # her isteğe farklı sorgu dizesi: sayfa cache'i isabet etmesin
+            paths = [url if options['page_cache'] else f'{url}{separator}_bench={i}' for i in range(count)]
+            self.stdout.write(f"\n{url}  ({count} istek, eşzamanlılık {concurrency})")
+            for label, runner, conf in (('WSGI (senkron)', run_wsgi, WSGI_URLCONF),
+                                        ('ASGI (async)', run_asgi, ASGI_URLCONF)):
+                with override_settings(ROOT_URLCONF=conf, CACHES=LOCMEM_CACHES):
+                    runner(paths[:concurrency], concurrency)  # ısınma
+                    results, elapsed = runner(paths, concurrency)
+                latencies = [latency for latency, ok in results]
+                errors = sum(1 for latency, ok in results if not ok)
+                self.stdout.write(str(LoadResult(label, latencies, elapsed, errors)))
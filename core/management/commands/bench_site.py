@@ -0,0 +1,219 @@
+import json
+import platform
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core import seed
+from core.bench import LoadResult, git_revision, peak_rss_mb, read_timed, temporary_database, wsgi_server
+from core.models import Product
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+# hedefe özel ayarlar: ana sayfa akışsız (tek parça) render ile de ölçülür
+TARGET_SETTINGS = {'index_buffered': {'HOMEPAGE_STREAMING': False}}
+# tarayıcısız ilk boyama (FCP) yaklaşımı: <head> ve hero bölümünün geldiği an
+FIRST_PAINT_MARKERS = {
+    'index': b'<!-- /Hero Section -->',
+    'index_buffered': b'<!-- /Hero Section -->',
+}
+
+
+def targets():
+    """(ad, adres, yönetici oturumu gerekir mi)."""
+    product = Product.objects.order_by('pk').first()
+    return [
+        ('index', reverse('index'), False),
+        ('index_buffered', reverse('index'), False),
+        ('catalog', reverse('catalog'), False),
+        ('catalog_api', reverse('catalog_api'), False),
+        ('product_detail', reverse('product_detail', args=[product.pk]), False),
+        ('search', reverse('product_search') + '?q=celik', False),
+        ('admin_products', reverse('admin:core_product_changelist'), True),
+        ('admin_branches', reverse('admin:companyinfo_branch_changelist'), True),
+    ]
+
+
+def _bust(url, index, admin):
+    # izin listesinde olmayan parametre sayfa cache'ini atlatır; admin bilinmeyen parametreyi hata sayar, onlar cache'lenmez zaten
+    if admin:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}_bench={index}"
+
+
+class Command(BaseCommand):
+    help = ("Geçici bir veritabanında her ölçek için sentetik veri üretir; ana sayfa, katalog, ürün, "
+            "arama ve admin listelerini test istemcisiyle (sorgu sayısıyla) ve gerçek bir WSGI "
+            "sunucusuyla ölçer. p50/p90/p99, ilk bayt (TTFB), ana sayfada ilk boyama yaklaşımı (FCP), "
+            "istek/sn, istek başına sorgu ve tepe RSS JSON rapora yazılır; "
+            "--compare ile önceki bir raporla karşılaştırılır. Ağ erişimi gerekmez.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='small,medium',
+                            help="Virgülle ayrılmış ölçekler: small, medium, large ya da ürün sayıları.")
+        parser.add_argument('--requests', type=int, default=50, help="Hedef ve mod başına istek sayısı.")
+        parser.add_argument('--concurrency', type=int, default=8, help="WSGI sunucusuna eşzamanlı istek.")
+        parser.add_argument('--target', action='append', help="Yalnızca bu hedef(ler).")
+        parser.add_argument('--no-server', action='store_true', help="Gerçek WSGI sunucusu ölçümünü atla.")
+        parser.add_argument('--page-cache', action='store_true', help="Sayfa cache'i isabet etsin.")
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help="JSON raporun yazılacağı dosya.")
+        parser.add_argument('--compare', help="Karşılaştırılacak önceki JSON rapor.")
+
+    def handle(self, *args, **options):
+        try:
+            scales = [seed.scale_products(scale.strip()) for scale in options['scales'].split(',')]
+        except ValueError:
+            raise CommandError(f"Geçersiz ölçek: {options['scales']}")
+        revision, dirty = git_revision()
+        report = {
+            'meta': {
+                'revision': revision, 'dirty': dirty, 'created': timezone.now().isoformat(),
+                'python': platform.python_version(), 'django': django.get_version(),
+                'database': connection.vendor, 'requests': options['requests'],
+                'concurrency': options['concurrency'], 'page_cache': options['page_cache'],
+            },
+            'scales': [],
+        }
+        # ölçülen istekler yavaş istek uyarısı (EXPLAIN) üretmesin
+        with override_settings(CACHES=LOCMEM_CACHES, ALLOWED_HOSTS=['*'], REQUEST_METRICS_HEADER='none',
+                               REQUEST_METRICS_SLOW_MS=float('inf')):
+            for products in scales:
+                with temporary_database(on_disk=True):
+                    report['scales'].append(self.run_scale(products, options))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fp:
+                json.dump(report, fp, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Rapor: {options['output']}")
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as fp:
+                self.compare(json.load(fp), report)
+
+    def run_scale(self, products, options):
+        started = time.perf_counter()
+        seed.seed(products, seed=options['seed'])
+        seeded = time.perf_counter() - started
+        self.stdout.write(f"\n{products} ürün (veri {seeded:.1f} sn)")
+
+        user = User.objects.create_superuser('bench', 'bench@example.com', 'bench')
+        admin_client = Client()
+        admin_client.force_login(user)
+        session_cookie = f"{settings.SESSION_COOKIE_NAME}={admin_client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+        results = []
+        for name, url, admin in targets():
+            if options['target'] and name not in options['target']:
+                continue
+            # istemci ve sunucu ölçümleri ayrı adresler kullanır; biri diğerinin cache'ini doldurmasın
+            paths = {mode: [url if options['page_cache'] else _bust(url, f'{name}-{mode}-{i}', admin)
+                            for i in range(options['requests'])] for mode in ('client', 'wsgi')}
+            client = admin_client if admin else Client()
+            marker = FIRST_PAINT_MARKERS.get(name)
+            with override_settings(**TARGET_SETTINGS.get(name, {})):
+                row = {'target': name, 'path': url, **self.run_client(client, paths['client'], marker)}
+                results.append(row)
+                self.stdout.write(f"  {name:<16} istemci  {self.format(row)}")
+                if not options['no_server']:
+                    row = {'target': name, 'path': url, **self.run_server(
+                        paths['wsgi'], options['concurrency'], session_cookie if admin else None, marker)}
+                    results.append(row)
+                    self.stdout.write(f"  {name:<16} wsgi     {self.format(row)}")
+        return {'products': products, 'seed_seconds': round(seeded, 2), 'peak_rss_mb': peak_rss_mb(),
+                'results': results}
+
+    def run_client(self, client, paths, marker=None):
+        """Süreç içi, sıralı; istek başına sorgu sayısı da ölçülür (akışlı gövdenin sorguları dahil)."""
+        client.get(paths[0]).close()  # ısınma
+        latencies, firsts, paints, queries, errors = [], [], [], 0, 0
+        start = time.perf_counter()
+        for path in paths:
+            with CaptureQueriesContext(connection) as captured:
+                request_start = time.perf_counter()
+                response = client.get(path)
+                chunks = response.streaming_content if response.streaming else [response.content]
+                first, painted = read_timed(chunks, request_start, marker)
+                latencies.append(time.perf_counter() - request_start)
+                response.close()
+            firsts.append(first)
+            paints.append(painted)
+            queries += len(captured)
+            errors += response.status_code != 200
+        result = LoadResult('', latencies, time.perf_counter() - start, errors).as_dict()
+        return {'mode': 'client', **result, **self.first_bytes(firsts, paints), 'queries': round(queries / len(paths), 1)}
+
+    def run_server(self, paths, concurrency, cookie, marker=None):
+        headers = {'Cookie': cookie} if cookie else {}
+
+        def one(url):
+            request_start = time.perf_counter()
+            first = painted = None
+            try:
+                with urllib.request.urlopen(urllib.request.Request(base + url, headers=headers), timeout=60) as response:
+                    # read1 beklemeden gelen kadarını verir; parçaların varış anı ölçülür
+                    first, painted = read_timed(iter(lambda: response.read1(65536), b''), request_start, marker)
+                    ok = response.status == 200
+            except (urllib.error.URLError, OSError):
+                ok = False
+            return time.perf_counter() - request_start, first, painted, ok
+
+        with wsgi_server(get_wsgi_application()) as base:
+            one(paths[0])  # ısınma
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                outcomes = list(executor.map(one, paths))
+            elapsed = time.perf_counter() - start
+        result = LoadResult('', [latency for latency, *rest in outcomes], elapsed,
+                            sum(1 for *rest, ok in outcomes if not ok)).as_dict()
+        return {'mode': 'wsgi', **result, **self.first_bytes([outcome[1] for outcome in outcomes],
+                                                             [outcome[2] for outcome in outcomes])}
+
+    def first_bytes(self, firsts, paints):
+        """İlk bayt (TTFB) ve işaretli hedeflerde ilk boyama yaklaşımı (FCP) yüzdelikleri."""
+        row = {}
+        for name, values in (('ttfb', firsts), ('fcp', paints)):
+            values = [value for value in values if value is not None]
+            if values:
+                result = LoadResult('', values, 0)
+                row.update({f'{name}_p50_ms': round(result.percentile(50) * 1000, 2),
+                            f'{name}_p99_ms': round(result.percentile(99) * 1000, 2)})
+        return row
+
+    def format(self, row):
+        line = f"p50 {row['p50_ms']:8.2f} ms  p99 {row['p99_ms']:8.2f} ms  {row['rps']:8.1f} istek/sn"
+        if 'queries' in row:
+            line += f"  {row['queries']:5.1f} sorgu/istek"
+        if 'ttfb_p50_ms' in row:
+            line += f"  TTFB p50 {row['ttfb_p50_ms']:7.2f} ms"
+        if 'fcp_p50_ms' in row:
+            line += f"  FCP~ p50 {row['fcp_p50_ms']:7.2f} ms"
+        return line + (f"  hata {row['errors']}" if row['errors'] else '')
+
+    def compare(self, old, new):
+        """Aynı ölçek/hedef/mod satırlarının p50, p99 ve sorgu farkları."""
+        def rows(report):
+            return {(scale['products'], row['target'], row['mode']): row
+                    for scale in report['scales'] for row in scale['results']}
+
+        before = rows(old)
+        self.stdout.write(f"\nKarşılaştırma: {old['meta'].get('revision')} -> {new['meta'].get('revision')}")
+        for key, row in rows(new).items():
+            previous = before.get(key)
+            if previous is None:
+                continue
+            changes = []
+            for field in ('p50_ms', 'p99_ms', 'ttfb_p50_ms', 'fcp_p50_ms', 'queries'):
+                if field in row and previous.get(field):
+                    changes.append(f"{field} {previous[field]} -> {row[field]} ({(row[field] / previous[field] - 1) * 100:+.0f}%)")
+            self.stdout.write(f"  {key[0]:>6} {key[1]:<16} {key[2]:<6} " + '  '.join(changes))
@@ -0,0 +1,170 @@
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import OperationalError, connections, transaction
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+
+from core import db, seed
+from core.bench import LoadResult, temporary_database
+from core.models import Product
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+HOST = 'localhost'
+
+
+@contextmanager
+def sqlite_mode(production, conn_max_age):
+    """
+    SQLITE_PRODUCTION'ı bu blok için açar/kapatır. Kalıcı bağlantı ve
+    transaction_mode bağlantı ayarlarındandır; ortak ayar sözlüğünde geçici
+    olarak değiştirilir, yeni bağlantılar bunları kullanır.
+    """
+    changed = []
+    for alias in connections:
+        settings_dict = connections[alias].settings_dict
+        changed.append((settings_dict, settings_dict['CONN_MAX_AGE'], dict(settings_dict['OPTIONS'])))
+        if production:
+            settings_dict['CONN_MAX_AGE'] = conn_max_age
+            if alias == db.WRITE_ALIAS:
+                settings_dict['OPTIONS']['transaction_mode'] = 'IMMEDIATE'
+        else:
+            settings_dict['CONN_MAX_AGE'] = 0
+            settings_dict['OPTIONS'].pop('transaction_mode', None)
+    connections.close_all()
+    try:
+        with override_settings(SQLITE_PRODUCTION=production):
+            if not production:
+                # WAL dosyaya kalıcı yazılır; karşılaştırma varsayılan günlük kipiyle yapılır
+                with connections[db.WRITE_ALIAS].cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode = DELETE')
+            yield
+    finally:
+        connections.close_all()
+        for settings_dict, conn_max_age, options in changed:
+            settings_dict['CONN_MAX_AGE'] = conn_max_age
+            settings_dict['OPTIONS'] = options
+
+
+class Command(BaseCommand):
+    help = ("SQLite'ta eşzamanlı okuma ölçümü: geçici veritabanında katalog ve ürün sayfaları thread'lerden "
+            "okunurken bir thread admin gibi ürün kaydeder. Varsayılan ayarlar ile SQLite üretim modu "
+            "(WAL, pragmalar, kalıcı bağlantılar; bkz. core.db) yazar varken ve yokken karşılaştırılır.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=1000)
+        parser.add_argument('--readers', type=int, default=4, help="Okuyan thread sayısı.")
+        parser.add_argument('--seconds', type=float, default=5.0, help="Her ölçümün süresi.")
+        parser.add_argument('--write-pause', type=float, default=0.0,
+                            help="Yazar thread'in iki kayıt arasındaki beklemesi (sn).")
+        parser.add_argument('--conn-max-age', type=int, default=600)
+        parser.add_argument('--output', help="JSON raporun yazılacağı dosya.")
+
+    def handle(self, *args, **options):
+        rows = []
+        with override_settings(CACHES=LOCMEM_CACHES, ALLOWED_HOSTS=[HOST], REQUEST_METRICS=False,
+                               REQUEST_PROFILE=False, REQUEST_METRICS_HEADER='none'):
+            with temporary_database(on_disk=True):
+                seed.seed(options['products'], renditions=False)
+                ids = list(Product.objects.values_list('pk', flat=True))
+                paths = [reverse('catalog')] + [reverse('product_detail', args=[pk]) for pk in ids[:200]]
+                self.stdout.write(f"{len(ids)} ürün, {options['readers']} okuyucu, {options['seconds']:.0f} sn; "
+                                  f"okuma bağlantısı: {'var' if db.READ_ALIAS in connections else 'yok'}")
+                for production in (False, True):
+                    with sqlite_mode(production, options['conn_max_age']):
+                        for writing in (False, True):
+                            row = self.run(paths, ids, options, writing)
+                            row.update({'mode': 'production' if production else 'default', 'writer': writing})
+                            rows.append(row)
+                            self.stdout.write(self.format(row))
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fp:
+                json.dump({'options': {key: options[key] for key in ('products', 'readers', 'seconds', 'write_pause')},
+                           'results': rows}, fp, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Rapor: {options['output']}")
+
+    def run(self, paths, ids, options, writing):
+        application = get_wsgi_application()
+        factory = RequestFactory()
+        stop = threading.Event()
+        reads, writes = [], []
+        errors = {'read': 0, 'write': 0}
+        lock = threading.Lock()
+
+        def reader(index):
+            rng = random.Random(index)
+            latencies, failed, number = [], 0, 0
+            try:
+                while not stop.is_set():
+                    number += 1
+                    path = rng.choice(paths)
+                    # sayfa cache'i isabet etmesin
+                    environ = factory.get(f'{path}?_bench={index}-{number}', headers={'host': HOST}).environ
+                    status = []
+                    start = time.perf_counter()
+                    body = application(environ, lambda code, headers, exc_info=None: status.append(code))
+                    b''.join(body)
+                    body.close()
+                    latencies.append(time.perf_counter() - start)
+                    failed += not status[0].startswith('200')
+            finally:
+                connections.close_all()
+            with lock:
+                reads.extend(latencies)
+                errors['read'] += failed
+
+        def writer():
+            # admin kayıt akışı: tek transaction'da save ve kapak görseli, okumalar yazardan
+            rng = random.Random(0)
+            try:
+                while not stop.is_set():
+                    start = time.perf_counter()
+                    try:
+                        with db.writer(), transaction.atomic():
+                            product = Product.objects.get(pk=rng.choice(ids))
+                            product.name = f'{product.name.rsplit(" #", 1)[0]} #{len(writes)}'
+                            product.description += ' '
+                            product.save()
+                            product.refresh_cover_image()
+                    except OperationalError:
+                        errors['write'] += 1
+                    else:
+                        writes.append(time.perf_counter() - start)
+                    if options['write_pause']:
+                        time.sleep(options['write_pause'])
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=reader, args=(index,)) for index in range(options['readers'])]
+        if writing:
+            threads.append(threading.Thread(target=writer))
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(options['seconds'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        row = LoadResult('', reads, elapsed, errors['read']).as_dict()
+        row = {f'read_{key}': value for key, value in row.items()}
+        if writing:
+            written = LoadResult('', writes, elapsed, errors['write']).as_dict()
+            row.update({f'write_{key}': written[key] for key in ('requests', 'errors', 'rps', 'p50_ms', 'p99_ms')})
+        return row
+
+    def format(self, row):
+        line = (f"  {row['mode']:<10} {'yazar var' if row['writer'] else 'yazar yok':<9}  okuma "
+                f"{row['read_rps']:7.1f}/sn  p50 {row['read_p50_ms']:7.2f} ms  p99 {row['read_p99_ms']:8.2f} ms")
+        if row['read_errors']:
+            line += f"  hata {row['read_errors']}"
+        if row['writer']:
+            line += (f"  |  kayıt {row['write_rps']:6.1f}/sn  p99 {row['write_p99_ms']:8.2f} ms"
+                     + (f"  hata {row['write_errors']}" if row['write_errors'] else ''))
+        return line
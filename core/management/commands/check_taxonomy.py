@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F, Q
+
+from core import facets
+from core.cache import bump_content_version
+from core.models import ModelCategory, Product
+from core.taxonomy import bump_taxonomy_version
+
+
+class Command(BaseCommand):
+    help = ("Kategori/seri/model kopya alanlarının tutarlılığını denetler: modelin kategorisi "
+            "serisininkiyle, ürünün seri/kategorisi modelininkiyle aynı olmalı.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help="Tutarsızlıkları alt düzeye göre düzelt.")
+
+    def handle(self, *args, **options):
+        models = ModelCategory.objects.exclude(category_id=F('series__category_id'))
+        products_by_model = Product.objects.filter(model__isnull=False).filter(
+            ~Q(series_id=F('model__series_id')) | ~Q(category_id=F('model__category_id')) | Q(series__isnull=True))
+        products_by_series = Product.objects.filter(model__isnull=True, series__isnull=False).exclude(
+            category_id=F('series__category_id'))
+        checks = (
+            ("model (kategori != seri.kategori)", models),
+            ("ürün (seri/kategori != model)", products_by_model),
+            ("ürün (kategori != seri.kategori)", products_by_series),
+        )
+        counts = [(label, queryset.count()) for label, queryset in checks]
+        for label, count in counts:
+            self.stdout.write(f"{label}: {count}")
+        total = sum(count for label, count in counts)
+        if not total:
+            self.stdout.write(self.style.SUCCESS("Ağaç tutarlı."))
+            return
+        if not options['fix']:
+            raise CommandError(f"{total} tutarsız kayıt; düzeltmek için --fix.")
+
+        with transaction.atomic():
+            # önce modeller: ürün düzeltmesi modelin (düzeltilmiş) kategorisini kullanır
+            for model in models.select_related('series'):
+                ModelCategory.objects.filter(pk=model.pk).update(category_id=model.series.category_id)
+            for product in products_by_model.select_related('model').only('pk', 'model__series', 'model__category'):
+                Product.objects.filter(pk=product.pk).update(
+                    series_id=product.model.series_id, category_id=product.model.category_id)
+            for product in products_by_series.select_related('series').only('pk', 'series__category'):
+                Product.objects.filter(pk=product.pk).update(category_id=product.series.category_id)
+            bump_taxonomy_version()
+            facets.request_rebuild()
+            transaction.on_commit(bump_content_version)
+        self.stdout.write(self.style.SUCCESS(f"{total} kayıt düzeltildi."))
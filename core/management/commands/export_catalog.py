@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.catalog_io import FORMATS, CatalogImportError, export_catalog
+
+
+class Command(BaseCommand):
+    help = "Kataloğu içe aktarımla aynı biçimde CSV/XLSX/JSONL olarak dışa aktarır."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--output', '-o', help="Varsayılan: standart çıktı (XLSX için zorunlu).")
+
+    def handle(self, *args, **options):
+        fmt, output = options['format'], options['output']
+        if fmt == 'xlsx' and not output:
+            raise CommandError("XLSX için --output gerekli.")
+        try:
+            if output is None:
+                count = export_catalog(self.stdout, fmt)
+            elif fmt == 'xlsx':
+                count = export_catalog(output, fmt)
+            else:
+                with open(output, 'w', encoding='utf-8', newline='') as fp:
+                    count = export_catalog(fp, fmt)
+        except CatalogImportError as exc:
+            raise CommandError(exc)
+        self.stderr.write(self.style.SUCCESS(f"{count} ürün dışa aktarıldı."))
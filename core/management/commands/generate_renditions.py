@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.renditions import generate_for_instance
+from core.signals import RENDITION_FIELDS
+
+
+class Command(BaseCommand):
+    help = "Kayıtlı tüm görseller için AVIF/WebP/JPEG türevlerini üretir."
+
+    def handle(self, *args, **options):
+        for model, field_name in RENDITION_FIELDS.items():
+            count = 0
+            for instance in model.objects.exclude(**{field_name: ''}).iterator():
+                if generate_for_instance(instance, field_name):
+                    count += 1
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {count} görsel işlendi.")
+        self.stdout.write(self.style.SUCCESS("Tamamlandı."))
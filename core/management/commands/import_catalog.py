@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.catalog_io import BATCH_SIZE, FORMATS, CatalogImportError, detect_format, import_catalog
+
+
+class Command(BaseCommand):
+    help = ("Ürünleri CSV/XLSX/JSONL dosyasından toplu içe aktarır; stok koduna (sku) göre "
+            "oluşturur ya da günceller, eksik kategori/seri/modelleri ekler.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=FORMATS, help="Varsayılan: dosya uzantısı.")
+        parser.add_argument('--images', help="Görsellerin bulunduğu klasör ya da zip dosyası.")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--max-errors', type=int, default=50, help="Listelenecek en fazla hata satırı.")
+
+    def handle(self, *args, **options):
+        try:
+            fmt = options['format'] or detect_format(options['path'])
+            with open(options['path'], 'rb') as fp:
+                report = import_catalog(fp, fmt, images=options['images'], batch_size=options['batch_size'])
+        except (OSError, CatalogImportError) as exc:
+            raise CommandError(exc)
+
+        for error in report.errors[:options['max_errors']]:
+            self.stderr.write(str(error))
+        if len(report.errors) > options['max_errors']:
+            self.stderr.write(f"... {len(report.errors) - options['max_errors']} hata daha")
+        self.stdout.write(self.style.SUCCESS(str(report)))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import ProductVideo
+from core.video import VideoProcessingError, is_available, process_video
+
+
+class Command(BaseCommand):
+    help = "Ürün videoları için web kopyaları (faststart MP4) ve kapak karesi üretir."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pk', type=int, action='append', help="Yalnızca bu video(lar).")
+        parser.add_argument('--force', action='store_true', help="İşlenmiş videoları da yeniden üret.")
+
+    def handle(self, *args, **options):
+        if not is_available():
+            raise CommandError("ffmpeg/ffprobe bulunamadı; FFMPEG_BINARY / FFPROBE_BINARY ayarlarını kontrol edin.")
+        videos = ProductVideo.objects.exclude(video='').exclude(video=None)
+        if options['pk']:
+            videos = videos.filter(pk__in=options['pk'])
+
+        processed = failed = 0
+        for video in videos.iterator():
+            try:
+                if process_video(video, force=options['force']):
+                    processed += 1
+                    self.stdout.write(f"{video.video.name}: {video.width}x{video.height}, {video.duration:.1f} sn")
+            except VideoProcessingError as exc:
+                failed += 1
+                self.stderr.write(f"{video.video.name}: {exc}")
+        self.stdout.write(self.style.SUCCESS(f"{processed} video işlendi, {failed} hata."))
@@ -0,0 +1,22 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core import profiling
+
+
+class Command(BaseCommand):
+    help = ("Canlı bir isteği profillemek için imzalı belirteç üretir. Belirteç X-Profile-Token "
+            "başlığında ya da ?_profile= parametresinde gönderilir; kayıt admin'de Profil Kayıtları altındadır.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--label', default='', help="Kayıtta görünecek etiket (kim, hangi olay).")
+
+    def handle(self, *args, **options):
+        token = profiling.make_token(options['label'])
+        max_age = getattr(settings, 'REQUEST_PROFILE_TOKEN_MAX_AGE', 3600)
+        self.stdout.write(f"{profiling.CAPTURE_HEADER} yanıt başlığı kaydın numarasını verir; "
+                          f"belirteç {max_age} sn geçerlidir.")
+        self.stdout.write(f"curl -H 'X-Profile-Token: {token}' <adres>")
+        self.stdout.write(f"<adres>?{urlencode({profiling.TOKEN_PARAM: token})}")
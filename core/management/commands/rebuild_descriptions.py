@@ -0,0 +1,69 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, transaction
+
+from core import richtext
+from core.catalog_io import update_products
+from core.models import Product
+
+
+def render_chunk(rows):
+    """İşçi süreçte çalışır; veritabanına dokunmaz."""
+    return [
+        Product(pk=pk, description_html=richtext.render_description(description)[0],
+                description_hash=richtext.content_hash(description))
+        for pk, description in rows
+    ]
+
+
+class Command(BaseCommand):
+    help = ("Ürün açıklamalarının temizlenmiş HTML'ini (description_html) yeniden üretir. "
+            "Varsayılan olarak yalnızca kaynağı ya da dönüşüm sürümü değişenler işlenir.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Özeti güncel olanlar dahil hepsini işle.")
+        parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                            help="Paralel işçi süreç sayısı (1: aynı süreçte).")
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def pending(self, rebuild_all):
+        rows = Product.objects.order_by('pk').values_list('pk', 'description', 'description_hash')
+        chunk = []
+        for pk, description, digest in rows.iterator(chunk_size=2000):
+            if rebuild_all or digest != richtext.content_hash(description):
+                chunk.append((pk, description))
+                if len(chunk) >= self.batch_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        started = time.perf_counter()
+        # okuma bitmeden yazılmasın (SQLite'ta aynı bağlantıda açık imleç)
+        chunks = list(self.pending(options['all']))
+        workers = max(1, options['workers'])
+        if workers == 1 or len(chunks) <= 1:
+            results = map(render_chunk, chunks)
+        else:
+            # fork edilen süreçler açık bağlantıyı paylaşmasın
+            connections.close_all()
+            executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'))
+            results = executor.map(render_chunk, chunks)
+
+        count = 0
+        try:
+            for products in results:
+                with transaction.atomic():
+                    update_products(products, ('description_html', 'description_hash'))
+                count += len(products)
+        finally:
+            if workers > 1 and len(chunks) > 1:
+                executor.shutdown()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{count} ürün açıklaması {elapsed:.2f} sn'de yeniden üretildi ({workers} işçi, {connection.vendor})."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = "Ürün arama (FTS5) indeksini baştan oluşturur."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError("Tam metin arama yalnızca SQLite veritabanında kullanılabilir.")
+        search.index_products(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS("Arama indeksi yeniden oluşturuldu."))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import seed
+
+
+class Command(BaseCommand):
+    help = ("Yük testleri için sentetik katalog üretir: kategori/seri/model ağacı, görselli ve "
+            "videolu ürünler, telefonlu şubeler ve ana sayfa bölümleri. Aynı --seed aynı veriyi üretir.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', default='medium',
+                            help="small (10), medium (1.000), large (50.000) ya da doğrudan ürün sayısı.")
+        parser.add_argument('--branches', type=int, default=5)
+        parser.add_argument('--images-per-product', type=int, default=3)
+        parser.add_argument('--video-ratio', type=float, default=0.1)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--no-renditions', action='store_true', help="Görsel havuzu için türev üretme.")
+        parser.add_argument('--clear', action='store_true',
+                            help="Önce daha önce tohumlanmış ürünleri (SEED- stok kodlu), şubeleri ve boşalan "
+                                 "'Seed ' önekli kategori ağacını sil.")
+
+    def handle(self, *args, **options):
+        try:
+            products = seed.scale_products(options['scale'])
+        except ValueError:
+            raise CommandError(f"Geçersiz ölçek: {options['scale']}")
+        if options['clear']:
+            seed.clear()
+        started = time.perf_counter()
+        summary = seed.seed(
+            products, branches=options['branches'], images_per_product=options['images_per_product'],
+            video_ratio=options['video_ratio'], seed=options['seed'], renditions=not options['no_renditions'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['products']} ürün, {summary['images']} görsel, {summary['models']} model, "
+            f"{summary['branches']} şube {time.perf_counter() - started:.1f} sn'de oluşturuldu."))
@@ -0,0 +1,210 @@
+"""
+MEDIA_ROOT altındaki yüklenmiş dosyaları (ürün videoları, görseller) sunar.
+
+django.views.static.serve'den farkları:
+  * Range / If-Range desteği: video oynatıcı ileri sarınca yalnızca istenen
+    bayt aralığı gönderilir (206 Partial Content).
+  * WSGI'de (gunicorn) dosya nesnesi wsgi.file_wrapper'a verilir; gunicorn
+    os.sendfile ile kopyasız gönderir. Aralık isteklerinde dosya aralığın başına
+    konumlanır ve Content-Length aralık uzunluğuna ayarlanır, sendfile de bu
+    kadarını yollar.
+  * ASGI'de içerik async bir iterator ile parça parça okunur; Django'nun
+    senkron iterator'ı belleğe toplama yoluna düşülmez.
+  * ETag boyut ve değişiklik zamanından üretilir; If-None-Match /
+    If-Modified-Since 304 döner.
+  * İçerik türü uzantıdan belirlenir, nosniff gönderilir; tarayıcıda
+    çalıştırılabilecek türler (HTML, SVG ...) indirme olarak sunulur.
+"""
+import mimetypes
+import os
+import re
+import stat
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+BLOCK_SIZE = 256 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# mimetypes tablosu platforma göre değişir; sık kullanılanlar sabitlenir
+CONTENT_TYPES = {
+    '.mp4': 'video/mp4',
+    '.m4v': 'video/mp4',
+    '.webm': 'video/webm',
+    '.mov': 'video/quicktime',
+    '.ogv': 'video/ogg',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.avif': 'image/avif',
+    '.pdf': 'application/pdf',
+    '.json': 'application/json',
+}
+INLINE_TYPE_PREFIXES = ('video/', 'audio/', 'image/')
+INLINE_TYPES = {'application/pdf', 'application/json'}
+# içinde betik çalışabilecek türler yüklenmiş dosyada satır içi gösterilmez
+ATTACHMENT_TYPES = {'image/svg+xml'}
+# içerik özetli dosya adları (bkz. core.renditions) süresiz cache'lenebilir
+IMMUTABLE_PREFIXES = ('renditions/',)
+
+
+def content_type_for(path):
+    extension = os.path.splitext(path)[1].lower()
+    return CONTENT_TYPES.get(extension) or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+def is_inline(content_type):
+    if content_type in ATTACHMENT_TYPES:
+        return False
+    return content_type.startswith(INLINE_TYPE_PREFIXES) or content_type in INLINE_TYPES
+
+
+def file_etag(stat_result):
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """
+    Tek aralıklı 'bytes=' başlığını (başlangıç, bitiş) olarak döner (bitiş dahil).
+    Başlık yoksa ya da desteklenmiyorsa (çoklu aralık) None: tüm dosya gönderilir.
+    Karşılanamayan aralıkta ValueError.
+    """
+    match = RANGE_RE.match(header.replace(' ', '')) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-500: son 500 bayt
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def if_range_matches(request, etag, mtime):
+    """If-Range yoksa ya da dosya değişmemişse True; değiştiyse tüm dosya gönderilir."""
+    value = request.headers.get('If-Range')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        # If-Range güçlü karşılaştırma ister
+        return value == etag
+    return parse_http_date_safe(value) == int(mtime)
+
+
+class RangeFile:
+    """
+    Açık dosyanın [start, start + length) aralığını okuyan sarmalayıcı.
+    fileno() sayesinde gunicorn sendfile kullanabilir; konum aralık başında
+    olduğundan sendfile oradan itibaren Content-Length kadar gönderir.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+async def _aiter_file(file):
+    try:
+        while chunk := await sync_to_async(file.read, thread_sensitive=False)(BLOCK_SIZE):
+            yield chunk
+    finally:
+        await sync_to_async(file.close, thread_sensitive=False)()
+
+
+def file_response(request, file, content_type):
+    if isinstance(request, ASGIRequest):
+        return StreamingHttpResponse(_aiter_file(file), content_type=content_type)
+    response = FileResponse(file, content_type=content_type)
+    response.block_size = BLOCK_SIZE
+    return response
+
+
+def serve(request, path, document_root=None):
+    """
+    urls.py'de:
+        re_path(r'^media/(?P<path>.*)$', media.serve, {'document_root': settings.MEDIA_ROOT})
+    """
+    try:
+        fullpath = safe_join(document_root, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        stat_result = os.stat(fullpath)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise Http404
+
+    size, mtime = stat_result.st_size, stat_result.st_mtime
+    etag = file_etag(stat_result)
+    content_type = content_type_for(fullpath)
+
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(mtime),
+        'Accept-Ranges': 'bytes',
+        'X-Content-Type-Options': 'nosniff',
+        'Cache-Control': ('public, max-age=31536000, immutable' if path.startswith(IMMUTABLE_PREFIXES)
+                          else 'public, max-age=3600'),
+    }
+    if not is_inline(content_type):
+        headers['Content-Disposition'] = f'attachment; filename="{os.path.basename(fullpath)}"'
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=int(mtime))
+    if conditional is not None:
+        for header in ('ETag', 'Last-Modified', 'Cache-Control'):
+            conditional.headers[header] = headers[header]
+        return conditional
+
+    byte_range = None
+    if request.method == 'GET' and if_range_matches(request, etag, mtime):
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            return HttpResponse(status=416, headers={**headers, 'Content-Range': f'bytes */{size}'})
+
+    file = open(fullpath, 'rb')
+    if byte_range is None:
+        response = file_response(request, file, content_type)
+        length = size
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = file_response(request, RangeFile(file, start, length), content_type)
+        response.status_code = 206
+        response.headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    for header, value in headers.items():
+        response.headers[header] = value
+    response.headers['Content-Length'] = str(length)
+    return response
@@ -0,0 +1,238 @@
+"""
+StaticFilesMiddleware: statik dosyaları uygulama sunucusundan (gunicorn) doğrudan sunar.
+
+STATIC_ROOT başlangıçta bir kez taranır; istek başına yalnızca sözlük araması
+yapılır. İstemci Accept-Encoding ile gzip kabul ediyorsa collectstatic'in
+ürettiği .gz kopyası seçilir. Adında içerik özeti olan dosyalar süresiz (immutable)
+cache başlığıyla döner.
+"""
+import mimetypes
+import os
+import re
+from contextlib import nullcontext
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponseNotModified
+from django.urls import reverse
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from . import db, instrumentation, profiling
+from .media import file_response
+from .models import ProfileCapture
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=60'
+# tercih sırasıyla (kodlama, uzantı); yalnızca gzip üretilir (bkz. core.staticfiles.compress)
+ENCODINGS = (('gzip', '.gz'),)
+ACCEPT_ENCODING_RE = re.compile(r'\s*([^\s;,]+)\s*(?:;\s*q=([0-9.]+))?')
+
+
+def accepted_encodings(header):
+    accepted = set()
+    for match in ACCEPT_ENCODING_RE.finditer(header or ''):
+        encoding, quality = match.groups()
+        try:
+            if quality is None or float(quality) > 0:
+                accepted.add(encoding.lower())
+        except ValueError:
+            continue
+    return accepted
+
+
+class StaticFile:
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.variants = {}
+        for encoding, extension in ENCODINGS:
+            if os.path.exists(path + extension):
+                self.variants[encoding] = (path + extension, os.path.getsize(path + extension))
+
+
+def scan_static_root(root):
+    """{url yolu: StaticFile}; sıkıştırılmış kopyalar kendi başına listelenmez."""
+    files = {}
+    compressed_extensions = tuple(extension for encoding, extension in ENCODINGS)
+    for directory, dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(compressed_extensions):
+                continue
+            path = os.path.join(directory, filename)
+            relative = os.path.relpath(path, root).replace(os.sep, '/')
+            files[relative] = StaticFile(path)
+    return files
+
+
+def hashed_names():
+    # ManifestStaticFilesStorage kullanılmıyorsa özetli dosya yoktur
+    manifest = getattr(staticfiles_storage, 'hashed_files', None)
+    return set(manifest.values()) if manifest else set()
+
+
+class StaticFilesMiddleware:
+    # ASGI'de araya thread geçişi eklememek için iki modda da çalışır
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SERVE_STATIC_FILES', False) or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith('/') else '/' + settings.STATIC_URL
+        self.files = scan_static_root(settings.STATIC_ROOT)
+        self.immutable = hashed_names()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.lookup(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self.lookup(request) or await self.get_response(request)
+
+    def lookup(self, request):
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefix):
+            name = request.path_info[len(self.prefix):]
+            static_file = self.files.get(name)
+            if static_file is not None:
+                return self.serve(request, name, static_file)
+        return None
+
+    def serve(self, request, name, static_file):
+        if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), static_file.mtime):
+            return HttpResponseNotModified()
+
+        path, size, encoding = static_file.path, static_file.size, None
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING'))
+        for candidate, extension in ENCODINGS:
+            if candidate in accepted and candidate in static_file.variants:
+                (path, size), encoding = static_file.variants[candidate], candidate
+                break
+
+        content_type, _ = mimetypes.guess_type(name)
+        response = file_response(request, open(path, 'rb'), content_type or 'application/octet-stream')
+        response.headers['Content-Length'] = str(size)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if static_file.variants:
+            response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Last-Modified'] = http_date(static_file.mtime)
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if name in self.immutable else DEFAULT_CACHE_CONTROL
+        return response
+
+
+class InstrumentationMiddleware:
+    """
+    İstek başına sorgu sayısı/süresi, tekrarlanan sorgular, şablon süresi ve
+    cache isabetleri (bkz. core.instrumentation). REQUEST_METRICS ile açılır.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = instrumentation.begin()
+        response = self.get_response(request)
+        return instrumentation.end(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = instrumentation.begin()
+        response = await self.get_response(request)
+        # yavaş istekte EXPLAIN, başlıkta request.user veritabanına gider; event loop'ta çalışamaz
+        return await sync_to_async(instrumentation.end)(request, response, metrics)
+
+
+class ProfilingMiddleware:
+    """
+    Rastgele seçilen ya da imzalı belirteç taşıyan istekleri örnekleyici
+    profille çalıştırır (bkz. core.profiling). REQUEST_PROFILE ile açılır.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_PROFILE', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        selected = profiling.select(request)
+        if selected is None:
+            return self.get_response(request)
+        sampler = profiling.Sampler(profiling.interval()).start()
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            sampler.stop()
+            raise
+        # akışlı gövde bu thread'de üretilir; dosya yanıtları sarılmaz (sendfile yolu açık kalsın)
+        streaming = response.streaming and not response.is_async and not isinstance(response, FileResponse)
+        if not streaming:
+            sampler.stop()
+        capture = profiling.save(request, response, sampler, *selected)
+        if streaming:
+            response.streaming_content = profiling.stream(response.streaming_content, capture, sampler)
+        if selected[0] == ProfileCapture.TOKEN:
+            response.headers[profiling.CAPTURE_HEADER] = str(capture.pk)
+        return response
+
+    async def __acall__(self, request):
+        # havuz thread'lerinde çalışan view'lar örneklenemez; belirteç yine de view'a ulaşmasın
+        profiling.select(request)
+        return await self.get_response(request)
+
+
+class DatabaseRoutingMiddleware:
+    """
+    Admin ve POST/PUT/DELETE isteklerinde okumalar da yazar bağlantısından
+    yapılır (bkz. core.db.ReadWriteRouter); herkese açık GET'ler salt okunur
+    bağlantıya gider. Okuma bağlantısı tanımlı değilse devre dışıdır.
+    """
+    sync_capable = True
+    async_capable = True
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SQLITE_PRODUCTION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.admin_prefix = None
+
+    def routing(self, request):
+        if self.admin_prefix is None:
+            self.admin_prefix = reverse('admin:index')
+        if request.method not in self.SAFE_METHODS or request.path_info.startswith(self.admin_prefix):
+            return db.writer()
+        return nullcontext()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self.routing(request):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with self.routing(request):
+            return await self.get_response(request)
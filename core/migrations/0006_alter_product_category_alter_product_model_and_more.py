@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_product_cover_image'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='category',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='Kategori', to='core.category'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='model',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='Model', to='core.modelcategory'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='series',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='Seri', to='core.seriescategory'),
+        ),
+        migrations.AddIndex(
+            model_name='modelcategory',
+            index=models.Index(fields=['name'], name='core_modelc_name_ccb4bf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modelcategory',
+            index=models.Index(fields=['series', 'name'], name='core_modelc_series__d24814_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['name', 'id'], name='core_produc_name_db9baa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'name', 'id'], name='core_produc_categor_55bae5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['series', 'name', 'id'], name='core_produc_series__57593e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['model', 'name', 'id'], name='core_produc_model_i_e35a1e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('stock__gt', 0)), fields=['name', 'id'], name='core_product_in_stock_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimage',
+            index=models.Index(fields=['product', '-is_cover', 'id'], name='core_produc_product_372451_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seriescategory',
+            index=models.Index(fields=['name'], name='core_series_name_1f7798_idx'),
+        ),
+    ]
@@ -0,0 +1,89 @@
+import html
+from html.parser import HTMLParser
+
+from django.db import migrations
+
+# Bu migration'ın yazıldığı andaki tablo ve satır biçimi; core.search sonradan
+# değişse de geçmiş migration aynı sonucu üretir.
+CREATE_TABLE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS core_product_fts USING fts5("
+    "name, taxonomy, description, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+DROP_TABLE_SQL = "DROP TABLE IF EXISTS core_product_fts"
+INSERT_SQL = "INSERT INTO core_product_fts(rowid, name, taxonomy, description) VALUES (%s, %s, %s, %s)"
+
+TURKISH_FOLD = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i', 'Î': 'i', 'î': 'i',
+    'Ş': 's', 'ş': 's', 'Ğ': 'g', 'ğ': 'g', 'Ç': 'c', 'ç': 'c',
+    'Ö': 'o', 'ö': 'o', 'Ü': 'u', 'ü': 'u', 'Â': 'a', 'â': 'a', 'Û': 'u', 'û': 'u',
+})
+BLOCK_TAGS = {'p', 'br', 'li', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr', 'td', 'th', 'figure'}
+BATCH_SIZE = 500
+
+
+def fold(text):
+    text = (text or '').translate(TURKISH_FOLD)
+    return ''.join(low if len(low := ch.lower()) == 1 else ch for ch in text)
+
+
+class TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def strip_html(value):
+    parser = TextExtractor()
+    parser.feed(value or '')
+    parser.close()
+    return ' '.join(html.unescape(''.join(parser.parts)).split())
+
+
+def index_row(product):
+    taxonomy = ' '.join(filter(None, (
+        product.category.name if product.category else '',
+        product.series.name if product.series else '',
+        product.model.name if product.model else '',
+    )))
+    return product.pk, fold(product.name), fold(taxonomy), fold(strip_html(product.description))
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Product = apps.get_model('core', 'Product')
+    schema_editor.execute(CREATE_TABLE_SQL)
+    products = Product.objects.select_related('category', 'series', 'model').order_by('pk')
+    with schema_editor.connection.cursor() as cursor:
+        batch = []
+        for product in products.iterator(chunk_size=BATCH_SIZE):
+            batch.append(index_row(product))
+            if len(batch) >= BATCH_SIZE:
+                cursor.executemany(INSERT_SQL, batch)
+                batch = []
+        if batch:
+            cursor.executemany(INSERT_SQL, batch)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(DROP_TABLE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_alter_product_category_alter_product_model_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_product_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productvideo',
+            name='duration',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Süre (sn)'),
+        ),
+        migrations.AddField(
+            model_name='productvideo',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='productvideo',
+            name='poster',
+            field=models.ImageField(blank=True, editable=False, upload_to='product_videos/posters/', verbose_name='Kapak Karesi'),
+        ),
+        migrations.AddField(
+            model_name='productvideo',
+            name='processed_source',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='productvideo',
+            name='web_video',
+            field=models.FileField(blank=True, editable=False, upload_to='product_videos/web/', verbose_name='Web Videosu'),
+        ),
+        migrations.AddField(
+            model_name='productvideo',
+            name='web_video_small',
+            field=models.FileField(blank=True, editable=False, upload_to='product_videos/web/', verbose_name='Web Videosu (Küçük)'),
+        ),
+        migrations.AddField(
+            model_name='productvideo',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def opening_balances(apps, schema_editor):
+    # mevcut stoklar defterde açılış hareketi olarak görünsün
+    Product = apps.get_model('core', 'Product')
+    StockMovement = apps.get_model('core', 'StockMovement')
+    products = Product.objects.exclude(stock=0).values_list('pk', 'stock')
+    StockMovement.objects.bulk_create(
+        [StockMovement(product_id=pk, delta=stock, balance_after=stock, reason='manual', note='Açılış bakiyesi')
+         for pk, stock in products.iterator(chunk_size=1000)],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_product_sku'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField(verbose_name='Miktar')),
+                ('balance_after', models.IntegerField(verbose_name='Sonraki Stok')),
+                ('reason', models.CharField(choices=[('manual', 'Elle düzeltme'), ('receipt', 'Mal kabul'), ('sale', 'Satış'), ('return', 'İade'), ('import', 'Toplu içe aktarım'), ('warehouse', 'Depo sistemi')], default='manual', max_length=20, verbose_name='Neden')),
+                ('reference', models.CharField(blank=True, max_length=100, null=True, unique=True, verbose_name='Referans')),
+                ('note', models.CharField(blank=True, max_length=255, verbose_name='Not')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='core.product')),
+            ],
+            options={
+                'verbose_name_plural': 'Stok Hareketleri',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['product', 'id'], name='core_stockm_product_471523_idx')],
+            },
+        ),
+        migrations.RunPython(opening_balances, migrations.RunPython.noop),
+    ]
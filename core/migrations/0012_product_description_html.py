@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:29
+
+from django.db import migrations, models
+
+# Alanlar boş eklenir: açıklamalar burada işlenmez, çünkü dönüşüm (core.richtext)
+# sonradan değişebilir. Boş özet hiçbir kaynağın özetiyle eşleşmediğinden
+# migrate'ten sonra `manage.py rebuild_descriptions` hepsini doldurur.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_facetchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='description_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='description_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+    ]
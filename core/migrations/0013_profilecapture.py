@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_product_description_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileCapture',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(max_length=10, verbose_name='Yöntem')),
+                ('path', models.CharField(max_length=255, verbose_name='Adres')),
+                ('view', models.CharField(blank=True, max_length=200, verbose_name='View')),
+                ('route', models.CharField(blank=True, max_length=100, verbose_name='URL Adı')),
+                ('status', models.PositiveSmallIntegerField(verbose_name='Durum')),
+                ('trigger', models.CharField(choices=[('rate', 'Rastgele örnek'), ('token', 'İmzalı belirteç')], max_length=10, verbose_name='Tetikleyici')),
+                ('label', models.CharField(blank=True, max_length=100, verbose_name='Etiket')),
+                ('duration_ms', models.FloatField(verbose_name='Süre (ms)')),
+                ('interval_ms', models.FloatField(verbose_name='Örnek Aralığı (ms)')),
+                ('samples', models.PositiveIntegerField(verbose_name='Örnek')),
+                ('stacks', models.TextField(blank=True, verbose_name='Yığınlar')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Profil Kaydı',
+                'verbose_name_plural': 'Profil Kayıtları',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['view', 'route'], name='core_profil_view_dcc4aa_idx')],
+            },
+        ),
+    ]
@@ -1,7 +1,9 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
 from django.db.models import Q
-from django.views.decorators.http import condition
 from django_ckeditor_5.fields import CKEditor5Field
+
+from . import richtext
 # Create your models here.
 class Category(models.Model):
     name = models.CharField(max_length=100,verbose_name="Kategori")
@@ -25,6 +27,20 @@ class SeriesCategory(models.Model):
         ordering = ['name']
         verbose_name_plural = 'Seri'
         unique_together = (('category', 'name'),)
+        indexes = [
+            models.Index(fields=['name']),
+        ]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            # kategori değiştiyse altındaki model ve ürünlerin kopya alanı da değişir; post_save
+            # alıcıları (arama indeksi) ürünleri yeni kategoriyle görsün diye kayıttan önce
+            if self.pk is not None:
+                ModelCategory.objects.filter(series=self).exclude(category_id=self.category_id).update(
+                    category_id=self.category_id)
+                Product.objects.filter(series=self).exclude(category_id=self.category_id).update(
+                    category_id=self.category_id)
+            super().save(*args, **kwargs)
 
 class ModelCategory(models.Model):
     category = models.ForeignKey(Category, on_delete=models.CASCADE,related_name='model_category')
@@ -37,27 +53,107 @@ class ModelCategory(models.Model):
     class Meta:
         ordering = ['series']
         verbose_name_plural = 'Model'
+        indexes = [
+            models.Index(fields=['name']),
+            models.Index(fields=['series', 'name']),
+        ]
+
+    def clean(self):
+        if self.series_id and self.category_id and self.series.category_id != self.category_id:
+            raise ValidationError({'category': f"“{self.series}” serisi başka bir kategoriye ait."})
+
+    def save(self, *args, **kwargs):
+        # category, seriden türeyen kopya alandır; her kayıtta seriyle eşitlenir
+        if self.series_id:
+            self.category_id = self.series.category_id
+        with transaction.atomic():
+            # ürünler kayıttan önce taşınır; post_save alıcıları yeni seri/kategoriyi görür
+            if self.pk is not None:
+                (Product.objects.filter(model=self)
+                 .exclude(series_id=self.series_id, category_id=self.category_id)
+                 .update(series_id=self.series_id, category_id=self.category_id))
+            super().save(*args, **kwargs)
 
 
 class Product(models.Model):
     name = models.CharField(max_length=100,verbose_name="İsim")
-    category = models.ForeignKey(Category,on_delete=models.CASCADE,related_name='Kategori',blank=True,null=True)
-    series = models.ForeignKey(SeriesCategory,on_delete=models.CASCADE,related_name='Seri',blank=True,null=True)
-    model = models.ForeignKey(ModelCategory,on_delete=models.CASCADE,related_name='Model',blank=True,null=True)
+    # toplu içe aktarımda (core.catalog_io) ürünün eşleştirme anahtarı
+    sku = models.CharField(max_length=64,unique=True,blank=True,null=True,verbose_name="Stok Kodu")
+    # tekil FK indeksleri yerine aşağıdaki (fk, name, id) bileşik indeksleri kullanılır
+    category = models.ForeignKey(Category,on_delete=models.CASCADE,related_name='Kategori',blank=True,null=True,db_index=False)
+    series = models.ForeignKey(SeriesCategory,on_delete=models.CASCADE,related_name='Seri',blank=True,null=True,db_index=False)
+    model = models.ForeignKey(ModelCategory,on_delete=models.CASCADE,related_name='Model',blank=True,null=True,db_index=False)
     width = models.FloatField(verbose_name="Genişlik Ölçüsü" ,help_text="cm cinsinden genişlik")
     height = models.FloatField(verbose_name="Yükseklik Ölçüsü", help_text="cm cinsinden genişlik")
     depth = models.FloatField(verbose_name="Derinlik Ölçüsü",help_text="cm cinsinden genişlik")
     description = CKEditor5Field('Açıklama', config_name='extends')
+    # kayıtta core.richtext ile temizlenmiş açıklama; şablonlar bunu basar
+    description_html = models.TextField(blank=True, default='', editable=False)
+    description_hash = models.CharField(max_length=64, blank=True, default='', editable=False)
     stock = models.IntegerField(verbose_name="Stok Adedi")
+    # ProductImage.save/delete tarafından güncel tutulur; listeler tek JOIN ile kapağı alır
+    cover_image = models.ForeignKey(
+        'ProductImage', on_delete=models.SET_NULL, related_name='+', blank=True, null=True,
+        editable=False, verbose_name="Kapak Görseli",
+    )
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
 
+    def get_cover_image(self):
+        return self.cover_image
+
+    def clean(self):
+        if self.model_id and self.series_id and self.model.series_id != self.series_id:
+            raise ValidationError({'model': f"“{self.model}” modeli seçilen seriye ait değil."})
+        if self.series_id and self.category_id and self.series.category_id != self.category_id:
+            raise ValidationError({'series': f"“{self.series}” serisi seçilen kategoriye ait değil."})
+
+    def render_description(self):
+        """
+        Açıklama ya da dönüşüm kuralları değiştiyse description_html'i yeniden
+        üretir. Türevi henüz olmayan medya görsellerini döner (bkz. signals).
+        """
+        digest = richtext.content_hash(self.description)
+        if digest == self.description_hash:
+            return []
+        self.description_html, missing_images = richtext.render_description(self.description)
+        self.description_hash = digest
+        return missing_images
+
+    def save(self, *args, **kwargs):
+        # en alt düzey (model, yoksa seri) üst düzeyleri belirler
+        if self.model_id:
+            self.series_id, self.category_id = self.model.series_id, self.model.category_id
+        elif self.series_id:
+            self.category_id = self.series.category_id
+        self._description_images = self.render_description()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'description' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'description_html', 'description_hash'}
+        super().save(*args, **kwargs)
+
+    def refresh_cover_image(self):
+        # kapak işaretli görsel, yoksa ilk görsel
+        cover = self.images.order_by('-is_cover', 'id').first()
+        if self.cover_image_id != (cover.pk if cover else None):
+            Product.objects.filter(pk=self.pk).update(cover_image=cover)
+        self.cover_image = cover
+        return cover
+
     class Meta:
         ordering = ['name']
         verbose_name_plural = 'Ürünler'
+        # katalog (name, id) keyset sayfalaması ve kategori/seri/model filtreleri için
+        indexes = [
+            models.Index(fields=['name', 'id']),
+            models.Index(fields=['category', 'name', 'id']),
+            models.Index(fields=['series', 'name', 'id']),
+            models.Index(fields=['model', 'name', 'id']),
+            models.Index(fields=['name', 'id'], condition=Q(stock__gt=0), name='core_product_in_stock_idx'),
+        ]
 
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE,related_name='images')
@@ -81,31 +177,171 @@ class ProductImage(models.Model):
             )
 
         ]
+        indexes = [
+            # Product.refresh_cover_image ve backfill_cover_images sıralaması
+            models.Index(fields=['product', '-is_cover', 'id']),
+        ]
 
     def save(self, *args, **kwargs):
-        # önce ben kaydolayım (pk lazım olacak)
-        super().save(*args, **kwargs)
-        # sonra kapaksam diğerlerini indir
-        if self.is_cover:
-            (self.__class__.objects
-             .filter(product=self.product, is_cover=True)
-             .exclude(pk=self.pk)
-             .update(is_cover=False))
+        with transaction.atomic():
+            # görsel başka ürüne taşınıyorsa eski ürünün kapağı da yenilenir
+            previous_product_id = None
+            if self.pk is not None:
+                previous_product_id = (self.__class__.objects.filter(pk=self.pk)
+                                       .values_list('product_id', flat=True).first())
+            # kapaksam önce diğerlerini indir (unique_cover_per_product ihlal edilmesin)
+            if self.is_cover:
+                (self.__class__.objects
+                 .filter(product_id=self.product_id, is_cover=True)
+                 .exclude(pk=self.pk)
+                 .update(is_cover=False))
+            super().save(*args, **kwargs)
+            self.product.refresh_cover_image()
+            if previous_product_id is not None and previous_product_id != self.product_id:
+                backfill_cover_images(product_ids=[previous_product_id])
+
+    # silmede kapak core.signals.refresh_cover_after_image_delete ile yenilenir;
+    # QuerySet.delete (admin toplu silme) delete()'i çağırmaz ama post_delete gönderir
+
 
+def backfill_cover_images(batch_size=1000, product_ids=None):
+    """
+    Tüm ürünlerin (product_ids verilirse yalnızca onların) cover_image alanını
+    tek geçişte doldurur. Görseller (product, -is_cover, id) sırasıyla okunur;
+    her ürün için ilk kayıt kapaktır. Güncellenen ürün sayısını döner.
+    """
+    images = ProductImage.objects.all()
+    products = Product.objects.all()
+    if product_ids is not None:
+        images = images.filter(product_id__in=product_ids)
+        products = products.filter(pk__in=product_ids)
+
+    covers = {}
+    images = images.order_by('product_id', '-is_cover', 'id').values_list('product_id', 'pk')
+    for product_id, image_id in images.iterator(chunk_size=batch_size):
+        covers.setdefault(product_id, image_id)
+
+    changed = []
+    for product in products.only('pk', 'cover_image').iterator(chunk_size=batch_size):
+        cover_id = covers.get(product.pk)
+        if product.cover_image_id != cover_id:
+            product.cover_image_id = cover_id
+            changed.append(product)
+    with transaction.atomic():
+        Product.objects.bulk_update(changed, ['cover_image'], batch_size=batch_size)
+    return len(changed)
+
+
+class StockMovement(models.Model):
+    """
+    Stok defteri: Product.stock yalnızca core.stock üzerinden, F() ifadeleriyle
+    değişir ve her değişiklik burada bir satır bırakır. Güncel stok ürün
+    satırında tutulduğundan okumalar defteri toplamaz.
+    """
+    MANUAL = 'manual'
+    RECEIPT = 'receipt'
+    SALE = 'sale'
+    RETURN = 'return'
+    IMPORT = 'import'
+    WAREHOUSE = 'warehouse'
+    REASON_CHOICES = (
+        (MANUAL, 'Elle düzeltme'),
+        (RECEIPT, 'Mal kabul'),
+        (SALE, 'Satış'),
+        (RETURN, 'İade'),
+        (IMPORT, 'Toplu içe aktarım'),
+        (WAREHOUSE, 'Depo sistemi'),
+    )
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='stock_movements')
+    delta = models.IntegerField(verbose_name="Miktar")
+    balance_after = models.IntegerField(verbose_name="Sonraki Stok")
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES, default=MANUAL, verbose_name="Neden")
+    # depo sisteminin hareket kimliği; aynı hareket iki kez uygulanmaz
+    reference = models.CharField(max_length=100, unique=True, blank=True, null=True, verbose_name="Referans")
+    note = models.CharField(max_length=255, blank=True, verbose_name="Not")
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.product.name} {self.delta:+d}"
+
+    class Meta:
+        ordering = ['-id']
+        verbose_name_plural = 'Stok Hareketleri'
+        indexes = [
+            models.Index(fields=['product', 'id']),
+        ]
+
+class FacetChange(models.Model):
+    """
+    Facet indeksinin süreçler arası değişiklik günlüğü (bkz. core.facets).
+    Her süreç son uyguladığı kayıttan sonrakileri okuyup yalnızca o ürünleri
+    yeniden indeksler. product_id boşsa indeks baştan kurulur.
+    """
+    # silinen ürünler de kaydedildiğinden FK değil
+    product_id = models.BigIntegerField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
 
 
 class ProductVideo(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='video')
     video = models.FileField(upload_to="product_videos/",blank=True,null=True,verbose_name='Video')
     alt_text = models.CharField(max_length=100,blank=True,null=True,verbose_name='Video Alt Başlığı')
+    # core.video tarafından işçide (runjobs / process_videos) doldurulur
+    web_video = models.FileField(upload_to="product_videos/web/", blank=True, editable=False, verbose_name='Web Videosu')
+    web_video_small = models.FileField(upload_to="product_videos/web/", blank=True, editable=False, verbose_name='Web Videosu (Küçük)')
+    poster = models.ImageField(upload_to="product_videos/posters/", blank=True, editable=False, verbose_name='Kapak Karesi')
+    duration = models.FloatField(null=True, blank=True, editable=False, verbose_name='Süre (sn)')
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    # hangi kaynak dosyadan üretildiği; kaynak değişmedikçe yeniden işlenmez
+    processed_source = models.CharField(max_length=255, blank=True, editable=False)
     created_date = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.product.name
 
+    @property
+    def is_processed(self):
+        return bool(self.video) and self.processed_source == self.video.name
+
     class Meta:
         ordering = ['-created_date']
 
 
+class ProfileCapture(models.Model):
+    """
+    Örneklenmiş bir isteğin profili (bkz. core.profiling). Yığınlar collapsed
+    biçimindedir; admin'den view'a göre gruplanır, speedscope dosyası indirilir.
+    """
+    RATE = 'rate'
+    TOKEN = 'token'
+    TRIGGER_CHOICES = (
+        (RATE, 'Rastgele örnek'),
+        (TOKEN, 'İmzalı belirteç'),
+    )
+
+    method = models.CharField(max_length=10, verbose_name="Yöntem")
+    path = models.CharField(max_length=255, verbose_name="Adres")
+    view = models.CharField(max_length=200, blank=True, verbose_name="View")
+    route = models.CharField(max_length=100, blank=True, verbose_name="URL Adı")
+    status = models.PositiveSmallIntegerField(verbose_name="Durum")
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES, verbose_name="Tetikleyici")
+    label = models.CharField(max_length=100, blank=True, verbose_name="Etiket")
+    duration_ms = models.FloatField(verbose_name="Süre (ms)")
+    interval_ms = models.FloatField(verbose_name="Örnek Aralığı (ms)")
+    samples = models.PositiveIntegerField(verbose_name="Örnek")
+    stacks = models.TextField(blank=True, verbose_name="Yığınlar")
+    created = models.DateTimeField(auto_now_add=True)
 
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+    class Meta:
+        ordering = ['-id']
+        verbose_name = 'Profil Kaydı'
+        verbose_name_plural = 'Profil Kayıtları'
+        indexes = [
+            models.Index(fields=['view', 'route']),
+        ]
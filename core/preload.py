@@ -0,0 +1,73 @@
+"""
+Ana sayfanın kritik kaynakları için preload ipuçları (bkz. views.index).
+
+Aynı liste iki yerde kullanılır:
+  * akışın ilk parçasında (core/index/head.html) <link rel="preload">
+    etiketleri olarak; tarayıcı gövdenin geri kalanını beklerken CSS, JS ve
+    hero görselini indirmeye başlar,
+  * yanıtın Link başlığında. WSGI ve ASGI'de uygulama 1xx ara yanıt
+    gönderemez; 103 Early Hints'i önündeki sunucu üretir (nginx early_hints,
+    Cloudflare gibi CDN'ler Link başlığını önceki yanıtlardan öğrenip view
+    çalışmadan 103 ile döner).
+"""
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from .renditions import get_renditions, preload_attrs
+from .site_settings import site_settings
+from .staticfiles import bundle_urls
+
+# core/index/hero.html'deki responsive_image ile aynı olmalı; yoksa tarayıcı başka bir genişliği indirir
+HERO_IMAGE_SIZES = '(max-width: 992px) 100vw, 50vw'
+PRELOAD_BUNDLES = (
+    ('core/bundles/site.css', 'style'),
+    ('core/bundles/vendor.js', 'script'),
+)
+
+
+def homepage_preloads():
+    """[{'href', 'as', ...}]: CSS ve vendor JS paketleri, hero görseli (türevleri varsa imagesrcset ile)."""
+    preloads = [{'href': url, 'as': kind} for path, kind in PRELOAD_BUNDLES for url in bundle_urls(path)]
+    hero = site_settings()['hero']
+    if hero is not None and hero.image:
+        manifest = get_renditions(hero.image.name)
+        preloads.append(preload_attrs(manifest, HERO_IMAGE_SIZES) if manifest else {'href': hero.image.url, 'as': 'image'})
+    return preloads
+
+
+def link_header(preloads):
+    """RFC 8288 Link başlığı; imagesrcset virgül içerdiğinden değerler tırnaklanır."""
+    return ', '.join(
+        f'<{preload["href"]}>; rel=preload'
+        + ''.join(f'; {key}="{value}"' for key, value in preload.items() if key != 'href')
+        for preload in preloads
+    )
+
+
+def preload_hints(get_preloads):
+    """
+    @preload_hints(homepage_preloads)
+
+    200 yanıtlara (sayfa cache isabetleri dahil) Link başlığı ekler; en
+    dıştaki dekoratör olmalıdır. Async görünümlerde liste thread'de hesaplanır,
+    site ayarları soğukken ORM'a gider.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _async_wrapped(request, *args, **kwargs):
+                response = await view_func(request, *args, **kwargs)
+                if response.status_code == 200:
+                    response.headers['Link'] = link_header(await sync_to_async(get_preloads)())
+                return response
+            return _async_wrapped
+
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200:
+                response.headers['Link'] = link_header(get_preloads())
+            return response
+        return _wrapped
+    return decorator
@@ -0,0 +1,49 @@
+"""
+Süreç içi, sürümlü önbellek.
+
+Her süreç değeri bir kez yükleyip bellekte tutar. Veri değişince sinyal,
+transaction tamamlandıktan sonra ortak cache'teki sürüm anahtarını artırır;
+diğer süreçler sonraki istekte sürüm farkını görüp yeniden yükler. İstek
+başına maliyet tek bir cache okumasıdır, veritabanına gidilmez.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+class ProcessCache:
+    def __init__(self, version_key, loader):
+        self.version_key = version_key
+        self.loader = loader
+        # (sürüm, değer); tek atamayla değiştirilir, okuyan thread'ler kilit almaz
+        self._loaded = (None, None)
+        self._lock = threading.Lock()
+
+    def version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, time.time_ns(), timeout=None)
+            version = cache.get(self.version_key)
+        return version
+
+    def _bump(self):
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, time.time_ns(), timeout=None)
+
+    def bump(self, **kwargs):
+        """Sinyal alıcısı; commit'ten önce artırılırsa başka süreç eski veriyi yeni sürümle saklayabilirdi."""
+        transaction.on_commit(self._bump)
+
+    def get(self):
+        version = self.version()
+        loaded_version, value = self._loaded
+        if loaded_version == version:
+            return value
+        with self._lock:
+            if self._loaded[0] != version:
+                self._loaded = (version, self.loader())
+            return self._loaded[1]
@@ -0,0 +1,281 @@
+"""
+Canlı istekler için isteğe bağlı örnekleyici profil (bkz. core.middleware.ProfilingMiddleware).
+
+İki yolla açılır:
+  * REQUEST_PROFILE_RATE: isteklerin bu oranı (0..1) rastgele seçilir,
+  * imzalı belirteç: `manage.py profile_token` ile üretilen değer
+    X-Profile-Token başlığında ya da ?_profile= parametresinde gönderilir;
+    süresi REQUEST_PROFILE_TOKEN_MAX_AGE saniyedir.
+
+Seçilen istekte ayrı bir thread her REQUEST_PROFILE_INTERVAL_MS'de isteği
+işleyen thread'in yığınını (sys._current_frames) okur; istek kodu
+yavaşlamaz, yalnızca örnekleyici GIL için sıraya girer. Yığınlar "collapsed"
+biçiminde (kök;...;yaprak adet) ProfileCapture'a yazılır; admin'den view'a
+göre gruplanmış olarak incelenir, flamegraph.pl ya da speedscope ile açılır.
+Şablon düğümleri ({% for %} index.html:42) ayrı çerçeve olarak görünür.
+
+Akışlı yanıtlarda (ör. ana sayfa) gövde de aynı thread'de üretildiğinden
+örnekleme akış bitene kadar sürer; kayıt yanıt dönerken yazılır, yığınlar
+akış sonunda eklenir. ASGI'de senkron view'lar havuz thread'inde çalıştığından
+örnekleme yalnızca WSGI'de yapılır.
+"""
+import json
+import os
+import random
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from functools import partial
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.template.base import TokenType
+
+from jobs.queue import enqueue
+
+from .instrumentation import view_name
+from .models import ProfileCapture
+
+TOKEN_HEADER = 'HTTP_X_PROFILE_TOKEN'
+TOKEN_PARAM = '_profile'
+TOKEN_SALT = 'core.profiling'
+CAPTURE_HEADER = 'X-Profile-Capture'
+PROJECT_ROOT = str(settings.BASE_DIR) + os.sep
+# kısaltılacak kök dizinler; en uzun önek önce denenir
+_PATH_PREFIXES = sorted({
+    PROJECT_ROOT, *(path + os.sep for path in sys.path if path and os.path.isdir(path)),
+    sysconfig.get_paths()['stdlib'] + os.sep,
+}, key=len, reverse=True)
+
+
+def rate():
+    return float(getattr(settings, 'REQUEST_PROFILE_RATE', 0))
+
+
+def interval():
+    return getattr(settings, 'REQUEST_PROFILE_INTERVAL_MS', 5) / 1000
+
+
+# ======================
+# Belirteç
+# ======================
+
+def make_token(label=''):
+    """İmzalı profil belirteci; `label` kayıtta görünür (kim, hangi olay)."""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(label)
+
+
+def read_token(token):
+    """Geçerliyse etiketi, değilse None döner."""
+    max_age = getattr(settings, 'REQUEST_PROFILE_TOKEN_MAX_AGE', 3600)
+    try:
+        return signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=max_age)
+    except signing.BadSignature:
+        return None
+
+
+def _pop_query_token(request):
+    # admin bilinmeyen parametreyi filtre sanar; belirteç view'a ulaşmaz
+    if TOKEN_PARAM not in request.GET:
+        return None
+    query = request.GET.copy()
+    token = query.pop(TOKEN_PARAM)[-1]
+    query._mutable = False
+    request.GET = query
+    return token
+
+
+def select(request):
+    """İstek profillenecekse (tetikleyici, etiket), yoksa None."""
+    token = request.META.get(TOKEN_HEADER) or _pop_query_token(request)
+    if token:
+        label = read_token(token)
+        if label is not None:
+            return ProfileCapture.TOKEN, label
+    current = rate()
+    if current > 0 and random.random() < current:
+        return ProfileCapture.RATE, ''
+    return None
+
+
+# ======================
+# Örnekleyici
+# ======================
+
+def _short_path(filename):
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    if code.co_name == 'render_annotated':
+        # şablon düğümü: hangi etiketin hangi satırı
+        node = frame.f_locals.get('self')
+        origin, token = getattr(node, 'origin', None), getattr(node, 'token', None)
+        if origin is not None and token is not None:
+            where = f'{origin.template_name or origin.name}:{token.lineno}'
+            if token.token_type == TokenType.BLOCK:
+                return f'{{% {token.contents.split(None, 1)[0]} %}} {where}'
+            if token.token_type == TokenType.VAR:
+                return f'{{{{ {token.contents[:40]} }}}} {where}'
+    return f'{code.co_qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})'
+
+
+def collapse(frame):
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame).replace(';', ','))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class Sampler:
+    """Başlatan thread'in yığınını ayrı bir thread'den düzenli aralıklarla örnekler."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.target = threading.get_ident()
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='core-profiler', daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.duration = time.perf_counter() - self.started
+        self._stopped.set()
+        self._thread.join()
+
+    @property
+    def running(self):
+        return not self._stopped.is_set()
+
+    @property
+    def samples(self):
+        return sum(self.stacks.values())
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            if frame is not None:
+                self.stacks[collapse(frame)] += 1
+
+
+# ======================
+# Kayıt ve dışa aktarım
+# ======================
+
+def save(request, response, sampler, trigger, label):
+    """Kaydı yazar; örnekleyici hâlâ çalışıyorsa (akışlı yanıt) ölçümler stream() sonunda eklenir."""
+    view, route = view_name(request)
+    capture = ProfileCapture(
+        method=request.method, path=request.path[:255], view=(view or '')[:200], route=(route or '')[:100],
+        status=response.status_code, trigger=trigger, label=label[:100],
+        duration_ms=0, interval_ms=round(sampler.interval * 1000, 2), samples=0,
+    )
+    if not sampler.running:
+        _measure(capture, sampler)
+    capture.save()
+    keep = getattr(settings, 'REQUEST_PROFILE_KEEP', 500)
+    transaction.on_commit(partial(enqueue, 'profiles.prune', {'keep': keep}, key='profiles.prune'))
+    return capture
+
+
+def _measure(capture, sampler):
+    capture.duration_ms = round(sampler.duration * 1000, 2)
+    capture.samples = sampler.samples
+    capture.stacks = dump_stacks(sampler.stacks)
+
+
+def stream(content, capture, sampler):
+    # gövde üretilirken de örneklenir; örnekleyici akış bitince (ya da kesilince) durur
+    try:
+        yield from content
+    finally:
+        sampler.stop()
+        _measure(capture, sampler)
+        # bu arada budanmış olabilir; update satır bulamazsa sessizce geçer
+        ProfileCapture.objects.filter(pk=capture.pk).update(
+            duration_ms=capture.duration_ms, samples=capture.samples, stacks=capture.stacks,
+        )
+
+
+def dump_stacks(stacks):
+    """Collapsed biçim: her satırda 'kök;...;yaprak adet', en sık olan önce."""
+    return '\n'.join(f'{stack} {count}' for stack, count in stacks.most_common())
+
+
+def load_stacks(text):
+    stacks = Counter()
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(' ')
+        if stack and count.isdigit():
+            stacks[stack] += int(count)
+    return stacks
+
+
+def hot_frames(stacks, limit=25, order='self', templates=False):
+    """
+    Çerçeve başına örnek oranı: `self` çerçevenin yaprakta (o an çalışan
+    kodda) olduğu, `total` yığında herhangi bir yerde olduğu örnekler.
+    templates: yalnızca şablon düğümleri (süreleri hep alt çağrılardadır, `total`e göre bakılır).
+    """
+    total = sum(stacks.values())
+    if not total:
+        return []
+    own, inclusive = Counter(), Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')
+        own[frames[-1]] += count
+        for frame in set(frames):
+            inclusive[frame] += count
+    ranking = own if order == 'self' else inclusive
+    if templates:
+        ranking = Counter({frame: count for frame, count in ranking.items() if frame.startswith(('{%', '{{'))})
+    return [
+        {'frame': frame, 'self': round(own[frame] * 100 / total, 1), 'total': round(inclusive[frame] * 100 / total, 1)}
+        for frame, count in ranking.most_common(limit)
+    ]
+
+
+def speedscope(capture):
+    """speedscope.app "sampled" profil dosyası."""
+    frames, index = [], {}
+    samples, weights = [], []
+    for stack, count in load_stacks(capture.stacks).items():
+        sample = []
+        for name in stack.split(';'):
+            if name not in index:
+                index[name] = len(frames)
+                frames.append({'name': name})
+            sample.append(index[name])
+        samples.append(sample)
+        weights.append(round(count * capture.interval_ms, 3))
+    name = f'{capture.method} {capture.path}'
+    return json.dumps({
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': name,
+        'exporter': 'core.profiling',
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled', 'name': name, 'unit': 'milliseconds',
+            'startValue': 0, 'endValue': round(sum(weights), 3), 'samples': samples, 'weights': weights,
+        }],
+    }, ensure_ascii=False)
+
+
+def prune(keep):
+    """En yeni `keep` kayıt dışındakileri siler."""
+    boundary = list(ProfileCapture.objects.order_by('-id').values_list('id', flat=True)[keep:keep + 1])
+    if not boundary:
+        return 0
+    return ProfileCapture.objects.filter(id__lte=boundary[0]).delete()[0]
@@ -0,0 +1,244 @@
+"""
+Görsel türevleri (rendition): her kaynak görsel için genişlik kovalarına göre
+küçültülmüş AVIF/WebP kopyalar ve bir yedek JPEG (şeffaf görsellerde PNG)
+üretilir. Dosya adları kaynak içeriğin özetini taşır; içerik değişmedikçe ad da
+değişmez, bu yüzden süresiz cache'lenebilir.
+
+Üretilen türevlerin listesi (manifest) depolamada JSON olarak ve cache'te tutulur;
+şablon etiketi veritabanına gitmeden bu listeyi okur.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+RENDITION_WIDTHS = getattr(settings, 'IMAGE_RENDITION_WIDTHS', (320, 640, 960, 1280, 1920))
+RENDITION_ROOT = 'renditions'
+# kodlama ayarları değişirse eski dosya adlarıyla çakışmasın diye özete katılır
+RENDITION_REVISION = 1
+
+FORMAT_OPTIONS = {
+    'avif': {'quality': 50},
+    'webp': {'quality': 75, 'method': 4},
+    'jpeg': {'quality': 80, 'optimize': True, 'progressive': True},
+    'png': {'optimize': True},
+}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg', 'png': 'image/png'}
+EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg', 'png': 'png'}
+MISSING = 'missing'
+# orijinal dosya bundan büyükse yeniden boyutlandırılır
+ORIGINAL_MAX_DIMENSION = getattr(settings, 'IMAGE_ORIGINAL_MAX_DIMENSION', 2560)
+
+
+def modern_formats():
+    # AVIF desteği Pillow derlemesine bağlı; yoksa sessizce atlanır
+    formats = []
+    if features.check('avif'):
+        formats.append('avif')
+    if features.check('webp'):
+        formats.append('webp')
+    return formats
+
+
+def _cache_key(name):
+    return 'rendition:' + hashlib.sha1(name.encode()).hexdigest()
+
+
+def _manifest_name(name):
+    return f'{RENDITION_ROOT}/manifests/{hashlib.sha1(name.encode()).hexdigest()}.json'
+
+
+def target_widths(width):
+    widths = [w for w in RENDITION_WIDTHS if w < width]
+    if width <= max(RENDITION_WIDTHS):
+        widths.append(width)
+    return widths or [min(width, max(RENDITION_WIDTHS))]
+
+
+def _encode(image, fmt):
+    if fmt in ('jpeg',) and image.mode != 'RGB':
+        image = image.convert('RGB')
+    options = dict(FORMAT_OPTIONS[fmt])
+    # renk profili korunur, EXIF yazılmaz
+    if image.info.get('icc_profile'):
+        options['icc_profile'] = image.info['icc_profile']
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt.upper(), **options)
+    return buffer.getvalue()
+
+
+def generate_renditions(field_file, storage=default_storage):
+    """
+    Kaynak görselin türevlerini üretir, manifesti kaydeder ve döner.
+    Aynı içerik için tekrar çağrıldığında var olan dosyalar yeniden yazılmaz.
+    """
+    with field_file.open('rb') as source:
+        data = source.read()
+    digest = hashlib.sha256(data + f':{RENDITION_REVISION}'.encode()).hexdigest()[:16]
+
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    fallback = 'png' if has_alpha else 'jpeg'
+
+    manifest = {
+        'source': field_file.name,
+        'hash': digest,
+        'width': image.width,
+        'height': image.height,
+        'fallback': fallback,
+        'formats': {},
+    }
+    for fmt in modern_formats() + [fallback]:
+        entries = []
+        for width in target_widths(image.width):
+            height = round(image.height * width / image.width)
+            name = f'{RENDITION_ROOT}/{digest[:2]}/{digest}-{width}.{EXTENSIONS[fmt]}'
+            if not storage.exists(name):
+                resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+                storage.save(name, ContentFile(_encode(resized, fmt)))
+            entries.append([width, height, name])
+        manifest['formats'][fmt] = entries
+
+    manifest_name = _manifest_name(field_file.name)
+    if storage.exists(manifest_name):
+        storage.delete(manifest_name)
+    storage.save(manifest_name, ContentFile(json.dumps(manifest).encode()))
+    cache.set(_cache_key(field_file.name), manifest, timeout=None)
+    return manifest
+
+
+def get_renditions(name, storage=default_storage):
+    """Manifesti cache'ten, yoksa depolamadan okur; hiç üretilmemişse None."""
+    if not name:
+        return None
+    key = _cache_key(name)
+    manifest = cache.get(key)
+    if manifest is None:
+        manifest_name = _manifest_name(name)
+        if storage.exists(manifest_name):
+            with storage.open(manifest_name, 'rb') as fp:
+                manifest = json.loads(fp.read())
+            cache.set(key, manifest, timeout=None)
+        else:
+            # kısa süreli negatif cache: her render'da disk kontrolü yapılmasın
+            cache.set(key, MISSING, timeout=300)
+            return None
+    return None if manifest == MISSING else manifest
+
+
+def _srcset(entries, storage):
+    return ', '.join(f'{storage.url(name)} {width}w' for width, height, name in entries)
+
+
+def picture_html(manifest, sizes='100vw', alt='', css_class='', loading='lazy', storage=default_storage):
+    """Manifestten AVIF/WebP <source>'ları ve width/height'lı bir <img> içeren <picture>."""
+    formats = manifest['formats']
+    fallback = formats[manifest['fallback']]
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((MIME_TYPES[fmt], _srcset(entries, storage), sizes)
+         for fmt, entries in formats.items() if fmt != manifest['fallback']),
+    )
+    width, height, largest = fallback[-1]
+    img = format_html(
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" class="{}" alt="{}" loading="{}" decoding="async">',
+        storage.url(largest), _srcset(fallback, storage), sizes, width, height, css_class, alt, loading,
+    )
+    return mark_safe(f'<picture>{sources}{img}</picture>')
+
+
+def preload_attrs(manifest, sizes='100vw', storage=default_storage):
+    """
+    <link rel="preload" as="image"> öznitelikleri: tarayıcının <picture>'da
+    seçeceği ilk <source> biçimi (yoksa yedek format) imagesrcset ile verilir.
+    """
+    formats = manifest['formats']
+    fmt = next((fmt for fmt in formats if fmt != manifest['fallback']), manifest['fallback'])
+    entries = formats[fmt]
+    return {
+        'href': storage.url(entries[-1][2]), 'as': 'image', 'type': MIME_TYPES[fmt],
+        'imagesrcset': _srcset(entries, storage), 'imagesizes': sizes,
+    }
+
+
+def optimize_original(field_file, storage=default_storage):
+    """
+    Orijinal dosyadaki EXIF verisini (konum, cihaz bilgisi) temizler, yönü
+    piksellere uygular ve çok büyük görselleri küçültüp yeniden sıkıştırır.
+    Temizlenmiş bir dosyada tekrar çalıştırıldığında hiçbir şey yapmaz; yani
+    kalite her kayıtta yeniden düşmez. Dosya adı değiştiyse yeni adı döner.
+
+    Orijinal silinip yeniden yazılmaz; yazım yarıda kalırsa dosya kaybolurdu.
+    Yerel depoda yeni içerik aynı klasörde geçici dosyaya yazılıp os.replace
+    ile yerine taşınır. Yol vermeyen depolarda yeni ad altında kaydedilir;
+    eski dosyayı kaydı güncelledikten sonra çağıran siler.
+    """
+    with field_file.open('rb') as source:
+        image = Image.open(io.BytesIO(source.read()))
+        image.load()
+    fmt = (image.format or '').lower()
+    if fmt not in ('jpeg', 'png', 'webp'):
+        return field_file.name
+    has_exif = bool(image.info.get('exif')) or bool(image.getexif())
+    too_large = max(image.size) > ORIGINAL_MAX_DIMENSION
+    if not (has_exif or too_large):
+        return field_file.name
+
+    image = ImageOps.exif_transpose(image)
+    if too_large:
+        image.thumbnail((ORIGINAL_MAX_DIMENSION, ORIGINAL_MAX_DIMENSION), Image.Resampling.LANCZOS)
+    data = _encode(image, fmt)
+
+    name = field_file.name
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        return storage.save(name, ContentFile(data))
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as temp:
+            temp.write(data)
+        # mkstemp 0600 açar; sunucunun okuyabilmesi için orijinalin izinleri korunur
+        shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return name
+
+
+def generate_for_instance(instance, field_name):
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        return None
+    try:
+        return generate_renditions(field_file)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.exception("Görsel türevleri üretilemedi: %s", field_file.name)
+        return None
+
+
+def generate_for_name(name, storage=default_storage):
+    """Modele bağlı olmayan dosyalar (ör. CKEditor yüklemeleri) için türev üretimi."""
+    if not storage.exists(name):
+        return None
+    try:
+        with storage.open(name, 'rb') as source:
+            return generate_renditions(File(source, name), storage)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.exception("Görsel türevleri üretilemedi: %s", name)
+        return None
@@ -0,0 +1,261 @@
+"""
+Ürün açıklaması (CKEditor5 HTML'i) için kayıt anında temizleme ve dönüştürme.
+
+Editörün ürettiği HTML izin listesiyle temizlenir: bilinmeyen etiketler
+açılır (içerik kalır), script/style gibi etiketler içerikleriyle atılır,
+öznitelikler etiket başına süzülür, bağlantılarda yalnızca güvenli şemalar
+kalır. Ardından:
+  * medya klasöründeki <img>'ler türevleri varsa <picture>'a (bkz.
+    core.renditions), yoksa lazy <img>'e çevrilir,
+  * YouTube gömmeleri (<oembed>/<iframe>) tıklanınca iframe'e dönüşen hafif
+    bir önizlemeye çevrilir (bkz. core/js/lite-youtube.js),
+  * boş paragraflar, &nbsp;'lı satırlar ve sondaki <br>'ler atılır.
+
+Sonuç Product.description_html'de, kaynağın özetiyle birlikte saklanır;
+şablon yalnızca bu alanı basar. Dönüşüm kuralları değişirse RICHTEXT_REVISION
+artırılır ve `rebuild_descriptions` komutu çalıştırılır.
+"""
+import hashlib
+import re
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+
+from .renditions import get_renditions, picture_html
+
+RICHTEXT_REVISION = 1
+DESCRIPTION_IMAGE_SIZES = '(max-width: 992px) 100vw, 33vw'
+
+# etiket -> izin verilen öznitelikler
+ALLOWED_TAGS = {
+    'p': {'style'}, 'br': set(), 'strong': set(), 'b': set(), 'em': set(), 'i': set(), 'u': set(),
+    's': set(), 'sub': set(), 'sup': set(), 'span': {'style', 'class'}, 'a': {'href', 'title'},
+    'h2': {'style'}, 'h3': {'style'}, 'h4': {'style'}, 'blockquote': set(), 'ul': set(), 'ol': set(),
+    'li': set(), 'hr': set(), 'figure': {'class'}, 'figcaption': set(), 'img': {'src', 'alt', 'width', 'height'},
+    'table': set(), 'thead': set(), 'tbody': set(), 'tfoot': set(), 'tr': set(),
+    'th': {'colspan', 'rowspan'}, 'td': {'colspan', 'rowspan'},
+    # gömmeler aşağıda dönüştürülür, olduğu gibi basılmaz
+    'oembed': {'url'}, 'iframe': {'src'},
+}
+# CKEditor başlık düzeyleri sayfadaki h1/h2 ile çakışmasın diye bir alta kayar
+RENAMED_TAGS = {'h1': 'h2', 'h5': 'h4', 'h6': 'h4', 'div': 'p'}
+# içerikleriyle birlikte atılır
+DROPPED_TAGS = {'script', 'style', 'noscript', 'template', 'object', 'embed', 'svg', 'math',
+                'form', 'textarea', 'select', 'button', 'title', 'head'}
+VOID_TAGS = {'br', 'hr', 'img', 'oembed'}
+# içi boş olsa da korunur
+KEEP_EMPTY = VOID_TAGS | {'td', 'th', 'iframe'}
+BLOCK_TAGS = {'p', 'h2', 'h3', 'h4', 'li', 'blockquote', 'figcaption', 'td', 'th'}
+
+STYLE_PROPERTIES = {'text-align', 'color', 'background-color', 'font-size'}
+STYLE_VALUE_RE = re.compile(r'^[#\w\s.,%()-]+$')
+ALLOWED_CLASSES = {
+    'image', 'image-style-side', 'image-style-align-left', 'image-style-align-right', 'image_resized',
+    'table', 'media', 'text-tiny', 'text-small', 'text-big', 'text-huge',
+}
+SAFE_SCHEMES = {'', 'http', 'https', 'mailto', 'tel'}
+YOUTUBE_RE = re.compile(
+    r'^(?:https?:)?//(?:www\.|m\.)?(?:youtube(?:-nocookie)?\.com/(?:watch\?(?:.*&)?v=|embed/|shorts/)|youtu\.be/)'
+    r'([\w-]{11})'
+)
+
+
+def content_hash(source):
+    """Kaynak HTML'in ve dönüşüm sürümünün özeti; değişmediyse yeniden işlenmez."""
+    return hashlib.sha256(f'{RICHTEXT_REVISION}:{source or ""}'.encode()).hexdigest()
+
+
+class _Element:
+    __slots__ = ('tag', 'attrs', 'children')
+
+    def __init__(self, tag, attrs):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Element(None, {})
+        self.stack = [self.root]
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_TAGS:
+            self.dropping += 1
+            return
+        tag = RENAMED_TAGS.get(tag, tag)
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        allowed = ALLOWED_TAGS[tag]
+        element = _Element(tag, {name: value or '' for name, value in attrs if name in allowed})
+        self.stack[-1].children.append(element)
+        if tag not in VOID_TAGS:
+            self.stack.append(element)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_TAGS:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        tag = RENAMED_TAGS.get(tag, tag)
+        if self.dropping or tag in VOID_TAGS:
+            return
+        # kapanmamış iç etiketler de kapanır; eşi olmayan kapanış yok sayılır
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                del self.stack[depth:]
+                return
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.stack[-1].children.append(data)
+
+
+def _clean_style(value):
+    declarations = []
+    for declaration in value.split(';'):
+        name, _, css = declaration.partition(':')
+        name, css = name.strip().lower(), css.strip()
+        if name in STYLE_PROPERTIES and css and STYLE_VALUE_RE.match(css) and 'expression' not in css.lower():
+            declarations.append(f'{name}:{css}')
+    return ';'.join(declarations)
+
+
+def _safe_url(value):
+    value = value.strip()
+    try:
+        scheme = urlsplit(value).scheme.lower()
+    except ValueError:
+        return None
+    return value if scheme in SAFE_SCHEMES else None
+
+
+def _youtube_id(url):
+    match = YOUTUBE_RE.match((url or '').strip())
+    return match.group(1) if match else None
+
+
+class _Renderer:
+    def __init__(self):
+        self.parts = []
+        self.missing_images = []
+
+    def attrs(self, attrs):
+        return ''.join(f' {name}="{escape(value)}"' for name, value in attrs.items())
+
+    def render(self, nodes):
+        for node in nodes:
+            if isinstance(node, str):
+                self.parts.append(escape(node, quote=False))
+            else:
+                getattr(self, f'render_{node.tag}', self.render_element)(node)
+
+    def render_element(self, element, attrs=None):
+        attrs = self.clean_attrs(element) if attrs is None else attrs
+        self.parts.append(f'<{element.tag}{self.attrs(attrs)}>')
+        if element.tag in VOID_TAGS:
+            return
+        self.render(element.children)
+        self.parts.append(f'</{element.tag}>')
+
+    def clean_attrs(self, element):
+        attrs = {}
+        for name, value in element.attrs.items():
+            if name == 'style':
+                value = _clean_style(value)
+            elif name == 'class':
+                value = ' '.join(token for token in value.split() if token in ALLOWED_CLASSES)
+            elif name in ('colspan', 'rowspan', 'width', 'height'):
+                value = value if value.isdigit() else ''
+            if value:
+                attrs[name] = value
+        return attrs
+
+    def render_a(self, element):
+        href = _safe_url(element.attrs.get('href', ''))
+        if not href:
+            self.render(element.children)
+            return
+        attrs = {'href': href, **({'title': element.attrs['title']} if element.attrs.get('title') else {})}
+        if urlsplit(href).scheme in ('http', 'https'):
+            attrs.update({'rel': 'noopener nofollow', 'target': '_blank'})
+        self.render_element(element, attrs)
+
+    def render_img(self, element):
+        src = _safe_url(element.attrs.get('src', ''))
+        if not src:
+            return
+        alt = element.attrs.get('alt', '')
+        if src.startswith(settings.MEDIA_URL):
+            name = unquote(src[len(settings.MEDIA_URL):])
+            manifest = get_renditions(name)
+            if manifest:
+                self.parts.append(picture_html(manifest, DESCRIPTION_IMAGE_SIZES, alt, 'img-fluid'))
+                return
+            self.missing_images.append(name)
+        attrs = {'src': src, 'alt': alt}
+        for name in ('width', 'height'):
+            if element.attrs.get(name, '').isdigit():
+                attrs[name] = element.attrs[name]
+        attrs.update({'class': 'img-fluid', 'loading': 'lazy', 'decoding': 'async'})
+        self.parts.append(f'<img{self.attrs(attrs)}>')
+
+    def render_embed(self, url):
+        video_id = _youtube_id(url)
+        if video_id:
+            self.parts.append(
+                f'<div class="lite-youtube" data-video-id="{video_id}">'
+                f'<img src="https://i.ytimg.com/vi/{video_id}/hqdefault.jpg" alt="" loading="lazy" decoding="async">'
+                '<button type="button" class="lite-youtube-play" aria-label="Videoyu oynat"></button></div>'
+            )
+            return
+        url = _safe_url(url or '')
+        if url and urlsplit(url).scheme in ('http', 'https'):
+            # başka sağlayıcıların gömmeleri bağlantı olarak kalır
+            self.parts.append(f'<p><a href="{escape(url)}" rel="noopener nofollow" target="_blank">{escape(url)}</a></p>')
+
+    def render_oembed(self, element):
+        self.render_embed(element.attrs.get('url'))
+
+    def render_iframe(self, element):
+        self.render_embed(element.attrs.get('src'))
+
+
+def _is_empty(node):
+    if isinstance(node, str):
+        return not node.replace('\xa0', ' ').strip()
+    if node.tag in KEEP_EMPTY:
+        return False
+    return all(_is_empty(child) for child in node.children)
+
+
+def _prune(element):
+    """Boş öğeleri ve blokların sonundaki <br>'leri atar."""
+    children = []
+    for child in element.children:
+        if isinstance(child, _Element):
+            _prune(child)
+            if child.tag != 'br' and _is_empty(child):
+                continue
+        children.append(child)
+    if element.tag in BLOCK_TAGS or element.tag is None:
+        while children and (getattr(children[-1], 'tag', None) == 'br' or _is_empty(children[-1])):
+            children.pop()
+    element.children = children
+
+
+def render_description(source):
+    """
+    (temiz HTML, türevi henüz olmayan medya görselleri). Görsel listesi, türev
+    üretildikten sonra açıklamanın yeniden işlenmesi için kullanılır.
+    """
+    builder = _TreeBuilder()
+    builder.feed(source or '')
+    builder.close()
+    _prune(builder.root)
+    renderer = _Renderer()
+    renderer.render(builder.root.children)
+    return ''.join(renderer.parts).strip(), renderer.missing_images
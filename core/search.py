@@ -0,0 +1,199 @@
+"""
+SQLite FTS5 tabanlı ürün araması.
+
+core_product_fts tablosunda her ürün için ad, kategori/seri/model adları ve
+HTML'den arındırılmış açıklama tutulur. Metinler Türkçe'ye uygun biçimde
+katlanır (İ/I/ı -> i, ş -> s, ğ -> g ...); böylece "isik", "IŞIK" ve "ışık"
+aynı kelimeyi bulur. Katlama karakter başına 1:1 olduğundan vurgulama orijinal
+metin üzerinde aynı konumlarla yapılabilir.
+
+Tablo, Product ve kategori modellerindeki sinyallerle artımlı güncellenir.
+"""
+import html
+import re
+from html.parser import HTMLParser
+
+from django.db import connection
+from django.utils.html import escape
+
+FTS_TABLE = 'core_product_fts'
+# bm25 ağırlıkları: ad, kategori/seri/model, açıklama
+RANK_WEIGHTS = (10.0, 5.0, 1.0)
+
+TURKISH_FOLD = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i', 'Î': 'i', 'î': 'i',
+    'Ş': 's', 'ş': 's', 'Ğ': 'g', 'ğ': 'g', 'Ç': 'c', 'ç': 'c',
+    'Ö': 'o', 'ö': 'o', 'Ü': 'u', 'ü': 'u', 'Â': 'a', 'â': 'a', 'Û': 'u', 'û': 'u',
+})
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+CREATE_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "name, taxonomy, description, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+DROP_TABLE_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+INSERT_SQL = f"INSERT INTO {FTS_TABLE}(rowid, name, taxonomy, description) VALUES (%s, %s, %s, %s)"
+
+
+def fold(text):
+    """Türkçe büyük/küçük harf ve aksan katlaması; uzunluğu korur."""
+    text = (text or '').translate(TURKISH_FOLD)
+    return ''.join(low if len(low := ch.lower()) == 1 else ch for ch in text)
+
+
+class _TextExtractor(HTMLParser):
+    BLOCK_TAGS = {'p', 'br', 'li', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr', 'td', 'th', 'figure'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def strip_html(value):
+    parser = _TextExtractor()
+    parser.feed(value or '')
+    parser.close()
+    return ' '.join(html.unescape(''.join(parser.parts)).split())
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def index_row(product):
+    taxonomy = ' '.join(filter(None, (
+        product.category.name if product.category else '',
+        product.series.name if product.series else '',
+        product.model.name if product.model else '',
+    )))
+    return product.pk, fold(product.name), fold(taxonomy), fold(strip_html(product.description))
+
+
+def index_products(product_ids=None, batch_size=500):
+    """Verilen ürünleri (None ise hepsini) yeniden indeksler."""
+    if not is_available():
+        return
+    from .models import Product
+
+    products = Product.objects.select_related('category', 'series', 'model')
+    with connection.cursor() as cursor:
+        if product_ids is None:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        else:
+            product_ids = list(product_ids)
+            remove_products(product_ids)
+            products = products.filter(pk__in=product_ids)
+        batch = []
+        for product in products.iterator(chunk_size=batch_size):
+            batch.append(index_row(product))
+            if len(batch) >= batch_size:
+                cursor.executemany(INSERT_SQL, batch)
+                batch = []
+        if batch:
+            cursor.executemany(INSERT_SQL, batch)
+
+
+def remove_products(product_ids):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(pk,) for pk in product_ids])
+
+
+def query_terms(query):
+    return WORD_RE.findall(fold(query))
+
+
+def match_expression(query):
+    """Kullanıcı girdisini güvenli bir FTS5 ifadesine çevirir: her kelime önek olarak aranır."""
+    terms = query_terms(query)
+    if not terms:
+        return None
+    return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def ranked_ids(query, limit=20, offset=0):
+    """(product_id, rank) listesi; en ilgili önce."""
+    match = match_expression(query)
+    if not match or not is_available():
+        return []
+    weights = ', '.join(str(w) for w in RANK_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, bm25({FTS_TABLE}, {weights}) AS rank FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s OFFSET %s",
+            [match, limit, offset],
+        )
+        return cursor.fetchall()
+
+
+def matching_ids_sql(query):
+    """Admin filtresi için alt sorgu: (sql, params). Eşleşme yoksa None."""
+    match = match_expression(query)
+    if not match:
+        return None
+    return f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+
+
+def highlight(text, terms, limit=None):
+    """
+    terms ile başlayan kelimeleri <mark> içine alır. Eşleşme katlanmış metinde
+    aranır, vurgulama orijinal metinde yapılır. limit verilirse ilk eşleşme
+    etrafında kısaltılmış bir kesit döner.
+    """
+    text = text or ''
+    if not terms:
+        return escape(text[:limit] if limit else text)
+    pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, terms)) + r')\w*', re.UNICODE)
+    matches = list(pattern.finditer(fold(text)))
+
+    start, end = 0, len(text)
+    if limit and len(text) > limit:
+        first = matches[0].start() if matches else 0
+        start = max(0, text.rfind(' ', 0, max(0, first - limit // 3)) + 1)
+        end = min(len(text), start + limit)
+        space = text.rfind(' ', start, end)
+        if end < len(text) and space > start:
+            end = space
+
+    pieces, position = [], start
+    for match in matches:
+        if match.end() <= start or match.start() >= end:
+            continue
+        pieces.append(escape(text[position:match.start()]))
+        pieces.append(f'<mark>{escape(text[match.start():match.end()])}</mark>')
+        position = match.end()
+    pieces.append(escape(text[position:end]))
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if end < len(text) else ''
+    return prefix + ''.join(pieces) + suffix
+
+
+def search(query, limit=20, offset=0):
+    """Sıralı arama sonuçları: ürün, skor ve vurgulu ad/kesit."""
+    from .models import Product
+
+    ranked = ranked_ids(query, limit, offset)
+    products = Product.objects.select_related('category', 'series', 'model', 'cover_image').in_bulk(
+        [pk for pk, rank in ranked])
+    terms = query_terms(query)
+    results = []
+    for pk, rank in ranked:
+        product = products.get(pk)
+        if product is None:
+            continue
+        results.append({
+            'product': product,
+            'rank': rank,
+            'name': highlight(product.name, terms),
+            'snippet': highlight(strip_html(product.description), terms, limit=200),
+        })
+    return results
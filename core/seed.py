@@ -0,0 +1,202 @@
+"""
+Yük testleri ve ölçümler için sentetik site verisi (bkz. seed_catalog, bench_site).
+
+Aynı tohum ve ölçek her zaman aynı veriyi üretir; ölçüm sonuçları commit'ler
+arasında karşılaştırılabilir. Kayıtlar bulk_create ile yazılır; sinyallerin
+normalde güncellediği yapılar (kapak görseli, temiz açıklama, arama indeksi,
+cache sürümleri, kategori ağacı, facet indeksi) sonda topluca yenilenir.
+
+Görseller: küçük bir havuz gerçek JPEG olarak medya klasörüne (seed/) bir kez
+yazılır ve türevleri üretilir; ürünler bu dosyalara işaret eder. Videolar
+yalnızca kayıt olarak oluşturulur (ffmpeg gerekmez), dosya adı yer tutucudur.
+"""
+import io
+import math
+import random
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageDraw
+
+from companyinfo.models import Branch, BranchPhoneNumber, Company
+from homepage.models import About_section, Business_partner, Faq, Hero_section, Our_values, Statistics_area
+
+from . import facets, search
+from .cache import bump_content_version
+from .models import Category, ModelCategory, Product, ProductImage, ProductVideo, SeriesCategory, backfill_cover_images
+from .renditions import generate_for_name
+from .site_settings import bump_site_settings_version
+from .taxonomy import bump_taxonomy_version
+
+SCALES = {'small': 10, 'medium': 1000, 'large': 50000}
+SKU_PREFIX = 'SEED-'
+BRANCH_PREFIX = 'Seed Şube'
+# tohumlanan ağaç bu önekle ayrılır; clear() ve tekrar çalıştırma yalnızca onu kullanır
+CATEGORY_PREFIX = 'Seed '
+IMAGE_POOL_SIZE = 12
+BATCH_SIZE = 2000
+
+CATEGORY_NAMES = ('Dolap', 'Kabinet', 'Raf Sistemi', 'Çalışma Tezgahı', 'Takım Arabası', 'Kilitli Dolap')
+SERIES_NAMES = ('Predator', 'Atlas', 'Titan', 'Orion', 'Nova', 'Vega', 'Kartal', 'Toros', 'Delta', 'Sirius',
+                'Zirve', 'Poyraz', 'Yıldız', 'Marmara', 'Ege', 'Kuzey')
+WORDS = ('çelik', 'gövde', 'elektrostatik', 'toz', 'boya', 'kilitli', 'kapak', 'ayarlanabilir', 'raf',
+         'çekmece', 'teleskopik', 'ray', 'taşıma', 'kapasitesi', 'havalandırma', 'menteşe', 'sac', 'dayanıklı')
+WIDTHS = (35, 45, 60, 75, 90, 100, 120, 150)
+HEIGHTS = (50, 85, 100, 150, 180, 200)
+DEPTHS = (30, 40, 45, 50, 60, 70)
+
+
+def scale_products(scale):
+    """'small'/'medium'/'large' ya da doğrudan ürün sayısı."""
+    return SCALES[scale] if scale in SCALES else int(scale)
+
+
+def _description(rng):
+    sentences = [' '.join(rng.choices(WORDS, k=rng.randint(6, 14))).capitalize() + '.' for _ in range(rng.randint(2, 5))]
+    items = ''.join(f'<li>{word}</li>' for word in rng.sample(WORDS, rng.randint(2, 5)))
+    return f'<p>{" ".join(sentences)}</p><ul>{items}</ul><p>&nbsp;</p>'
+
+
+def image_pool(size=IMAGE_POOL_SIZE, renditions=True):
+    """seed/ altındaki görsel havuzu; dosyalar yoksa üretilir. Depolama adlarını döner."""
+    names = []
+    for index in range(size):
+        name = f'seed/urun-{index:02d}.jpg'
+        if not default_storage.exists(name):
+            rng = random.Random(index)
+            image = Image.new('RGB', (1200, 800), tuple(rng.randrange(40, 220) for _ in range(3)))
+            draw = ImageDraw.Draw(image)
+            for _ in range(6):
+                x, y = rng.randrange(1000), rng.randrange(600)
+                draw.rectangle((x, y, x + rng.randrange(80, 300), y + rng.randrange(80, 300)),
+                               fill=tuple(rng.randrange(256) for _ in range(3)))
+            buffer = io.BytesIO()
+            image.save(buffer, format='JPEG', quality=85)
+            name = default_storage.save(name, ContentFile(buffer.getvalue()))
+            if renditions:
+                generate_for_name(name)
+        names.append(name)
+    return names
+
+
+def clear():
+    """
+    Tohumlanmış ürünleri ve şubeleri, tohumlanan kategori ağacını da içinde
+    ürün kalmadıysa siler. Gerçek kategorilere dokunulmaz.
+    """
+    with transaction.atomic():
+        Product.objects.filter(sku__startswith=SKU_PREFIX).delete()
+        Category.objects.filter(name__startswith=CATEGORY_PREFIX).exclude(Kategori__isnull=False).delete()
+        Branch.objects.filter(name__startswith=BRANCH_PREFIX).delete()
+
+
+def _site_sections(rng):
+    """Ana sayfanın sabit bölümleri; zaten kayıt varsa dokunulmaz."""
+    if not Company.objects.exists():
+        Company.objects.create(name='Örnek Makine', phone='05550000000', whatsapp='05550000000',
+                               mail_address='info@example.com', logo='seed/urun-00.jpg')
+    if not Hero_section.objects.exists():
+        Hero_section.objects.create(title='Endüstriyel Depolama', description=_description(rng),
+                                    image='seed/urun-01.jpg', youtube_url='https://www.youtube.com/watch?v=dQw4w9WgXcQ')
+    if not About_section.objects.exists():
+        About_section.objects.create(header='Hakkımızda', sub_header='Otuz yıllık tecrübe',
+                                     home_description=_description(rng), detail_description=_description(rng),
+                                     image='seed/urun-02.jpg')
+    if not Statistics_area.objects.exists():
+        Statistics_area.objects.bulk_create([Statistics_area(title=title, value=rng.randint(50, 5000), icon='bi bi-star')
+                                             for title in ('Müşteri', 'Proje', 'Ürün', 'Çalışan')])
+    if not Our_values.objects.exists():
+        Our_values.objects.bulk_create([Our_values(title=title, description=_description(rng), image=f'seed/urun-0{i}.jpg')
+                                        for i, title in enumerate(('Kalite', 'Güven', 'Hız'))])
+    if not Faq.objects.exists():
+        Faq.objects.bulk_create([Faq(question=f'Soru {i + 1}?', answer=_description(rng)) for i in range(6)])
+    if not Business_partner.objects.exists():
+        Business_partner.objects.bulk_create([Business_partner(name=f'İş Ortağı {i + 1}', image=f'seed/urun-0{i}.jpg',
+                                                               img_alt='logo') for i in range(8)])
+
+
+def _branches(rng, count):
+    company = Company.objects.order_by('pk').first()
+    existing = Branch.objects.filter(name__startswith=BRANCH_PREFIX).count()
+    branches = Branch.objects.bulk_create([
+        Branch(company=company, name=f'{BRANCH_PREFIX} {index:03d}', email=f'sube{index}@example.com',
+               address=f'{rng.randint(1, 200)}. Sokak No:{rng.randint(1, 90)} İstanbul')
+        for index in range(existing, count)
+    ])
+    BranchPhoneNumber.objects.bulk_create([
+        BranchPhoneNumber(branch=branch, name=f'Yetkili {phone + 1}', phone_number=f'05{rng.randrange(10 ** 9):09d}')
+        for branch in branches for phone in range(rng.randint(1, 3))
+    ])
+    return len(branches)
+
+
+def _taxonomy(rng, product_count):
+    # ağaç ürün sayısıyla büyür: 10 üründe 2 kategori, 50.000'de 6 kategori, ~90 seri, ~400 model
+    category_count = max(2, min(len(CATEGORY_NAMES), round(math.log10(max(product_count, 10)) * 1.3)))
+    series_per_category = max(2, min(len(SERIES_NAMES), round(math.sqrt(product_count) / 15)))
+    categories = Category.objects.bulk_create([Category(name=f'{CATEGORY_PREFIX}{name}')
+                                                for name in CATEGORY_NAMES[:category_count]])
+    series = SeriesCategory.objects.bulk_create([
+        SeriesCategory(category=category, name=name)
+        for category in categories for name in rng.sample(SERIES_NAMES, series_per_category)
+    ])
+    models = ModelCategory.objects.bulk_create([
+        ModelCategory(category_id=serie.category_id, series=serie, name=f'{serie.name[:3].upper()}-{number}')
+        for serie in series for number in range(100, 100 + 100 * rng.randint(2, 8), 100)
+    ])
+    return models
+
+
+def seed(products, branches=5, images_per_product=3, video_ratio=0.1, seed=1, renditions=True):
+    """
+    `products` ürünlük katalog, `branches` şube (1-3 telefonlu) ve ana sayfa
+    bölümlerini oluşturur. Her ürünün 1..images_per_product görseli olur;
+    ürünlerin `video_ratio` kadarında video kaydı bulunur. Özet sözlük döner.
+    """
+    # bölümler yalnızca ilk çalıştırmada oluşur; katalog verisi bundan etkilenmesin diye ayrı üreteç
+    rng, site_rng = random.Random(seed), random.Random(f'{seed}-site')
+    pool = image_pool(renditions=renditions)
+    start = Product.objects.filter(sku__startswith=SKU_PREFIX).count()
+    with transaction.atomic():
+        _site_sections(site_rng)
+        created_branches = _branches(site_rng, branches)
+        # tekrar çalıştırıldığında daha önce tohumlanan ağaç kullanılır
+        models = (list(ModelCategory.objects.filter(category__name__startswith=CATEGORY_PREFIX).select_related('series'))
+                  or (_taxonomy(rng, products) if products else []))
+
+        product_ids = []
+        for offset in range(0, products, BATCH_SIZE):
+            batch = []
+            for index in range(start + offset, start + min(offset + BATCH_SIZE, products)):
+                model = rng.choice(models)
+                product = Product(
+                    sku=f'{SKU_PREFIX}{index:06d}', name=f'{model.series.name} {model.name} {rng.choice(WORDS)} {index}',
+                    category_id=model.category_id, series_id=model.series_id, model=model,
+                    width=rng.choice(WIDTHS), height=rng.choice(HEIGHTS), depth=rng.choice(DEPTHS),
+                    description=_description(rng), stock=0 if rng.random() < 0.2 else rng.randint(1, 60),
+                )
+                product.render_description()
+                batch.append(product)
+            Product.objects.bulk_create(batch)
+            ProductImage.objects.bulk_create([
+                ProductImage(product=product, image=rng.choice(pool), alt_text=product.name[:100], is_cover=(number == 0))
+                for product in batch for number in range(rng.randint(1, images_per_product))
+            ])
+            ProductVideo.objects.bulk_create([
+                ProductVideo(product=product, video=f'seed/video-{product.pk % 4}.mp4', alt_text=product.name[:100])
+                for product in batch if rng.random() < video_ratio
+            ])
+            product_ids.extend(product.pk for product in batch)
+
+        if product_ids:
+            backfill_cover_images(product_ids=product_ids)
+            search.index_products(product_ids)
+            facets.request_rebuild()
+        bump_taxonomy_version()
+        bump_site_settings_version()
+        bump_content_version()
+    return {
+        'products': len(product_ids), 'models': len(models), 'branches': created_branches,
+        'images': ProductImage.objects.filter(product_id__in=product_ids).count() if product_ids else 0,
+    }
@@ -0,0 +1,137 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from companyinfo.models import Company, Branch, BranchPhoneNumber
+from homepage.models import Hero_section, About_section, Statistics_area, Our_values, Faq, Business_partner
+
+from jobs.queue import enqueue
+
+from . import facets, search
+from .cache import bump_content_version
+from .site_settings import bump_site_settings_version
+from .taxonomy import bump_taxonomy_version
+from .models import Category, SeriesCategory, ModelCategory, Product, ProductImage, ProductVideo, backfill_cover_images
+
+# Ana sayfada görünen tüm modeller; herhangi birinde kayıt/silme sayfa cache'ini geçersiz kılar.
+HOMEPAGE_MODELS = (
+    Hero_section, About_section, Statistics_area, Our_values, Faq, Business_partner,
+    Company, Branch, BranchPhoneNumber,
+    Category, SeriesCategory, ModelCategory, Product, ProductImage, ProductVideo,
+)
+
+# Türevi (rendition) üretilecek görsel alanları
+RENDITION_FIELDS = {
+    ProductImage: 'image',
+    Hero_section: 'image',
+    About_section: 'image',
+    Our_values: 'image',
+    Business_partner: 'image',
+    Company: 'logo',
+    Branch: 'photo',
+}
+
+for model in HOMEPAGE_MODELS:
+    post_save.connect(bump_content_version, sender=model, dispatch_uid=f'content-version-save-{model._meta.label}')
+    post_delete.connect(bump_content_version, sender=model, dispatch_uid=f'content-version-delete-{model._meta.label}')
+
+# süreç içi önbellekte tutulan tekil kayıtlar (bkz. core.site_settings)
+for model in (Company, Hero_section, About_section):
+    post_save.connect(bump_site_settings_version, sender=model, dispatch_uid=f'site-settings-save-{model._meta.label}')
+    post_delete.connect(bump_site_settings_version, sender=model, dispatch_uid=f'site-settings-delete-{model._meta.label}')
+
+# kategori ağacı ve düğüm başına ürün sayıları (bkz. core.taxonomy)
+for model in (Category, SeriesCategory, ModelCategory, Product):
+    post_save.connect(bump_taxonomy_version, sender=model, dispatch_uid=f'taxonomy-save-{model._meta.label}')
+    post_delete.connect(bump_taxonomy_version, sender=model, dispatch_uid=f'taxonomy-delete-{model._meta.label}')
+
+
+
+def refresh_cover_after_image_delete(sender, instance, **kwargs):
+    # kapak silindiyse kalan ilk görsel kapak olur (SET_NULL ile boş kalmasın)
+    backfill_cover_images(product_ids=[instance.product_id])
+
+
+post_delete.connect(refresh_cover_after_image_delete, sender=ProductImage, dispatch_uid='product-cover-delete')
+
+
+def enqueue_image_processing(sender, instance, **kwargs):
+    # türev üretimi admin isteğini bekletmesin; işçi (manage.py runjobs) halleder
+    field_name = RENDITION_FIELDS[sender]
+    if getattr(instance, field_name):
+        label = sender._meta.label
+        transaction.on_commit(partial(
+            enqueue, 'images.process',
+            {'model': label, 'pk': instance.pk, 'field': field_name},
+            key=f'images.process:{label}:{instance.pk}',
+        ))
+
+
+for model in RENDITION_FIELDS:
+    post_save.connect(enqueue_image_processing, sender=model, dispatch_uid=f'renditions-{model._meta.label}')
+
+
+def enqueue_video_processing(sender, instance, **kwargs):
+    # ffmpeg dakikalarca sürebilir; yalnızca kaynak dosya değiştiyse kuyruğa girer
+    if instance.video and not instance.is_processed:
+        transaction.on_commit(partial(
+            enqueue, 'videos.process', {'pk': instance.pk},
+            key=f'videos.process:{instance.pk}', max_attempts=3,
+        ))
+
+
+post_save.connect(enqueue_video_processing, sender=ProductVideo, dispatch_uid='videos-process')
+
+
+def enqueue_description_images(sender, instance, **kwargs):
+    # açıklamadaki yüklenmiş görsellerin türevi yoksa üretilir, açıklama yeniden işlenir
+    if getattr(instance, '_description_images', None):
+        transaction.on_commit(partial(
+            enqueue, 'descriptions.images', {'pk': instance.pk}, key=f'descriptions.images:{instance.pk}',
+        ))
+
+
+post_save.connect(enqueue_description_images, sender=Product, dispatch_uid='descriptions-images')
+
+
+# Ürün arama indeksi (FTS5) aynı transaction içinde güncellenir
+def index_product(sender, instance, **kwargs):
+    search.index_products([instance.pk])
+
+
+def unindex_product(sender, instance, **kwargs):
+    search.remove_products([instance.pk])
+
+
+TAXONOMY_LOOKUPS = {Category: 'category', SeriesCategory: 'series', ModelCategory: 'model'}
+
+
+def reindex_taxonomy_products(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    product_ids = Product.objects.filter(**{TAXONOMY_LOOKUPS[sender]: instance}).values_list('pk', flat=True)
+    search.index_products(product_ids)
+
+
+post_save.connect(index_product, sender=Product, dispatch_uid='search-index-product')
+post_delete.connect(unindex_product, sender=Product, dispatch_uid='search-unindex-product')
+for model in TAXONOMY_LOOKUPS:
+    post_save.connect(reindex_taxonomy_products, sender=model, dispatch_uid=f'search-taxonomy-{model._meta.label}')
+
+
+# Facet indeksi (bkz. core.facets): değişen ürün günlüğe yazılır, süreçler artımlı günceller
+def record_product_facets(sender, instance, **kwargs):
+    facets.record_changes([instance.pk])
+
+
+def rebuild_facets_on_taxonomy_change(sender, instance, created=False, **kwargs):
+    # seri/model taşınınca ürünlerin kategori/seri alanları update() ile değişir (bkz. models)
+    if not created:
+        facets.request_rebuild()
+
+
+post_save.connect(record_product_facets, sender=Product, dispatch_uid='facets-product-save')
+post_delete.connect(record_product_facets, sender=Product, dispatch_uid='facets-product-delete')
+for model in (SeriesCategory, ModelCategory):
+    post_save.connect(rebuild_facets_on_taxonomy_change, sender=model, dispatch_uid=f'facets-taxonomy-{model._meta.label}')
@@ -0,0 +1,36 @@
+"""
+Site geneli tekil kayıtlar (firma, hero, hakkında) için süreç içi önbellek
+(bkz. core.process_cache). Admin'de bu kayıtlardan biri değişince sinyal
+sürümü artırır ve her süreç kayıtları bir sonraki istekte yeniden okur.
+"""
+from .process_cache import ProcessCache
+
+SITE_SETTINGS_VERSION_KEY = 'site:settings-version'
+
+
+def _load():
+    from companyinfo.models import Company
+    from homepage.models import Hero_section, About_section
+
+    # yt_embed_url views içinde tanımlı; döngüsel importu önlemek için burada çağırıyoruz
+    from .views import yt_embed_url
+
+    hero = Hero_section.objects.first()
+    if hero is not None:
+        hero.youtube_embed = yt_embed_url(hero.youtube_url)
+    return {
+        'company': Company.objects.first(),
+        'hero': hero,
+        'about': About_section.objects.first(),
+    }
+
+
+_cache = ProcessCache(SITE_SETTINGS_VERSION_KEY, _load)
+site_settings_version = _cache.version
+# sinyal alıcısı
+bump_site_settings_version = _cache.bump
+
+
+def site_settings():
+    """{'company', 'hero', 'about'}; hero.youtube_embed önceden hesaplanmıştır. Salt okunur kullanın."""
+    return _cache.get()
@@ -0,0 +1,54 @@
+/**
+* "Daha fazla ürün" butonu: katalog API'sinden sonraki sayfanın hazır HTML
+* kartlarını çeker ve isotope ızgarasına ekler.
+*/
+(function() {
+  "use strict";
+
+  document.querySelectorAll('[data-load-more]').forEach(function(button) {
+    button.addEventListener('click', function() {
+      let url = new URL(button.getAttribute('data-load-more'), window.location.origin);
+      url.searchParams.set('html', '1');
+      let container = document.querySelector(button.getAttribute('data-target'));
+
+      button.disabled = true;
+      fetch(url, { headers: { 'Accept': 'application/json' } })
+        .then(function(response) { return response.json(); })
+        .then(function(data) {
+          let template = document.createElement('template');
+          template.innerHTML = data.html;
+          let items = Array.from(template.content.children);
+          items.forEach(function(item) { container.appendChild(item); });
+
+          let iso = window.Isotope && Isotope.data(container);
+          if (iso) {
+            iso.appended(items);
+            imagesLoaded(container, function() { iso.layout(); });
+          }
+          if (window.portfolioLightbox) {
+            window.portfolioLightbox.reload();
+          }
+
+          if (data.next) {
+            button.setAttribute('data-load-more', data.next);
+            button.disabled = false;
+          } else {
+            button.remove();
+          }
+        })
+        .catch(function() { button.disabled = false; });
+    });
+  });
+
+  /**
+  * Facet kenar çubuğu: bir seçenek işaretlenince form hemen gönderilir.
+  */
+  document.querySelectorAll('[data-facet-form]').forEach(function(form) {
+    form.addEventListener('change', function(event) {
+      if (event.target.type === 'checkbox') {
+        form.submit();
+      }
+    });
+  });
+
+})();
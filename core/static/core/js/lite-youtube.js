@@ -0,0 +1,19 @@
+/**
+* Ürün açıklamasındaki YouTube önizlemeleri (bkz. core.richtext): oynatıcı
+* iframe'i yalnızca tıklanınca yüklenir.
+*/
+(function() {
+  "use strict";
+
+  document.querySelectorAll('.lite-youtube[data-video-id]').forEach(function(placeholder) {
+    placeholder.addEventListener('click', function() {
+      let iframe = document.createElement('iframe');
+      iframe.src = 'https://www.youtube-nocookie.com/embed/' + encodeURIComponent(placeholder.getAttribute('data-video-id')) + '?autoplay=1';
+      iframe.allow = 'accelerometer; autoplay; encrypted-media; gyroscope; picture-in-picture';
+      iframe.allowFullscreen = true;
+      iframe.title = 'YouTube';
+      placeholder.replaceChildren(iframe);
+    }, { once: true });
+  });
+
+})();
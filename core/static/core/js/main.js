@@ -100,6 +100,7 @@
   const glightbox = GLightbox({
     selector: '.glightbox'
   });
+  window.portfolioLightbox = glightbox;
 
   /**
    * Initiate Pure Counter
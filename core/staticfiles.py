@@ -0,0 +1,109 @@
+"""
+Üretim için statik dosya hattı.
+
+collectstatic sırasında:
+  1. settings.STATIC_BUNDLES içindeki CSS/JS dosyaları birleştirilir (CSS
+     içindeki göreli url() adresleri paketin konumuna göre yeniden yazılır),
+  2. ManifestStaticFilesStorage tüm dosyalara içerik özeti ekler,
+  3. özetli metin dosyalarının yanına .gz kopyaları yazılır. Brotli bağımlılık
+     gerektirdiğinden üretilmez; br isteyen istemciler gzip alır.
+
+Dosyalar nginx olmadan core.middleware.StaticFilesMiddleware ile sunulur.
+"""
+import gzip
+import posixpath
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.files.base import ContentFile
+from django.templatetags.static import static
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.json', '.map', '.svg', '.txt', '.xml', '.html', '.ico', '.ttf', '.eot')
+# sıkıştırılmış hali en az bu oranda küçük değilse yazılmaz
+MIN_COMPRESSION_RATIO = 0.95
+
+CSS_URL_RE = re.compile(r'''url\(\s*(['"]?)(?P<url>[^'")]+)\1\s*\)''')
+URL_SUFFIX_RE = re.compile(r'([^?#]*)(.*)')
+SOURCE_MAP_RE = re.compile(r'^\s*(?://|/\*)# sourceMappingURL=.*$', re.MULTILINE)
+
+
+def get_bundles():
+    return getattr(settings, 'STATIC_BUNDLES', {})
+
+
+def bundle_urls(path):
+    """
+    Paketin sayfaya eklenen adresleri: paketleyen depolamada tek özetli dosya,
+    aksi halde (geliştirme ortamı) paketteki dosyaların her biri.
+    """
+    if isinstance(staticfiles_storage, CompressedManifestStaticFilesStorage):
+        return [static(path)]
+    return [static(source) for source in get_bundles()[path]]
+
+
+def _rebase_css_urls(content, source_path, bundle_path):
+    source_dir = posixpath.dirname(source_path)
+    bundle_dir = posixpath.dirname(bundle_path)
+
+    def replace(match):
+        url = match.group('url').strip()
+        if url.startswith(('data:', 'http:', 'https:', '//', '/', '#')):
+            return match.group(0)
+        # ?v=... ve #iefix gibi ekler korunur
+        path, suffix = URL_SUFFIX_RE.match(url).groups()
+        target = posixpath.normpath(posixpath.join(source_dir, path))
+        return f'url("{posixpath.relpath(target, bundle_dir)}{suffix}")'
+
+    return CSS_URL_RE.sub(replace, content)
+
+
+def build_bundle(bundle_path, sources):
+    """Kaynak dosyaları sırasıyla birleştirip paket içeriğini döner."""
+    parts = []
+    for source in sources:
+        absolute = finders.find(source)
+        if absolute is None:
+            raise ValueError(f"Paket kaynağı bulunamadı: {source}")
+        with open(absolute, encoding='utf-8') as fp:
+            content = SOURCE_MAP_RE.sub('', fp.read())
+        if bundle_path.endswith('.css'):
+            content = _rebase_css_urls(content, source, bundle_path)
+        parts.append(f'/* {source} */\n{content.strip()}\n')
+    # JS dosyaları noktalı virgülsüz bitebilir
+    separator = ';\n' if bundle_path.endswith('.js') else '\n'
+    return separator.join(parts)
+
+
+def compress(data):
+    """{uzantı: sıkıştırılmış veri}; kazanç yoksa ilgili uzantı atlanır."""
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    return {ext: value for ext, value in variants.items() if len(value) < len(data) * MIN_COMPRESSION_RATIO}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            return
+        for bundle_path, sources in get_bundles().items():
+            if self.exists(bundle_path):
+                self.delete(bundle_path)
+            self.save(bundle_path, ContentFile(build_bundle(bundle_path, sources).encode()))
+            paths[bundle_path] = (self, bundle_path)
+
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                yield from self._compress_file(hashed_name)
+
+    def _compress_file(self, name):
+        with self.open(name) as fp:
+            data = fp.read()
+        for extension, compressed in compress(data).items():
+            compressed_name = name + extension
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self.save(compressed_name, ContentFile(compressed))
+            yield name, compressed_name, True
@@ -0,0 +1,196 @@
+"""
+Stok hareketleri.
+
+Product.stock elle yazılmaz; değişiklikler hareket listesi olarak verilir ve
+apply_movements ile uygulanır:
+  * stok UPDATE ... SET stock = stock + n ile (F ifadesi) veritabanında
+    artırılır; eşzamanlı iki düzeltme birbirinin sonucunu ezmez,
+  * aynı partide aynı miktarda değişen ürünler tek UPDATE ile güncellenir
+    (depo beslemelerinde farklı miktar sayısı azdır),
+  * her parti tek transaction'dır; hareketler StockMovement'e bulk_create
+    ile yazılır, satır başına save() yoktur,
+  * `reference` verilmiş bir hareket daha önce uygulandıysa atlanır; depo
+    sistemi aynı isteği güvenle tekrar gönderebilir.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import facets
+from .cache import bump_content_version
+from .models import Product, StockMovement
+
+BATCH_SIZE = getattr(settings, 'STOCK_BATCH_SIZE', 1000)
+MAX_MOVEMENTS_PER_REQUEST = getattr(settings, 'STOCK_MAX_MOVEMENTS_PER_REQUEST', 10000)
+REASONS = {value for value, label in StockMovement.REASON_CHOICES}
+# stock/delta IntegerField'tır; kimlikler SQLite'ın 64 bit tamsayısına sığmalı
+MAX_DELTA = 2 ** 31 - 1
+MAX_ID = 2 ** 63 - 1
+
+
+class InvalidStockMovement(ValueError):
+    pass
+
+
+class StockError(Exception):
+    """Parti uygulanamadı (ürün yok ya da stok eksiye düşüyor); parti geri alınır."""
+
+    def __init__(self, message, product_ids=()):
+        super().__init__(message)
+        self.product_ids = sorted(product_ids)
+
+
+class StockResult:
+    def __init__(self):
+        self.applied = 0
+        self.duplicates = []
+
+    def __str__(self):
+        return f"{self.applied} stok hareketi uygulandı, {len(self.duplicates)} tekrar atlandı."
+
+
+def _apply_batch(batch, allow_negative, result):
+    references = [movement['reference'] for movement in batch if movement.get('reference')]
+    with transaction.atomic():
+        seen = set(StockMovement.objects.filter(reference__in=references).values_list('reference', flat=True))
+        fresh = []
+        for movement in batch:
+            reference = movement.get('reference')
+            if reference:
+                if reference in seen:
+                    result.duplicates.append(reference)
+                    continue
+                seen.add(reference)
+            fresh.append(movement)
+        if not fresh:
+            return
+
+        totals = defaultdict(int)
+        for movement in fresh:
+            totals[movement['product']] += movement['delta']
+        by_delta = defaultdict(list)
+        for product_id, total in totals.items():
+            if total:
+                by_delta[total].append(product_id)
+        now = timezone.now()
+        for delta, product_ids in by_delta.items():
+            Product.objects.filter(pk__in=product_ids).update(stock=F('stock') + delta, updated=now)
+
+        # UPDATE satırları kilitli tuttuğundan okunan değerler bu partinin sonucudur
+        balances = dict(Product.objects.filter(pk__in=totals).values_list('pk', 'stock'))
+        missing = set(totals) - set(balances)
+        if missing:
+            raise StockError(f"Ürün bulunamadı: {', '.join(map(str, sorted(missing)))}", missing)
+        if not allow_negative:
+            negative = [product_id for product_id in totals if balances[product_id] < 0]
+            if negative:
+                raise StockError("Stok eksiye düşüyor.", negative)
+
+        # her hareketin sonrasındaki stok: son bakiyeden geriye doğru
+        movements = []
+        for movement in reversed(fresh):
+            product_id = movement['product']
+            movements.append(StockMovement(
+                product_id=product_id, delta=movement['delta'], balance_after=balances[product_id],
+                reason=movement.get('reason') or StockMovement.MANUAL,
+                reference=movement.get('reference') or None, note=movement.get('note') or '',
+            ))
+            balances[product_id] -= movement['delta']
+        movements.reverse()
+        StockMovement.objects.bulk_create(movements)
+        # stokta/stokta yok facet'i değişmiş olabilir
+        facets.record_changes(list(totals))
+    result.applied += len(fresh)
+
+
+def apply_movements(movements, allow_negative=True, batch_size=BATCH_SIZE):
+    """
+    movements: {'product': id, 'delta': n, 'reference', 'reason', 'note'}
+    sözlükleri. Partiler sırayla uygulanır; StockError'da o parti geri alınır,
+    önceki partiler kalır (referanslı hareketler tekrar gönderilebilir).
+    """
+    result = StockResult()
+    batch = []
+    try:
+        for movement in movements:
+            batch.append(movement)
+            if len(batch) >= batch_size:
+                _apply_batch(batch, allow_negative, result)
+                batch = []
+        if batch:
+            _apply_batch(batch, allow_negative, result)
+    finally:
+        # update() sinyal tetiklemez; stok listeleri (stokta olanlar) değişmiş olabilir
+        if result.applied:
+            bump_content_version()
+    return result
+
+
+def adjust_stock(products, delta, reason=StockMovement.MANUAL, note='', allow_negative=True):
+    """Seçili ürünlerin stokunu aynı miktarda değiştirir (admin toplu düzeltme)."""
+    return apply_movements(
+        ({'product': product.pk, 'delta': delta, 'reason': reason, 'note': note} for product in products),
+        allow_negative=allow_negative,
+    )
+
+
+def _parse_int(value, name, minimum, maximum):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise InvalidStockMovement(f"'{name}' tam sayı olmalı.")
+    if not minimum <= value <= maximum:
+        raise InvalidStockMovement(f"'{name}' {minimum}..{maximum} aralığında olmalı.")
+    return value
+
+
+def parse_movements(payload):
+    """
+    Depo API'sinin gövdesini doğrular:
+        {"movements": [{"reference": "...", "sku": "..." | "product": id, "delta": -2,
+                        "reason": "sale", "note": "..."}], "allow_negative": false}
+    Stok kodları tek sorguyla ürün kimliğine çevrilir. Geçersiz hareketlerde
+    InvalidStockMovement; mesajlar hareketin sırasını içerir.
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get('movements'), list):
+        raise InvalidStockMovement("Gövde {'movements': [...]} biçiminde olmalı.")
+    items = payload['movements']
+    if len(items) > MAX_MOVEMENTS_PER_REQUEST:
+        raise InvalidStockMovement(f"Bir istekte en fazla {MAX_MOVEMENTS_PER_REQUEST} hareket gönderilebilir.")
+
+    skus = {item['sku'] for item in items if isinstance(item, dict) and isinstance(item.get('sku'), str)}
+    product_ids = dict(Product.objects.filter(sku__in=skus).values_list('sku', 'pk')) if skus else {}
+
+    movements, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise InvalidStockMovement("hareket bir nesne olmalı.")
+            reference = item.get('reference')
+            if not isinstance(reference, str) or not reference.strip() or len(reference) > 100:
+                raise InvalidStockMovement("'reference' zorunlu (en fazla 100 karakter).")
+            if 'sku' in item:
+                if not isinstance(item['sku'], str):
+                    raise InvalidStockMovement("'sku' metin olmalı.")
+                if item['sku'] not in product_ids:
+                    raise InvalidStockMovement(f"stok kodu bulunamadı: {item['sku']}")
+                product_id = product_ids[item['sku']]
+            else:
+                product_id = _parse_int(item.get('product'), 'product', 1, MAX_ID)
+            delta = _parse_int(item.get('delta'), 'delta', -MAX_DELTA, MAX_DELTA)
+            if delta == 0:
+                raise InvalidStockMovement("'delta' sıfır olamaz.")
+            reason = item.get('reason', StockMovement.WAREHOUSE)
+            if reason not in REASONS:
+                raise InvalidStockMovement(f"geçersiz 'reason': {reason}")
+        except InvalidStockMovement as exc:
+            errors.append(f"{index}: {exc}")
+            continue
+        movements.append({
+            'product': product_id, 'delta': delta, 'reference': reference.strip(),
+            'reason': reason, 'note': str(item.get('note') or '')[:255],
+        })
+    if errors:
+        raise InvalidStockMovement('; '.join(errors[:50]))
+    return movements
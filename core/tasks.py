@@ -0,0 +1,87 @@
+from django.apps import apps
+from django.db import transaction
+
+from jobs.queue import register
+
+from . import facets, profiling
+from .cache import bump_content_version
+from .renditions import generate_for_instance, generate_for_name, optimize_original
+from .richtext import render_description
+from .video import process_video
+
+
+def _content_changed():
+    # sonuçlar update() ile yazılır, sinyal tetiklenmez; sayfa cache'indeki eski <img>/adresler bırakılmasın
+    transaction.on_commit(bump_content_version)
+
+
+@register('images.process')
+def process_image(payload):
+    """
+    Yüklenen görsel için: EXIF temizliği/yeniden sıkıştırma, ardından
+    AVIF/WebP/JPEG türevlerinin üretilmesi. Kayıt silinmişse sessizce biter.
+    """
+    model = apps.get_model(payload['model'])
+    field_name = payload['field']
+    instance = model.objects.filter(pk=payload['pk']).first()
+    if instance is None:
+        return
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        return
+
+    name = optimize_original(field_file)
+    if name != field_file.name:
+        # update(): post_save tetiklenmez, iş tekrar kuyruğa girmez
+        model.objects.filter(pk=instance.pk).update(**{field_name: name})
+        old_name, storage = field_file.name, field_file.storage
+        setattr(instance, field_name, name)
+        _content_changed()
+        # eski adı gösteren cache'lenmiş sayfalar sürüm artınca devre dışı kalır; dosya ondan sonra silinir
+        transaction.on_commit(lambda: storage.delete(old_name))
+    manifest = generate_for_instance(instance, field_name)
+    _content_changed()
+    if manifest is None:
+        raise RuntimeError(f"Türevler üretilemedi: {field_file.name}")
+
+
+@register('videos.process')
+def process_product_video(payload):
+    """Yüklenen ürün videosundan web kopyaları, poster ve süre/boyut bilgisi üretir."""
+    from .models import ProductVideo
+
+    video = ProductVideo.objects.filter(pk=payload['pk']).first()
+    if video is not None:
+        process_video(video)
+        _content_changed()
+
+
+@register('descriptions.images')
+def process_description_images(payload):
+    """
+    Açıklamadaki medya görsellerinin türevlerini üretir ve açıklamayı <picture>
+    ile yeniden işler. update(): kaynak ve özeti değişmez, iş tekrar kuyruğa girmez.
+    """
+    from .models import Product
+
+    product = Product.objects.filter(pk=payload['pk']).only('pk', 'description', 'description_hash').first()
+    if product is None:
+        return
+    for name in render_description(product.description)[1]:
+        generate_for_name(name)
+    # arada açıklama değiştiyse yeni kayıt kendi işini kuyruğa koymuştur
+    Product.objects.filter(pk=product.pk, description_hash=product.description_hash).update(
+        description_html=render_description(product.description)[0])
+    _content_changed()
+
+
+@register('facets.prune')
+def prune_facet_changes(payload):
+    """Saklama süresini aşmış facet günlüğü kayıtlarını siler (bkz. core.facets)."""
+    facets.prune_changes()
+
+
+@register('profiles.prune')
+def prune_profile_captures(payload):
+    """En yeni REQUEST_PROFILE_KEEP profil kaydı dışındakileri siler."""
+    profiling.prune(payload['keep'])
@@ -0,0 +1,121 @@
+"""
+Kategori > Seri > Model ağacı için süreç içi önbellek (bkz. core.process_cache).
+
+Ağaç, düğüm başına ürün sayılarıyla birlikte altı sorguyla bir kez yüklenir;
+menü, katalog filtreleri, ana sayfa seri listesi ve admin filtreleri aynı
+ağacı sorgusuz kullanır. Kategori/seri/model ya da ürün kaydedilince veya
+silinince sinyal sürümü artırır.
+
+Düğümler model örneği değildir; şablonlar için `pk` ve `name` taşırlar.
+"""
+from django.db.models import Count
+
+from .process_cache import ProcessCache
+
+TAXONOMY_VERSION_KEY = 'catalog:taxonomy-version'
+LEVELS = ('category', 'series', 'model')
+
+
+class TaxonomyNode:
+    __slots__ = ('pk', 'name', 'level', 'parent', 'children', 'product_count')
+
+    def __init__(self, pk, name, level, parent=None):
+        self.pk = pk
+        self.name = name
+        self.level = level
+        self.parent = parent
+        self.children = []
+        # bu düğüme doğrudan bağlı ürünler (Product.category/series/model)
+        self.product_count = 0
+
+    @property
+    def category(self):
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+
+    @property
+    def path(self):
+        """Kökten bu düğüme kadar düğümler."""
+        nodes, node = [], self
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        return nodes[::-1]
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return f'<TaxonomyNode {self.level}:{self.pk} {self.name}>'
+
+
+class TaxonomyTree:
+    def __init__(self, categories, series, models):
+        # her düzey ada göre sıralı (Category/SeriesCategory Meta.ordering ile aynı)
+        self.categories = categories
+        self.series = series
+        self.models = models
+        self.nodes = {
+            'category': {node.pk: node for node in categories},
+            'series': {node.pk: node for node in series},
+            'model': {node.pk: node for node in models},
+        }
+
+    def get(self, level, pk):
+        return self.nodes[level].get(pk)
+
+    def series_models(self):
+        """[(seri, [model, ...]), ...]; ana sayfadaki seri kartları için."""
+        return [(serie, serie.children) for serie in self.series]
+
+    def choices(self, level, parent=None):
+        """Düzeydeki düğümler; parent verilirse yalnızca onun altındakiler."""
+        if parent is not None:
+            return [node for node in self.nodes[level].values() if parent in node.path]
+        return {'category': self.categories, 'series': self.series, 'model': self.models}[level]
+
+
+def _load():
+    from .models import Category, ModelCategory, Product, SeriesCategory
+
+    categories = [TaxonomyNode(pk, name, 'category') for pk, name in
+                  Category.objects.order_by('name', 'pk').values_list('pk', 'name')]
+    by_category = {node.pk: node for node in categories}
+
+    series = []
+    for pk, name, category_id in SeriesCategory.objects.order_by('name', 'pk').values_list('pk', 'name', 'category_id'):
+        parent = by_category[category_id]
+        node = TaxonomyNode(pk, name, 'series', parent)
+        parent.children.append(node)
+        series.append(node)
+    by_series = {node.pk: node for node in series}
+
+    models = []
+    for pk, name, series_id in ModelCategory.objects.order_by('name', 'pk').values_list('pk', 'name', 'series_id'):
+        parent = by_series[series_id]
+        node = TaxonomyNode(pk, name, 'model', parent)
+        parent.children.append(node)
+        models.append(node)
+
+    tree = TaxonomyTree(categories, series, models)
+    for level in LEVELS:
+        counts = (Product.objects.filter(**{f'{level}__isnull': False})
+                  .values_list(level).annotate(count=Count('pk')).order_by())
+        for pk, count in counts:
+            node = tree.get(level, pk)
+            if node is not None:
+                node.product_count = count
+    return tree
+
+
+_cache = ProcessCache(TAXONOMY_VERSION_KEY, _load)
+taxonomy_version = _cache.version
+# sinyal alıcısı
+bump_taxonomy_version = _cache.bump
+
+
+def taxonomy_tree():
+    """Güncel TaxonomyTree; salt okunur kullanın."""
+    return _cache.get()
@@ -0,0 +1,35 @@
+from django import template
+from django.utils.html import format_html_join
+
+from core.staticfiles import bundle_urls
+
+register = template.Library()
+
+TAGS = {
+    '.css': '<link href="{}" rel="stylesheet">',
+    '.js': '<script src="{}"></script>',
+}
+
+
+@register.simple_tag
+def bundle(path):
+    """
+    {% bundle 'core/bundles/site.css' %}
+
+    Paketleyen depolama kullanılıyorsa tek bir özetli dosyaya, aksi halde
+    (geliştirme ortamı) paketteki dosyaların her birine etiket basar.
+    """
+    tag = TAGS['.css' if path.endswith('.css') else '.js']
+    return format_html_join('\n  ', tag, ((url,) for url in bundle_urls(path)))
+
+
+@register.simple_tag
+def preload_links(preloads):
+    """
+    {% preload_links preloads %}
+
+    core.preload.homepage_preloads() sözlüklerinden <link rel="preload"> etiketleri.
+    """
+    return format_html_join('\n  ', '<link rel="preload"{}>', (
+        (format_html_join('', ' {}="{}"', preload.items()),) for preload in preloads
+    ))
@@ -0,0 +1,39 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+from core.renditions import get_renditions, picture_html
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(image, sizes='100vw', alt='', css_class='', loading='lazy'):
+    """
+    {% responsive_image hero.image sizes="(max-width: 992px) 100vw, 50vw" css_class="img-fluid" %}
+
+    Türevler üretilmişse AVIF/WebP <source>'ları ve width/height'lı bir <img>
+    içeren <picture> basar; üretilmemişse orijinal dosyaya düz <img> döner.
+    """
+    if not image:
+        return ''
+    manifest = get_renditions(image.name)
+    if not manifest:
+        return format_html('<img src="{}" class="{}" alt="{}" loading="{}">', image.url, css_class, alt, loading)
+    return picture_html(manifest, sizes, alt, css_class, loading)
+
+
+@register.simple_tag
+def poster_url(image, width=1280):
+    """
+    <video poster="..."> tek adres alır; türevler varsa istenen genişliği
+    karşılayan en küçük WebP (yoksa yedek format) türevini, yoksa orijinali döner.
+    """
+    if not image:
+        return ''
+    manifest = get_renditions(image.name)
+    if not manifest:
+        return image.url
+    entries = manifest['formats'].get('webp') or manifest['formats'][manifest['fallback']]
+    name = next((name for entry_width, height, name in entries if entry_width >= width), entries[-1][2])
+    return default_storage.url(name)
@@ -0,0 +1,20 @@
+"""
+Test çalıştırıcısı (settings.TEST_RUNNER): testler boyunca cache LocMem'e
+alınır. Model kayıtlarının sinyalleri sürüm anahtarlarını yazar, bazı testler
+cache.clear() çağırır; geliştiricinin BASE_DIR/cache klasörüne dokunulmaz.
+"""
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._caches = override_settings(CACHES=TEST_CACHES)
+        self._caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._caches.disable()
+        super().teardown_test_environment(**kwargs)
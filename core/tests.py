@@ -1,3 +1,1623 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+import zipfile
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from PIL import Image
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.admin import site
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import Q
+from django.db.models.fields.files import ImageFieldFile
+from django.db import OperationalError, connection, connections
+from django.http import Http404, HttpResponse, QueryDict, StreamingHttpResponse
+from django.templatetags.static import static
+from django.template import Context, Template
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+
+from companyinfo.models import Branch
+from homepage.models import Business_partner, Faq, Hero_section, Statistics_area
+from jobs.models import Job
+from jobs.queue import run_job
+
+from .cache import bump_content_version, content_version, versioned_cache_page
+from .catalog import catalog_page, encode_cursor, filter_products, parse_filters
+from .media import serve as serve_media
+from .middleware import DatabaseRoutingMiddleware, InstrumentationMiddleware, ProfilingMiddleware
+from .models import (
+    Category, SeriesCategory, ModelCategory, Product, ProductImage, ProductVideo, ProfileCapture, StockMovement,
+    backfill_cover_images,
+)
+from .renditions import generate_renditions, get_renditions, optimize_original
+from .site_settings import site_settings
+from .stock import StockError, apply_movements
+from .taxonomy import taxonomy_tree
+from .search import highlight, index_products, ranked_ids
+from . import catalog_io, db, facets, instrumentation, preload, profiling, richtext, seed, video as video_pipeline, views
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def create_catalog(product_count):
+    category = Category.objects.create(name='Dolap')
+    series = SeriesCategory.objects.create(category=category, name='Predator')
+    model = ModelCategory.objects.create(category=category, series=series, name='P-100')
+    products = Product.objects.bulk_create([
+        Product(
+            name=f'Ürün {i:05d}', category=category, series=series, model=model,
+            width=60, height=180, depth=50, description='<p>Açıklama</p>', stock=i % 3,
+        )
+        for i in range(product_count)
+    ])
+    ProductImage.objects.bulk_create([
+        ProductImage(product=product, image=f'product_images/{product.pk}.jpg', is_cover=(product.pk % 2 == 0))
+        for product in products
+    ])
+    backfill_cover_images()
+    return products
+
+
+def page_content(response):
+    """Yanıt gövdesi; akışlı ana sayfanın sorguları gövde okunurken çalışır, sorgu ölçümü içinde çağrılmalı."""
+    if not response.streaming:
+        return response.content
+    if response.is_async:
+        async def collect():
+            return b''.join([chunk async for chunk in response.streaming_content])
+        return async_to_sync(collect)()
+    return response.getvalue()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class IndexQueryCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # firma/hero/hakkında süreç içi önbellekten gelir
+        site_settings()
+
+    # istatistik, değerler, sss, ürün, partner, şube, telefon
+    EXPECTED_QUERIES = 7
+
+    def assertIndexQueries(self, product_count):
+        create_catalog(product_count)
+        # kategori ağacı süreç içi önbellekten gelir
+        taxonomy_tree()
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            response = self.client.get(reverse('index'))
+            content = page_content(response)
+        self.assertEqual(response.status_code, 200)
+        return content
+
+    def test_small_catalog(self):
+        content = self.assertIndexQueries(10)
+        self.assertEqual(content.count(b'portfolio-item'), 10)
+
+    def test_large_catalog(self):
+        self.assertIndexQueries(10_000)
+
+    def test_cover_image_preferred_over_first_image(self):
+        product = create_catalog(1)[0]
+        cover = ProductImage.objects.create(product=product, image='product_images/cover.jpg', is_cover=True)
+        response = self.client.get(reverse('index'))
+        self.assertContains(response, cover.image.url)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AsyncViewTests(TestCase):
+    """Async görünümler async_to_sync ile çağrılır; ORM sorguları yine bu thread'de sayılır."""
+
+    def setUp(self):
+        cache.clear()
+        create_catalog(15)
+
+    def get(self, view, path, params=None, **headers):
+        return async_to_sync(view)(AsyncRequestFactory().get(path, params, headers=headers))
+
+    def test_async_index_matches_sync(self):
+        sync_content = page_content(self.client.get(reverse('index')))
+        bump_content_version()  # sayfa cache'i boşa düşsün
+        with self.assertNumQueries(IndexQueryCountTests.EXPECTED_QUERIES):
+            response = self.get(views.index_async, '/')
+            content = page_content(response)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content, sync_content)
+
+    def test_async_index_cache_and_conditional_get(self):
+        response = self.get(views.index_async, '/')
+        content = page_content(response)
+        with self.assertNumQueries(0):
+            cached = self.get(views.index_async, '/')
+        self.assertEqual(cached.content, content)
+        self.assertEqual(self.get(views.index_async, '/', if_none_match=response['ETag']).status_code, 304)
+
+    def test_async_catalog_views(self):
+        data = json.loads(self.get(views.catalog_api_async, '/api/katalog/', {'limit': 5, 'html': 1}).content)
+        self.assertEqual(data, self.client.get(reverse('catalog_api'), {'limit': 5, 'html': 1}).json())
+        self.assertEqual(self.get(views.catalog_async, '/katalog/', {'cursor': 'bozuk'}).status_code, 400)
+        self.assertContains(self.get(views.catalog_async, '/katalog/'), 'portfolio-item', count=12)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SiteSettingsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_loaded_once_per_version(self):
+        Hero_section.objects.create(title='Hoş geldiniz', description='-', youtube_url='https://youtu.be/abc123')
+        with self.assertNumQueries(3):
+            settings_ = site_settings()
+        with self.assertNumQueries(0):
+            self.assertIs(site_settings(), settings_)
+        self.assertEqual(settings_['hero'].youtube_embed, 'https://www.youtube.com/embed/abc123')
+        self.assertIsNone(settings_['company'])
+
+    def test_save_invalidates_after_commit(self):
+        hero = Hero_section.objects.create(title='Eski', description='-')
+        site_settings()
+        with self.captureOnCommitCallbacks(execute=True):
+            hero.title = 'Yeni'
+            hero.save()
+        self.assertEqual(site_settings()['hero'].title, 'Yeni')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            hero.delete()
+        self.assertIsNone(site_settings()['hero'])
+
+    def test_context_processor_and_admin(self):
+        Hero_section.objects.create(title='Başlık', description='-')
+        request = RequestFactory().get('/admin/')
+        request.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        site_settings()
+        with self.assertNumQueries(0):
+            self.assertFalse(site._registry[Hero_section].has_add_permission(request))
+
+        response = self.client.get(reverse('catalog'))
+        self.assertEqual(response.context['hero'].title, 'Başlık')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class IndexPageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_hit_served_without_queries(self):
+        create_catalog(3)
+        # akış sonuna kadar okununca saklanır
+        page_content(self.client.get(reverse('index')))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('index'))
+        self.assertContains(response, 'portfolio-item', count=3)
+
+    def test_unlisted_query_params_bypass_cache(self):
+        create_catalog(1)
+        page_content(self.client.get(reverse('index')))
+        for query in ({'utm_source': 'x'}, {'_bench': '1'}):
+            with self.subTest(query=query):
+                # ne cache'ten okunur ne de saklanır; ikinci istek de görünüme gider
+                for _ in range(2):
+                    with CaptureQueriesContext(connection) as captured:
+                        page_content(self.client.get(reverse('index'), query))
+                    self.assertTrue(captured.captured_queries)
+        with self.assertNumQueries(0):
+            page_content(self.client.get(reverse('index')))
+
+    def test_allowed_query_params_share_key(self):
+        calls = []
+
+        @versioned_cache_page('test', query_params=('page', 'sort'))
+        def view(request):
+            calls.append(request.get_full_path())
+            return HttpResponse('ok')
+
+        factory = RequestFactory()
+        for url in ('/?page=2&sort=ad', '/?sort=ad&page=2', '/?page=2&sort=ad&ref=x'):
+            view(factory.get(url))
+        self.assertEqual(calls, ['/?page=2&sort=ad', '/?page=2&sort=ad&ref=x'])
+
+    def test_save_and_delete_invalidate(self):
+        product = create_catalog(1)[0]
+        self.client.get(reverse('index'))
+        product.name = 'Yeni Ürün'
+        product.save()
+        self.assertContains(self.client.get(reverse('index')), 'Yeni Ürün')
+        product.delete()
+        self.assertNotContains(self.client.get(reverse('index')), 'Yeni Ürün')
+
+    def test_admin_list_editable_bumps_version(self):
+        stat = Statistics_area.objects.create(title='Müşteri', value=10, icon='bi bi-people')
+        User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.login(username='admin', password='pass')
+        before = content_version()
+        response = self.client.post(reverse('admin:homepage_statistics_area_changelist'), {
+            'form-TOTAL_FORMS': '1',
+            'form-INITIAL_FORMS': '1',
+            'form-0-id': str(stat.pk),
+            'form-0-value': '25',
+            'form-0-icon': 'bi bi-people',
+            '_save': 'Save',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertNotEqual(content_version(), before)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class IndexStreamingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        create_catalog(3)
+        site_settings()
+        taxonomy_tree()
+
+    def test_head_flushed_before_queries(self):
+        response = self.client.get(reverse('index'))
+        self.assertIn('>; rel=preload; as="style"', response['Link'])
+        chunks = iter(response.streaming_content)
+        with self.assertNumQueries(0):
+            head = next(chunks).decode()
+        self.assertIn('<link rel="preload" href="', head)
+        self.assertTrue(head.rstrip().endswith('</head>'))
+        with self.assertNumQueries(IndexQueryCountTests.EXPECTED_QUERIES):
+            rest = b''.join(chunks)
+        self.assertEqual(rest.count(b'portfolio-item'), 3)
+        # akış sonuna kadar okununca sayfa cache'e yazılır; isabet de Link başlığı taşır
+        with self.assertNumQueries(0):
+            cached = self.client.get(reverse('index'))
+        self.assertFalse(cached.streaming)
+        self.assertEqual(cached.content, head.encode() + rest)
+        self.assertEqual(cached['Link'], response['Link'])
+
+    def test_buffered_render_matches_stream(self):
+        streamed = page_content(self.client.get(reverse('index')))
+        bump_content_version()
+        with override_settings(HOMEPAGE_STREAMING=False):
+            response = self.client.get(reverse('index'))
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.content.split(), streamed.split())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class IndexConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        create_catalog(2)
+
+    def test_etag_returns_not_modified(self):
+        etag = self.client.get(reverse('index'))['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('index'), headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_modified_since_returns_not_modified(self):
+        last_modified = self.client.get(reverse('index'))['Last-Modified']
+        response = self.client.get(reverse('index'), headers={'if-modified-since': last_modified})
+        self.assertEqual(response.status_code, 304)
+
+    def test_timestampless_model_change_updates_validators(self):
+        first = self.client.get(reverse('index'))
+        Faq.objects.create(question='Teslimat?', answer='3 gün')
+        response = self.client.get(reverse('index'), headers={'if-none-match': first['ETag']})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_cold_cache_uses_model_timestamps(self):
+        cache.clear()
+        response = self.client.get(reverse('index'))
+        newest = Product.objects.latest('updated').updated
+        self.assertEqual(response['Last-Modified'], http_date(newest.timestamp()))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TaxonomyTreeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.dolap, self.raf = Category.objects.create(name='Dolap'), Category.objects.create(name='Raf')
+        # aynı isimli iki seri: isimle eşleştirme burada yanlış sonuç verirdi
+        self.dolap_pro = SeriesCategory.objects.create(category=self.dolap, name='Pro')
+        self.raf_pro = SeriesCategory.objects.create(category=self.raf, name='Pro')
+        self.d1 = ModelCategory.objects.create(category=self.dolap, series=self.dolap_pro, name='D-1')
+        ModelCategory.objects.create(category=self.raf, series=self.raf_pro, name='R-2')
+        ModelCategory.objects.create(category=self.raf, series=self.raf_pro, name='R-1')
+        Product.objects.create(name='Dolap', model=self.d1, width=1, height=1, depth=1, stock=1, description='')
+
+    def test_tree_loaded_once_with_counts(self):
+        with self.assertNumQueries(6):
+            tree = taxonomy_tree()
+        with self.assertNumQueries(0):
+            self.assertIs(taxonomy_tree(), tree)
+            grouped = tree.series_models()
+        self.assertEqual(
+            sorted((serie.pk, [model.name for model in models]) for serie, models in grouped),
+            [(self.dolap_pro.pk, ['D-1']), (self.raf_pro.pk, ['R-1', 'R-2'])],
+        )
+        node = tree.get('model', self.d1.pk)
+        self.assertEqual([n.name for n in node.path], ['Dolap', 'Pro', 'D-1'])
+        self.assertEqual((node.product_count, node.category.product_count), (1, 1))
+        self.assertEqual(tree.get('category', self.raf.pk).product_count, 0)
+        self.assertEqual([n.name for n in tree.choices('model', tree.get('category', self.raf.pk))], ['R-1', 'R-2'])
+
+    def test_save_invalidates_after_commit(self):
+        taxonomy_tree()
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name='Masa')
+        self.assertIn('Masa', [node.name for node in taxonomy_tree().categories])
+
+    def test_category_consistency(self):
+        # ürünün üst düzeyleri modelden, modelin kategorisi seriden türetilir
+        product = Product.objects.get()
+        self.assertEqual((product.series_id, product.category_id), (self.dolap_pro.pk, self.dolap.pk))
+        wrong = ModelCategory(category=self.dolap, series=self.raf_pro, name='X')
+        with self.assertRaises(ValidationError):
+            wrong.full_clean()
+        wrong.save()
+        self.assertEqual(wrong.category_id, self.raf.pk)
+
+        self.dolap_pro.category, self.dolap_pro.name = self.raf, 'Pro 2'
+        self.dolap_pro.save()
+        self.assertEqual(ModelCategory.objects.get(pk=self.d1.pk).category_id, self.raf.pk)
+        self.assertEqual(Product.objects.get().category_id, self.raf.pk)
+
+        ModelCategory.objects.filter(pk=self.d1.pk).update(category=self.dolap)
+        with self.assertRaises(CommandError):
+            call_command('check_taxonomy', stdout=io.StringIO())
+        call_command('check_taxonomy', '--fix', stdout=io.StringIO())
+        call_command('check_taxonomy', stdout=io.StringIO())
+        self.assertEqual(ModelCategory.objects.get(pk=self.d1.pk).category_id, self.raf.pk)
+
+    def test_menu_and_admin_filters_use_tree(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        taxonomy_tree()
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('admin:core_modelcategory_changelist'), {'category': self.raf.pk})
+        self.assertEqual({model.name for model in response.context['cl'].result_list}, {'R-1', 'R-2'})
+        self.assertFalse(any('core_category' in query['sql'] and 'core_modelcategory' not in query['sql']
+                             for query in captured.captured_queries))
+        response = self.client.get(reverse('admin:core_product_changelist'), {'category': self.dolap.pk})
+        series_filter = response.context['cl'].filter_specs[1]
+        self.assertEqual(series_filter.lookup_choices, [(self.dolap_pro.pk, 'Pro (1)')])
+
+        response = self.client.get(reverse('index'))
+        self.assertContains(response, f'?series={self.raf_pro.pk}">Pro <small>(0)</small>')
+
+
+class CoverImageTests(TestCase):
+    def setUp(self):
+        self.product = create_catalog(1)[0]
+        ProductImage.objects.filter(product=self.product).delete()
+
+    def test_first_image_used_until_cover_chosen(self):
+        first = ProductImage.objects.create(product=self.product, image='product_images/a.jpg', is_cover=False)
+        ProductImage.objects.create(product=self.product, image='product_images/b.jpg', is_cover=False)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.cover_image, first)
+
+    def test_new_cover_replaces_old_cover(self):
+        old = ProductImage.objects.create(product=self.product, image='product_images/a.jpg', is_cover=True)
+        new = ProductImage.objects.create(product=self.product, image='product_images/b.jpg', is_cover=True)
+        old.refresh_from_db()
+        self.product.refresh_from_db()
+        self.assertFalse(old.is_cover)
+        self.assertEqual(self.product.cover_image, new)
+
+    def test_delete_falls_back_to_remaining_image(self):
+        rest = ProductImage.objects.create(product=self.product, image='product_images/a.jpg', is_cover=False)
+        cover = ProductImage.objects.create(product=self.product, image='product_images/b.jpg', is_cover=True)
+        cover.delete()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.cover_image, rest)
+
+    def test_moving_image_refreshes_both_products(self):
+        rest = ProductImage.objects.create(product=self.product, image='product_images/a.jpg', is_cover=False)
+        cover = ProductImage.objects.create(product=self.product, image='product_images/b.jpg', is_cover=True)
+        other = Product.objects.create(name='Diğer', width=1, height=1, depth=1, stock=0)
+        cover.product = other
+        cover.save()
+        self.product.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.product.cover_image, other.cover_image), (rest, cover))
+
+    def test_bulk_delete_falls_back_to_remaining_image(self):
+        rest = ProductImage.objects.create(product=self.product, image='product_images/a.jpg', is_cover=False)
+        ProductImage.objects.create(product=self.product, image='product_images/b.jpg', is_cover=True)
+        # admin toplu silme QuerySet.delete() kullanır
+        ProductImage.objects.filter(is_cover=True).delete()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.cover_image, rest)
+        ProductImage.objects.all().delete()
+        self.product.refresh_from_db()
+        self.assertIsNone(self.product.cover_image)
+        # ürün silinirken görseller de silinir; alıcı hata vermemeli
+        ProductImage.objects.create(product=self.product, image='product_images/c.jpg', is_cover=True)
+        self.product.delete()
+        self.assertFalse(ProductImage.objects.exists())
+
+    def test_backfill(self):
+        image = ProductImage.objects.create(product=self.product, image='product_images/a.jpg', is_cover=False)
+        Product.objects.update(cover_image=None)
+        self.assertEqual(backfill_cover_images(), 1)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.cover_image, image)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RenditionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root, JOBS_EAGER=True))
+
+    def upload(self, size=(1000, 500), mode='RGB', fmt='JPEG', name='foto.jpg'):
+        buffer = io.BytesIO()
+        Image.new(mode, size, 'red').save(buffer, format=fmt)
+        return SimpleUploadedFile(name, buffer.getvalue())
+
+    def test_renditions_generated_on_save(self):
+        product = create_catalog(1)[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            image = ProductImage.objects.create(product=product, image=self.upload(), is_cover=True)
+        manifest = get_renditions(image.image.name)
+        self.assertEqual((manifest['width'], manifest['height']), (1000, 500))
+        self.assertEqual(manifest['fallback'], 'jpeg')
+        self.assertEqual([entry[0] for entry in manifest['formats']['jpeg']], [320, 640, 960, 1000])
+        self.assertIn('webp', manifest['formats'])
+
+        html = Template('{% load images %}{% responsive_image image sizes="50vw" alt="x" %}').render(
+            Context({'image': image.image}))
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn('width="1000" height="500"', html)
+        self.assertIn(f'{manifest["hash"]}-320.jpg 320w', html)
+
+    def test_transparent_source_falls_back_to_png(self):
+        partner = Business_partner.objects.create(
+            name='Aselsan', img_alt='logo', image=self.upload(mode='RGBA', fmt='PNG', name='logo.png'))
+        self.assertEqual(generate_renditions(partner.image)['fallback'], 'png')
+
+    def test_hero_preload_matches_first_source(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            hero = Hero_section.objects.create(title='Hoş geldiniz', description='-', image=self.upload(),
+                                               youtube_url='https://youtu.be/abc123')
+        hint = preload.homepage_preloads()[-1]
+        self.assertEqual((hint['as'], hint['imagesizes']), ('image', preload.HERO_IMAGE_SIZES))
+        html = Template('{% load images %}{% responsive_image image sizes=sizes %}').render(
+            Context({'image': hero.image, 'sizes': preload.HERO_IMAGE_SIZES}))
+        self.assertIn(f'<picture><source type="{hint["type"]}" srcset="{hint["imagesrcset"]}"', html)
+        self.assertIn(f'<{hint["href"]}>; rel=preload; as="image"; type="{hint["type"]}"',
+                      preload.link_header([hint]))
+
+    def test_tag_without_renditions_renders_plain_img(self):
+        html = Template('{% load images %}{% responsive_image image %}').render(
+            Context({'image': ImageFieldFile(None, ProductImage._meta.get_field('image'), 'product_images/yok.jpg')}))
+        self.assertEqual(html, '<img src="/media/product_images/yok.jpg" class="" alt="" loading="lazy">')
+
+
+    def test_exif_stripped_from_original(self):
+        buffer = io.BytesIO()
+        exif = Image.Exif()
+        exif[0x0110] = 'Telefon'
+        Image.new('RGB', (400, 300), 'blue').save(buffer, format='JPEG', exif=exif)
+        product = create_catalog(1)[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            image = ProductImage.objects.create(
+                product=product, image=SimpleUploadedFile('exif.jpg', buffer.getvalue()))
+        self.assertEqual(Job.objects.get().status, Job.DONE)
+        image.refresh_from_db()
+        with image.image.open('rb') as fp:
+            self.assertFalse(Image.open(fp).getexif())
+        self.assertEqual(image.image.name, 'product_images/exif.jpg')
+
+    def test_cached_index_refreshed_after_image_job(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (400, 300), 'blue').save(buffer, format='JPEG')
+        product = create_catalog(1)[0]
+        with override_settings(JOBS_EAGER=False), self.captureOnCommitCallbacks(execute=True):
+            ProductImage.objects.create(product=product, image=SimpleUploadedFile('kapak.jpg', buffer.getvalue()),
+                                        is_cover=True)
+        self.assertNotIn(b'<picture', page_content(self.client.get(reverse('index'))))
+        # işçi türevleri update() ile yazar; cache'lenmiş sayfa yine de yenilenmeli
+        with self.captureOnCommitCallbacks(execute=True):
+            run_job(Job.objects.get(name='images.process'))
+        self.assertIn(b'<picture', page_content(self.client.get(reverse('index'))))
+
+    def test_failed_optimize_keeps_original(self):
+        buffer = io.BytesIO()
+        exif = Image.Exif()
+        exif[0x0110] = 'Telefon'
+        Image.new('RGB', (40, 30), 'blue').save(buffer, format='JPEG', exif=exif)
+        name = default_storage.save('product_images/exif.jpg', ContentFile(buffer.getvalue()))
+        with mock.patch('core.renditions.os.replace', side_effect=OSError):
+            with self.assertRaises(OSError):
+                optimize_original(default_storage.open(name))
+        with default_storage.open(name) as fp:
+            self.assertEqual(fp.read(), buffer.getvalue())
+        self.assertEqual(os.listdir(os.path.dirname(default_storage.path(name))), ['exif.jpg'])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RichTextTests(TestCase):
+    SOURCE = (
+        '<h1>Başlık</h1><p>&nbsp;</p><p>Merhaba <strong>dünya</strong><br><br></p><script>alert(1)</script>'
+        '<p onclick="x" style="text-align:center;position:fixed">a<a href="javascript:alert(1)">b</a>'
+        '<a href="https://ornek.com">c</a></p><p><span> </span></p>'
+        '<figure class="media"><oembed url="https://www.youtube.com/watch?v=dQw4w9WgXcQ"></oembed></figure>'
+    )
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root, JOBS_EAGER=True))
+
+    def test_sanitises_and_normalises(self):
+        html, missing = richtext.render_description(self.SOURCE)
+        self.assertEqual(html, (
+            '<h2>Başlık</h2><p>Merhaba <strong>dünya</strong></p><p style="text-align:center">ab'
+            '<a href="https://ornek.com" rel="noopener nofollow" target="_blank">c</a></p>'
+            '<figure class="media"><div class="lite-youtube" data-video-id="dQw4w9WgXcQ">'
+            '<img src="https://i.ytimg.com/vi/dQw4w9WgXcQ/hqdefault.jpg" alt="" loading="lazy" decoding="async">'
+            '<button type="button" class="lite-youtube-play" aria-label="Videoyu oynat"></button></div></figure>'
+        ))
+        self.assertEqual(missing, [])
+        html = richtext.render_description('<img src="https://x.com/a.jpg" width="10" onerror="x"><img src="data:x">')[0]
+        self.assertEqual(html, '<img src="https://x.com/a.jpg" alt="" width="10" class="img-fluid" loading="lazy" decoding="async">')
+
+    def test_save_stores_html_and_skips_unchanged(self):
+        product = create_catalog(1)[0]
+        product.description = self.SOURCE
+        product.save()
+        product.refresh_from_db()
+        self.assertTrue(product.description_html.startswith('<h2>Başlık</h2>'))
+        self.assertEqual(product.description_hash, richtext.content_hash(self.SOURCE))
+        response = self.client.get(reverse('product_detail', args=[product.pk]))
+        self.assertContains(response, 'data-video-id="dQw4w9WgXcQ"')
+        self.assertNotContains(response, 'alert(1)')
+
+        Product.objects.filter(pk=product.pk).update(description_html='önbellek')
+        product.refresh_from_db()
+        product.save()
+        self.assertEqual(Product.objects.get(pk=product.pk).description_html, 'önbellek')
+        product.description = '<p>Yeni</p>'
+        product.save(update_fields=['description'])
+        self.assertEqual(Product.objects.get(pk=product.pk).description_html, '<p>Yeni</p>')
+
+    def test_uploaded_image_gets_renditions(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 400), 'red').save(buffer, format='JPEG')
+        name = default_storage.save('uploads/foto.jpg', ContentFile(buffer.getvalue()))
+        product = create_catalog(1)[0]
+        product.description = f'<figure class="image"><img src="/media/{name}" alt="Dolap"></figure>'
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+        self.assertIn('loading="lazy"', product.description_html)
+        html = Product.objects.get(pk=product.pk).description_html
+        self.assertTrue(html.startswith('<figure class="image"><picture><source type="image/'))
+        self.assertIn('width="800" height="400" class="img-fluid" alt="Dolap" loading="lazy"', html)
+
+    def test_rebuild_command(self):
+        products = create_catalog(5)
+        Product.objects.filter(pk=products[0].pk).update(
+            description_html='eski', description_hash=richtext.content_hash('<p>Açıklama</p>'))
+        for workers in (1, 2):
+            Product.objects.exclude(pk=products[0].pk).update(description_html='', description_hash='')
+            out = io.StringIO()
+            call_command('rebuild_descriptions', workers=workers, batch_size=2, stdout=out)
+            self.assertIn('4 ürün açıklaması', out.getvalue())
+            self.assertEqual(Product.objects.filter(description_html='<p>Açıklama</p>').count(), 4)
+        call_command('rebuild_descriptions', '--all', workers=1, stdout=io.StringIO())
+        self.assertEqual(Product.objects.get(pk=products[0].pk).description_html, '<p>Açıklama</p>')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProductVideoTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.product = create_catalog(1)[0]
+
+    def test_upload_enqueues_processing_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            video = ProductVideo.objects.create(product=self.product, video=SimpleUploadedFile('klip.mov', b'raw'))
+        job = Job.objects.get(name='videos.process')
+        self.assertEqual((job.key, job.payload), (f'videos.process:{video.pk}', {'pk': video.pk}))
+
+        ProductVideo.objects.filter(pk=video.pk).update(processed_source=video.video.name)
+        video.refresh_from_db()
+        with self.captureOnCommitCallbacks() as callbacks:
+            video.alt_text = 'Tanıtım'
+            video.save()
+        self.assertEqual(callbacks, [])
+
+    def test_detail_page_defers_video_download(self):
+        video = ProductVideo.objects.create(product=self.product, video='product_videos/klip.mov')
+        response = self.client.get(reverse('product_detail', args=[self.product.pk]))
+        self.assertContains(response, 'preload="none"')
+        self.assertContains(response, '<source src="/media/product_videos/klip.mov">')
+
+        ProductVideo.objects.filter(pk=video.pk).update(
+            web_video='product_videos/web/klip-720p.mp4', web_video_small='product_videos/web/klip-480p.mp4',
+            poster='product_videos/posters/klip.jpg', width=1280, height=720, duration=12.5,
+            processed_source='product_videos/klip.mov')
+        response = self.client.get(reverse('product_detail', args=[self.product.pk]))
+        self.assertContains(response, 'poster="/media/product_videos/posters/klip.jpg"')
+        self.assertContains(response, 'width="1280" height="720"')
+        self.assertContains(
+            response, '<source src="/media/product_videos/web/klip-480p.mp4" type="video/mp4" media="(max-width: 768px)">')
+        self.assertContains(response, '<source src="/media/product_videos/web/klip-720p.mp4" type="video/mp4">')
+        self.assertNotContains(response, 'klip.mov')
+
+    def test_transcode_arguments(self):
+        args = video_pipeline.transcode_args('in.mov', 'out.mp4', 720, 2500, has_audio=False)
+        self.assertIn('+faststart', args)
+        self.assertIn('scale=-2:min(720\\,trunc(ih/2)*2)', args)
+        self.assertNotIn('0:a:0', args)
+        self.assertEqual(args[-1], 'out.mp4')
+
+    @skipUnless(video_pipeline.is_available(), "ffmpeg kurulu değil")
+    def test_process_video_with_ffmpeg(self):
+        source = f'{settings.MEDIA_ROOT}/product_videos/telefon.mp4'
+        os.makedirs(os.path.dirname(source))
+        subprocess.run([
+            video_pipeline.FFMPEG_BINARY, '-v', 'error', '-f', 'lavfi', '-i', 'testsrc=size=1920x1080:rate=25',
+            '-f', 'lavfi', '-i', 'sine', '-t', '3', source,
+        ], check=True)
+        video = ProductVideo.objects.create(product=self.product, video='product_videos/telefon.mp4')
+
+        video_pipeline.process_video(video)
+        video.refresh_from_db()
+        self.assertTrue(video.is_processed)
+        self.assertEqual((video.width, video.height), (1280, 720))
+        self.assertAlmostEqual(video.duration, 3, delta=0.2)
+        self.assertEqual(video_pipeline.probe(video.web_video_small.path)['height'], 480)
+        self.assertTrue(video.poster.name.endswith('.jpg'))
+        self.assertEqual(video_pipeline.process_video(video), {})
+
+
+class CatalogTests(TestCase):
+    def setUp(self):
+        self.products = create_catalog(30)
+        # aynı isimli ürünler sayfa sınırında id ile ayrışmalı
+        Product.objects.filter(pk__in=[p.pk for p in self.products[10:14]]).update(name='Aynı İsim')
+
+    def walk(self, **params):
+        seen, url = [], reverse('catalog_api')
+        while url:
+            data = self.client.get(url, params if url == reverse('catalog_api') else None).json()
+            seen.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return seen
+
+    def test_keyset_pages_cover_catalog_once_in_order(self):
+        expected = list(Product.objects.order_by('name', 'id').values_list('pk', flat=True))
+        self.assertEqual(self.walk(limit=4), expected)
+
+    def test_filters(self):
+        Product.objects.filter(pk=self.products[0].pk).update(width=120, stock=5)
+        self.assertEqual(self.walk(width_min=100, in_stock=1), [self.products[0].pk])
+        self.assertEqual(len(self.walk(in_stock=1)), Product.objects.filter(stock__gt=0).count())
+
+    def test_deep_page_is_single_query(self):
+        last = Product.objects.order_by('-name', '-id')[1]
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('catalog_api'), {'cursor': encode_cursor(last)})
+        self.assertEqual(len(response.json()['results']), 1)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(reverse('catalog_api'), {'cursor': 'bozuk'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('catalog'), {'width_min': 'x'}).status_code, 400)
+        # 64 bite sığmayan kimlikler sorguya gitmeden reddedilir
+        overflow = encode_cursor(Product(pk=2 ** 63, name='Dolap'))
+        self.assertEqual(self.client.get(reverse('catalog_api'), {'cursor': overflow}).status_code, 400)
+        for key in ('category', 'series', 'model'):
+            with self.subTest(key=key):
+                self.assertEqual(self.client.get(reverse('catalog_api'), {key: str(2 ** 63)}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('catalog_facets_api'), {'category': str(-2 ** 64)}).status_code, 400)
+
+    def test_html_fragment_and_catalog_page(self):
+        data = self.client.get(reverse('catalog_api'), {'html': 1, 'limit': 5}).json()
+        self.assertEqual(data['html'].count('portfolio-item'), 5)
+        self.assertNotIn('html=', data['next'])
+        self.assertContains(self.client.get(reverse('catalog')), 'portfolio-item', count=12)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_homepage_shows_first_page_with_load_more(self):
+        content = page_content(self.client.get(reverse('index'))).decode()
+        self.assertEqual(content.count('portfolio-item'), 12)
+        self.assertIn('data-load-more="/api/katalog/?cursor=', content)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.products = create_catalog(12)
+        self.other = SeriesCategory.objects.create(category=self.products[0].category, name='Atlas')
+        for i, product in enumerate(self.products):
+            Product.objects.filter(pk=product.pk).update(
+                width=(30, 60, 90, 130)[i % 4], series=self.other if i % 3 == 0 else product.series)
+
+    def test_counts_match_filter_products(self):
+        series = self.products[0].series
+        cases = [
+            {}, {'width': '60-80'}, {'width': ['-40', '120-']}, {'availability': 'in_stock'},
+            {'series': [series.pk, self.other.pk], 'width': '80-100'}, {'series': self.other.pk, 'in_stock': '1'},
+            {'width_min': '50', 'depth': '50-60'},
+        ]
+        for params in cases:
+            with self.subTest(params=params):
+                query = QueryDict(mutable=True)
+                for key, value in params.items():
+                    query.setlist(key, value if isinstance(value, list) else [value])
+                filters = parse_filters(query)
+                total, counts = facets.facet_index().counts(filters)
+                self.assertEqual(total, filter_products(filters).count())
+                # seçeneğin sayısı = o seçenek eklenince (facet'in kendi seçimi yerine) çıkan sonuç
+                for value, count in counts['width'].items():
+                    narrowed = {**filters, 'width': [value]}
+                    self.assertEqual(count, filter_products(narrowed).count())
+
+    def test_incremental_sync_and_rebuild(self):
+        index = facets.facet_index()
+        product = self.products[1]
+        product.refresh_from_db()
+        with self.captureOnCommitCallbacks(execute=True):
+            product.stock = 0
+            product.save()
+            self.products[2].delete()
+        with self.assertNumQueries(2):
+            synced = facets.facet_index()
+        self.assertIs(synced, index)
+        self.assertEqual(synced.counts({})[0], 11)
+        self.assertEqual(synced.counts({'in_stock': True})[0], Product.objects.filter(stock__gt=0).count())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_movements([{'product': product.pk, 'delta': 4}])
+        self.assertEqual(facets.facet_index().counts({'in_stock': False})[0], Product.objects.filter(stock__lte=0).count())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.name = 'Atlas 2'
+            self.other.save()
+        self.assertIsNot(facets.facet_index(), index)
+        prune = Job.objects.get(name='facets.prune')
+        # sonraki değişiklikler temizliği ertelemez
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_movements([{'product': product.pk, 'delta': 1}])
+        self.assertEqual(Job.objects.get(name='facets.prune').run_after, prune.run_after)
+
+    def test_endpoint_and_sidebar(self):
+        facets.facet_index()
+        taxonomy_tree()
+        with self.assertNumQueries(0):
+            data = self.client.get(reverse('catalog_facets_api'), {'width': '60-80'}).json()
+        self.assertEqual(data['total'], 3)
+        width = next(group for group in data['facets'] if group['name'] == 'width')
+        self.assertEqual([(o['value'], o['count'], o['selected']) for o in width['options']],
+                         [('-40', 3, False), ('60-80', 3, True), ('80-100', 3, False), ('120-', 3, False)])
+        self.assertEqual(self.client.get(reverse('catalog_facets_api'), {'width': '1-2'}).status_code, 400)
+
+        response = self.client.get(reverse('catalog'), {'series': self.other.pk})
+        self.assertContains(response, '4 ürün')
+        self.assertContains(response, 'name="series" value="%d" id="facet-series-%d"' % (self.other.pk, self.other.pk))
+        self.assertContains(response, 'Atlas <span class="text-muted">(4)</span>', html=False)
+
+
+@skipUnless(connection.vendor == 'sqlite', "FTS5 yalnızca SQLite'ta")
+class ProductSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Endüstriyel Aydınlatma')
+        cls.series = SeriesCategory.objects.create(category=cls.category, name='Işık Serisi')
+        cls.lamp = Product.objects.create(
+            name='IŞIK Projektör', category=cls.category, series=cls.series, width=10, height=10, depth=10, stock=1,
+            description='<p>Güçlü <strong>aydınlatma</strong></p>')
+        cls.cabinet = Product.objects.create(
+            name='Çelik Dolap', category=cls.category, width=60, height=180, depth=50, stock=1,
+            description='<p>Işık geçirmez kapaklı dolap</p>')
+
+    def ids(self, query):
+        return [pk for pk, rank in ranked_ids(query)]
+
+    def test_turkish_folding_and_prefix(self):
+        for query in ('ışık', 'IŞIK', 'isik', 'Isı', 'işı'):
+            with self.subTest(query=query):
+                self.assertEqual(set(self.ids(query)), {self.lamp.pk, self.cabinet.pk})
+        self.assertEqual(self.ids('çeli'), [self.cabinet.pk])
+        self.assertEqual(self.ids('celik dol'), [self.cabinet.pk])
+        self.assertEqual(self.ids('"*)('), [])
+
+    def test_name_match_ranks_above_description(self):
+        self.assertEqual(self.ids('ışık')[0], self.lamp.pk)
+
+    def test_highlight(self):
+        self.assertEqual(highlight('IŞIK Projektör', ['isik']), '<mark>IŞIK</mark> Projektör')
+        self.assertEqual(highlight('<b> ışıklı', ['isik']), '&lt;b&gt; <mark>ışıklı</mark>')
+        snippet = highlight('kelime ' * 50 + 'ışık ' + 'son ' * 50, ['isik'], limit=40)
+        self.assertIn('<mark>ışık</mark>', snippet)
+        self.assertTrue(snippet.startswith('…') and snippet.endswith('…'))
+
+    def test_incremental_sync(self):
+        self.lamp.name = 'Halojen Lamba'
+        self.lamp.save()
+        self.assertEqual(self.ids('halojen'), [self.lamp.pk])
+        self.assertEqual(self.ids('projektör'), [])
+
+        self.series.name = 'Parlak Seri'
+        self.series.save()
+        self.assertEqual(self.ids('parlak'), [self.lamp.pk])
+
+        self.cabinet.delete()
+        self.assertEqual(self.ids('dolap'), [])
+
+    def test_moving_series_and_model_reindexes_new_category(self):
+        lighting = Category.objects.create(name='Betakat')
+        self.series.category = lighting
+        self.series.save()
+        self.assertEqual(self.ids('betakat'), [self.lamp.pk])
+        self.assertEqual(self.ids('endüstriyel'), [self.cabinet.pk])
+
+        other = SeriesCategory.objects.create(category=self.category, name='Gama')
+        model = ModelCategory.objects.create(category=lighting, series=self.series, name='M-1')
+        Product.objects.filter(pk=self.lamp.pk).update(model=model)
+        model.series = other
+        model.save()
+        self.assertEqual(self.ids('gama'), [self.lamp.pk])
+        self.assertEqual(self.ids('betakat'), [])
+
+    def test_bulk_created_products_need_reindex(self):
+        Product.objects.bulk_create([Product(name='Raf Sistemi', width=1, height=1, depth=1, stock=0, description='')])
+        self.assertEqual(self.ids('raf'), [])
+        index_products()
+        self.assertEqual(len(self.ids('raf')), 1)
+
+    def test_endpoint(self):
+        data = self.client.get(reverse('product_search'), {'q': 'isik'}).json()
+        self.assertEqual([item['id'] for item in data['results']], [self.lamp.pk, self.cabinet.pk])
+        self.assertEqual(data['results'][0]['name'], '<mark>IŞIK</mark> Projektör')
+        self.assertIn('<mark>Işık</mark>', data['results'][1]['snippet'])
+        self.assertEqual(self.client.get(reverse('product_search'), {'q': ''}).json()['results'], [])
+        self.assertEqual(self.client.get(reverse('product_search'), {'q': 'a', 'limit': 'x'}).status_code, 400)
+
+    def test_admin_search_uses_index(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('admin:core_product_changelist'), {'q': 'projek'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.lamp])
+        self.assertFalse(any('LIKE' in query['sql'] for query in captured.captured_queries))
+
+        Product.objects.filter(pk=self.cabinet.pk).update(sku='DL-900')
+        for term in ('DL-900', ' DL-900 '):
+            with self.subTest(term=term):
+                response = self.client.get(reverse('admin:core_product_changelist'), {'q': term})
+                self.assertEqual(list(response.context['cl'].result_list), [self.cabinet])
+
+
+class CatalogImportExportTests(TestCase):
+    HEADER = 'sku;name;category;series;model;width;height;depth;stock;description;images\n'
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+    def run_import(self, text, fmt='csv', **kwargs):
+        return catalog_io.import_catalog(io.BytesIO(text.encode()), fmt, **kwargs)
+
+    def test_import_creates_hierarchy_then_updates(self):
+        report = self.run_import(self.HEADER + (
+            'D-1;Çelik Dolap;Dolap;Predator;P-100;60;180;50;3;<p>Kilitli</p>;\n'
+            'D-2;Arşiv Dolabı;Dolap;Predator;P-200;"80,5";200;60;0;;\n'
+            'R-1;Raf;Raf;;;100;200;40;5;;\n'))
+        self.assertEqual((report.created, report.updated, report.errors), (3, 0, []))
+        self.assertEqual(Category.objects.count(), 2)
+        self.assertEqual(SeriesCategory.objects.get().name, 'Predator')
+        self.assertEqual(set(ModelCategory.objects.values_list('name', flat=True)), {'P-100', 'P-200'})
+        self.assertEqual(Product.objects.get(sku='D-2').width, 80.5)
+        self.assertEqual(ranked_ids('kilitli')[0][0], Product.objects.get(sku='D-1').pk)
+
+        version = content_version()
+        report = self.run_import(self.HEADER + 'D-1;Çelik Dolap XL;Dolap;Predator;P-100;60;180;50;7;;\n')
+        self.assertEqual((report.created, report.updated), (0, 1))
+        product = Product.objects.get(sku='D-1')
+        self.assertEqual((product.name, product.stock), ('Çelik Dolap XL', 7))
+        self.assertEqual(Product.objects.count(), 3)
+        self.assertEqual(ModelCategory.objects.count(), 2)
+        self.assertNotEqual(content_version(), version)
+
+    def test_row_errors_are_reported_and_skipped(self):
+        report = self.run_import(self.HEADER + (
+            ';Stok kodsuz;;;;1;1;1;1;;\n'
+            'X-1;Model tek başına;;;P-1;1;1;1;1;;\n'
+            'X-2;Bozuk ölçü;;;;geniş;1;1;1;;\n'
+            'X-3;Kesirli stok;;;;1;1;1;1,5;;\n'
+            'X-4;Geçerli;;;;1;1;1;1;;\n'))
+        self.assertEqual(report.created, 1)
+        self.assertEqual([error.line for error in report.errors], [2, 3, 4, 5])
+        self.assertIn('width', report.errors[2].message)
+
+        # tek bozuk hücre bütün içe aktarımı durdurmaz
+        report = self.run_import(self.HEADER + (
+            'Y-1;Nan genişlik;;;;nan;1;1;1;;\n'
+            'Y-2;Sonsuz;;;;1;inf;1;1;;\n'
+            'Y-3;Dev stok;;;;1;1;1;1e20;;\n'
+            'Y-4;Geçerli;;;;1;1;1;1;;\n'))
+        self.assertEqual((report.created, [error.line for error in report.errors]), (1, [2, 3, 4]))
+        lines = [{'sku': 'Y-5', 'name': 'Dev', 'width': 10 ** 400, 'height': 1, 'depth': 1, 'stock': 1},
+                 {'sku': 'Y-6', 'name': 'Dev', 'width': 1, 'height': 1, 'depth': 1, 'stock': 2 ** 63}]
+        report = self.run_import('\n'.join(json.dumps(line) for line in lines), 'jsonl')
+        self.assertEqual((report.created, [error.line for error in report.errors]), (0, [1, 2]))
+
+        with self.assertRaises(catalog_io.CatalogImportError):
+            self.run_import('sku,name\nA,B\n')
+
+    def test_windows_turkish_csv(self):
+        # Excel'in Türkçe Windows'ta kaydettiği CSV
+        data = (self.HEADER + 'Ş-1;Çelik Dolap;Dolap;;;1;1;1;1;;\n').encode('cp1254')
+        report = catalog_io.import_catalog(io.BytesIO(data), 'csv')
+        self.assertEqual((report.created, report.errors), (1, []))
+        self.assertEqual(Product.objects.get(sku='Ş-1').name, 'Çelik Dolap')
+
+        with self.assertRaisesMessage(catalog_io.CatalogImportError, 'UTF-8 olarak kaydedip'):
+            catalog_io.import_catalog(io.BytesIO('{"sku": "Ş"}'.encode('cp1254')), 'jsonl')
+
+    def test_jsonl_with_images_from_zip(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            for name in ('on.jpg', 'yan.jpg'):
+                image = io.BytesIO()
+                Image.new('RGB', (8, 8)).save(image, 'JPEG')
+                zf.writestr(f'gorseller/{name}', image.getvalue())
+        lines = [
+            {'sku': 'D-1', 'name': 'Dolap', 'width': 1, 'height': 1, 'depth': 1, 'stock': 1,
+             'images': 'on.jpg;yan.jpg;yok.jpg'},
+            'bozuk',
+        ]
+        text = '\n'.join(line if isinstance(line, str) else json.dumps(line) for line in lines)
+        with self.captureOnCommitCallbacks(execute=True):
+            report = self.run_import(text, 'jsonl', images=archive)
+        self.assertEqual((report.created, report.images), (1, 2))
+        self.assertEqual([str(error) for error in report.errors][0], 'satır 1: görsel bulunamadı: yok.jpg')
+        self.assertEqual(report.errors[1].line, 2)
+
+        product = Product.objects.get(sku='D-1')
+        cover = product.images.get(is_cover=True)
+        self.assertEqual(product.cover_image, cover)
+        self.assertTrue(cover.image.name.startswith('product_images/on'))
+        self.assertEqual(Job.objects.filter(name='images.process').count(), 2)
+
+        # tekrar içe aktarımda görseller çoğalmaz
+        archive.seek(0)
+        report = self.run_import(text, 'jsonl', images=archive)
+        self.assertEqual((report.updated, report.images, product.images.count()), (1, 0, 2))
+
+    def test_failed_batch_discards_taxonomy_and_files(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        Image.new('RGB', (8, 8)).save(os.path.join(folder, 'on.jpg'), 'JPEG')
+        text = self.HEADER + 'D-1;Dolap;Dolap;Predator;P-100;1;1;1;1;;on.jpg\n'
+        importer = catalog_io.CatalogImporter(catalog_io.ImageSource(folder))
+        with mock.patch.object(catalog_io.search, 'index_products', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                importer.run(catalog_io.read_rows(io.BytesIO(text.encode()), 'csv'))
+        self.assertEqual((importer.categories, importer.series, importer.models), ({}, {}, {}))
+        self.assertFalse(Category.objects.exists())
+        self.assertEqual(os.listdir(os.path.join(settings.MEDIA_ROOT, 'product_images')), [])
+
+        # aynı içe aktarıcı sonraki partide kategorileri yeniden oluşturur
+        report = importer.run(catalog_io.read_rows(io.BytesIO(text.encode()), 'csv'))
+        self.assertEqual((report.created, report.images), (1, 1))
+        self.assertEqual(Product.objects.get(sku='D-1').model.name, 'P-100')
+
+    def test_export_round_trip(self):
+        for product in create_catalog(3):
+            Product.objects.filter(pk=product.pk).update(sku=f'S-{product.pk}')
+        output = io.StringIO()
+        with self.assertNumQueries(2):
+            self.assertEqual(catalog_io.export_catalog(output, 'csv'), 3)
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        self.assertEqual(rows[0]['model'], 'P-100')
+        self.assertEqual(rows[0]['images'], f"{rows[0]['sku'].split('-')[1]}.jpg")
+
+        Product.objects.all().delete()
+        report = self.run_import(output.getvalue())
+        self.assertEqual((report.created, report.errors), (3, []))
+
+    def test_admin_import_and_export(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        upload = SimpleUploadedFile('urunler.csv', (self.HEADER + 'D-1;Dolap;;;;1;1;1;1;;\n;;;;;;;;;;x\n').encode())
+        response = self.client.post(reverse('admin:core_product_import'), {'file': upload})
+        self.assertContains(response, '1 ürün oluşturuldu')
+        self.assertEqual(len(response.context['report'].errors), 1)
+
+        response = self.client.post(reverse('admin:core_product_changelist'), {
+            'action': 'export_csv', '_selected_action': [Product.objects.get().pk],
+        })
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn('D-1,Dolap', body)
+
+
+class StockMovementTests(TestCase):
+    def setUp(self):
+        self.first, self.second = create_catalog(2)
+        Product.objects.filter(pk__in=[self.first.pk, self.second.pk]).update(stock=10)
+        Product.objects.filter(pk=self.first.pk).update(sku='D-1')
+
+    def stock(self, product):
+        return Product.objects.values_list('stock', flat=True).get(pk=product.pk)
+
+    def test_apply_movements_with_ledger_and_idempotency(self):
+        version = content_version()
+        result = apply_movements([
+            {'product': self.first.pk, 'delta': -3, 'reference': 'S-1'},
+            {'product': self.first.pk, 'delta': 5, 'reference': 'S-2'},
+            {'product': self.second.pk, 'delta': 2},
+            {'product': self.first.pk, 'delta': -3, 'reference': 'S-1'},
+        ])
+        self.assertEqual((result.applied, result.duplicates), (3, ['S-1']))
+        self.assertEqual((self.stock(self.first), self.stock(self.second)), (12, 12))
+        ledger = StockMovement.objects.filter(product=self.first).order_by('id')
+        self.assertEqual([(m.delta, m.balance_after) for m in ledger], [(-3, 7), (5, 12)])
+        self.assertNotEqual(content_version(), version)
+
+        result = apply_movements([{'product': self.first.pk, 'delta': -3, 'reference': 'S-1'}])
+        self.assertEqual((result.applied, self.stock(self.first)), (0, 12))
+
+    def test_batch_is_atomic_and_query_count_is_flat(self):
+        with self.assertRaises(StockError) as ctx:
+            apply_movements([{'product': self.first.pk, 'delta': 1}, {'product': self.second.pk, 'delta': -11}],
+                            allow_negative=False)
+        self.assertEqual(ctx.exception.product_ids, [self.second.pk])
+        self.assertEqual((self.stock(self.first), self.stock(self.second)), (10, 10))
+        self.assertFalse(StockMovement.objects.exists())
+
+        movements = [{'product': product.pk, 'delta': 1, 'reference': f'R-{i}-{product.pk}'}
+                     for i in range(500) for product in (self.first, self.second)]
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(apply_movements(movements).applied, 1000)
+        self.assertLess(len(captured), 15)
+        self.assertEqual(self.stock(self.first), 510)
+
+    @override_settings(WAREHOUSE_API_TOKEN='gizli')
+    def test_warehouse_endpoint(self):
+        url = reverse('stock_movements_api')
+        body = json.dumps({'movements': [
+            {'reference': 'WMS-1', 'sku': 'D-1', 'delta': -4, 'reason': 'sale'},
+            {'reference': 'WMS-2', 'product': self.second.pk, 'delta': 6},
+        ]})
+        self.assertEqual(self.client.post(url, body, content_type='application/json').status_code, 401)
+
+        auth = {'HTTP_AUTHORIZATION': 'Bearer gizli'}
+        response = self.client.post(url, body, content_type='application/json', **auth)
+        self.assertEqual(response.json(), {'applied': 2, 'duplicates': []})
+        response = self.client.post(url, body, content_type='application/json', **auth)
+        self.assertEqual(response.json(), {'applied': 0, 'duplicates': ['WMS-1', 'WMS-2']})
+        self.assertEqual((self.stock(self.first), self.stock(self.second)), (6, 16))
+        self.assertEqual(StockMovement.objects.get(reference='WMS-1').reason, StockMovement.SALE)
+
+        bad = json.dumps({'movements': [{'reference': 'WMS-3', 'sku': 'YOK', 'delta': 1}, {'delta': 1}]})
+        response = self.client.post(url, bad, content_type='application/json', **auth)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('0: stok kodu bulunamadı', response.json()['error'])
+        for item in ({'sku': ['D-1'], 'delta': 1}, {'product': 2 ** 63, 'delta': 1},
+                     {'product': self.first.pk, 'delta': 2 ** 63}):
+            with self.subTest(item=item):
+                bad = json.dumps({'movements': [{'reference': 'WMS-5', **item}]})
+                response = self.client.post(url, bad, content_type='application/json', **auth)
+                self.assertEqual(response.status_code, 400)
+        negative = json.dumps({'allow_negative': False, 'movements': [{'reference': 'WMS-4', 'sku': 'D-1', 'delta': -7}]})
+        response = self.client.post(url, negative, content_type='application/json', **auth)
+        self.assertEqual((response.status_code, response.json()['products']), (409, [self.first.pk]))
+
+    def test_admin_stock_is_readonly_and_bulk_adjust(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        response = self.client.get(reverse('admin:core_product_change', args=[self.first.pk]))
+        self.assertNotIn('stock', response.context['adminform'].form.fields)
+
+        changelist = reverse('admin:core_product_changelist')
+        selected = {'action': 'adjust_stock', '_selected_action': [self.first.pk, self.second.pk]}
+        response = self.client.post(changelist, selected)
+        self.assertTemplateUsed(response, 'admin/core/product/adjust_stock.html')
+        response = self.client.post(changelist, {**selected, 'apply': '1', 'delta': '-2', 'reason': 'sale'})
+        self.assertRedirects(response, changelist)
+        self.assertEqual((self.stock(self.first), self.stock(self.second)), (8, 8))
+        self.assertEqual(StockMovement.objects.filter(reason=StockMovement.SALE).count(), 2)
+
+        for delta in ('0', str(2 ** 63), str(-2 ** 31)):
+            with self.subTest(delta=delta):
+                response = self.client.post(changelist, {**selected, 'apply': '1', 'delta': delta, 'reason': 'sale'})
+                self.assertTemplateUsed(response, 'admin/core/product/adjust_stock.html')
+                self.assertIn('delta', response.context['form'].errors)
+        self.assertEqual(StockMovement.objects.count(), 2)
+
+    def test_catalog_import_records_stock_difference(self):
+        header = 'sku,name,width,height,depth,stock\n'
+        catalog_io.import_catalog(io.BytesIO((header + 'D-1,Dolap,1,1,1,4\nD-9,Yeni,1,1,1,2\n').encode()), 'csv')
+        ledger = {(m.product.sku, m.delta, m.balance_after) for m in StockMovement.objects.select_related('product')}
+        self.assertEqual(ledger, {('D-1', -6, 4), ('D-9', 2, 2)})
+
+    def test_catalog_import_keeps_concurrent_movement(self):
+        update_products = catalog_io.update_products
+
+        def racing_update(products, field_names):
+            # içe aktarım ürünleri okuduktan sonra depo hareketi gelir
+            apply_movements([{'product': self.first.pk, 'delta': -3, 'reference': 'WMS-9'}])
+            update_products(products, field_names)
+
+        header = 'sku,name,width,height,depth,stock\n'
+        with mock.patch.object(catalog_io, 'update_products', racing_update):
+            catalog_io.import_catalog(io.BytesIO((header + 'D-1,Dolap,1,1,1,4\n').encode()), 'csv')
+        self.assertEqual(self.stock(self.first), 4)
+        movements = list(StockMovement.objects.filter(product=self.first).order_by('pk').values_list('delta', 'balance_after'))
+        self.assertEqual(movements, [(-3, 7), (-3, 4)])
+
+
+@override_settings(CACHES=LOCMEM_CACHES, REQUEST_METRICS=True, REQUEST_METRICS_HEADER='staff')
+class InstrumentationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # varsayılan kapalı olduğundan CoreConfig.ready kancaları kurmamış olabilir
+        instrumentation.install()
+
+    def setUp(self):
+        cache.clear()
+        self.products = create_catalog(3)
+
+    def request(self):
+        request = RequestFactory().get('/olcum/')
+        request.user = User(is_staff=True)
+        return request
+
+    def run_request(self, view):
+        with self.assertLogs('core.metrics', 'INFO') as logs:
+            response = InstrumentationMiddleware(view)(self.request())
+        return response, json.loads(logs.records[-1].getMessage()), logs.records[-1]
+
+    def test_queries_templates_and_cache_are_recorded(self):
+        def view(request):
+            for product in self.products:
+                Product.objects.filter(pk=product.pk).first()
+            Product.objects.filter(pk=self.products[0].pk).first()
+            cache.set('olcum', 1)
+            cache.get('olcum')
+            cache.get('yok')
+            return HttpResponse(Template('{{ products|length }}').render(Context({'products': Product.objects.all()})))
+
+        response, record, log_record = self.run_request(view)
+        self.assertEqual(log_record.levelname, 'INFO')
+        self.assertEqual(response.content, b'3')
+        self.assertEqual((record['queries'], record['duplicates']), (5, 1))
+        self.assertEqual((record['cache_hits'], record['cache_misses']), (1, 1))
+        self.assertGreater(record['template_ms'], 0)
+        similar = record['similar'][0]
+        self.assertEqual(similar['count'], 4)
+        self.assertRegex(similar['origin'], r'^core/tests\.py:\d+ view$')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="5 queries, 1 dup", tpl;dur=[\d.]+, '
+                                                    r'cache;desc="1 hit, 1 miss", app;dur=[\d.]+$')
+
+    def test_template_origin_and_slow_request_explain(self):
+        template = Template('{% for product in products %}{{ product.name }}{% endfor %}')
+
+        def view(request):
+            return HttpResponse(template.render(Context({'products': Product.objects.all()})))
+
+        with override_settings(REQUEST_METRICS_SLOW_MS=0):
+            response, record, log_record = self.run_request(view)
+        self.assertEqual(log_record.levelname, 'WARNING')
+        slow = record['slow_queries'][0]
+        self.assertEqual(slow['origin'], '<unknown source>:1')
+        self.assertTrue(slow['plan'])
+
+    async def test_async_slow_request_is_logged(self):
+        # ASGI'de end() ve akış sonu event loop'ta çalışır; EXPLAIN orada veritabanına gidemez
+        async def view(request):
+            async def content():
+                yield str(await Product.objects.acount())
+            return StreamingHttpResponse(content())
+
+        with override_settings(REQUEST_METRICS_SLOW_MS=0):
+            with self.assertLogs('core.metrics', 'WARNING') as logs:
+                response = await self.async_client.get(reverse('catalog'))
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(json.loads(logs.records[-1].getMessage())['slow_queries'][0]['plan'])
+
+            with self.assertLogs('core.metrics', 'WARNING') as logs:
+                response = await InstrumentationMiddleware(view)(await sync_to_async(self.request)())
+                self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), b'3')
+            self.assertTrue(json.loads(logs.records[-1].getMessage())['slow_queries'][0]['plan'])
+
+    def test_header_only_for_staff_and_streaming_logged_at_end(self):
+        response = self.client.get(reverse('catalog'))
+        self.assertNotIn('Server-Timing', response)
+
+        def view(request):
+            return StreamingHttpResponse(str(Product.objects.count()) for _ in range(2))
+
+        response = InstrumentationMiddleware(view)(self.request())
+        self.assertIn('db;dur=0.00;desc="0 queries', response['Server-Timing'])
+        with self.assertLogs('core.metrics', 'INFO') as logs:
+            self.assertEqual(b''.join(response.streaming_content), b'33')
+        self.assertEqual(json.loads(logs.records[0].getMessage())['queries'], 2)
+
+
+class _Slow:
+    def __str__(self):
+        time.sleep(0.05)
+        return 'yavaş'
+
+
+@override_settings(REQUEST_PROFILE_RATE=0, REQUEST_PROFILE_INTERVAL_MS=1)
+class ProfilingTests(TestCase):
+    def slow_view(self, request):
+        return HttpResponse(Template('<p>{{ slow }}</p>').render(Context({'slow': _Slow()})))
+
+    def run_request(self, path='/profil/', **headers):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ProfilingMiddleware(self.slow_view)(RequestFactory().get(path, **headers))
+
+    def test_signed_token_selects_request(self):
+        response = self.run_request(HTTP_X_PROFILE_TOKEN=profiling.make_token('destek'))
+        capture = ProfileCapture.objects.get(pk=response[profiling.CAPTURE_HEADER])
+        self.assertEqual((capture.trigger, capture.label, capture.path), (ProfileCapture.TOKEN, 'destek', '/profil/'))
+        self.assertGreaterEqual(capture.duration_ms, 50)
+        self.assertGreater(capture.samples, 5)
+        stacks = profiling.load_stacks(capture.stacks)
+        self.assertEqual(sum(stacks.values()), capture.samples)
+        frames = [row['frame'] for row in profiling.hot_frames(stacks, order='total', templates=True)]
+        self.assertIn('{{ slow }} <unknown source>:1', frames)
+        self.assertTrue(any(frame.startswith('_Slow.__str__ (core/tests.py:')
+                            for frame in stacks.most_common(1)[0][0].split(';')))
+
+        speedscope = json.loads(profiling.speedscope(capture))
+        profile = speedscope['profiles'][0]
+        self.assertEqual(len(profile['samples']), len(profile['weights']))
+        self.assertAlmostEqual(profile['endValue'], capture.samples * capture.interval_ms, places=1)
+
+    def test_query_token_is_removed_and_invalid_tokens_ignored(self):
+        token = profiling.make_token()
+        response = self.run_request(f'/profil/?sayfa=2&{profiling.TOKEN_PARAM}={token}')
+        self.assertIn(profiling.CAPTURE_HEADER, response)
+        request = RequestFactory().get(f'/profil/?sayfa=2&{profiling.TOKEN_PARAM}={token}')
+        profiling.select(request)
+        self.assertEqual(list(request.GET), ['sayfa'])
+
+        response = self.run_request(HTTP_X_PROFILE_TOKEN=token + 'x')
+        self.assertNotIn(profiling.CAPTURE_HEADER, response)
+        with override_settings(REQUEST_PROFILE_TOKEN_MAX_AGE=-1):
+            self.run_request(HTTP_X_PROFILE_TOKEN=token)
+        self.assertEqual(ProfileCapture.objects.count(), 1)
+
+    def test_rate_sampling_and_pruning(self):
+        with override_settings(REQUEST_PROFILE_RATE=1, REQUEST_PROFILE_KEEP=2, JOBS_EAGER=True):
+            for _ in range(3):
+                response = self.run_request()
+        self.assertNotIn(profiling.CAPTURE_HEADER, response)
+        self.assertEqual(list(ProfileCapture.objects.values_list('trigger', flat=True)), [ProfileCapture.RATE] * 2)
+
+    def test_streaming_body_is_sampled(self):
+        def view(request):
+            return StreamingHttpResponse(str(_Slow()) for _ in range(2))
+
+        request = RequestFactory().get('/profil/', HTTP_X_PROFILE_TOKEN=profiling.make_token())
+        response = ProfilingMiddleware(view)(request)
+        capture = ProfileCapture.objects.get(pk=response[profiling.CAPTURE_HEADER])
+        self.assertEqual(capture.samples, 0)
+        self.assertEqual(b''.join(response.streaming_content), 'yavaşyavaş'.encode())
+        capture.refresh_from_db()
+        self.assertGreaterEqual(capture.duration_ms, 100)
+        self.assertIn('_Slow.__str__', capture.stacks)
+
+    def test_admin_groups_and_downloads(self):
+        capture = ProfileCapture.objects.get(
+            pk=self.run_request(HTTP_X_PROFILE_TOKEN=profiling.make_token())[profiling.CAPTURE_HEADER])
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        response = self.client.get(reverse('admin:core_profilecapture_changelist'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['view_groups'][0]['count'], 1)
+        response = self.client.get(reverse('admin:core_profilecapture_change', args=[capture.pk]))
+        self.assertContains(response, '{{ slow }} &lt;unknown source&gt;:1')
+        response = self.client.get(reverse('admin:core_profilecapture_speedscope', args=[capture.pk]))
+        self.assertEqual(json.loads(response.content)['profiles'][0]['type'], 'sampled')
+        response = self.client.get(reverse('admin:core_profilecapture_collapsed', args=[capture.pk]))
+        self.assertEqual(response.content.decode(), capture.stacks)
+
+
+class SQLiteProductionTests(SimpleTestCase):
+    databases = {'default'}
+
+    def open(self, alias):
+        # ayrı dosyada, test bağlantılarından bağımsız bir bağlantı
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        wrapper = type(connections[db.WRITE_ALIAS])({**connection.settings_dict, 'NAME': os.path.join(directory, 'db.sqlite3')}, alias)
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        return wrapper.connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+    @skipUnless(connection.vendor == 'sqlite', "yalnızca SQLite")
+    def test_pragmas_applied_on_connect(self):
+        with override_settings(SQLITE_PRODUCTION=True):
+            writer, reader = self.open(db.WRITE_ALIAS), self.open(db.READ_ALIAS)
+        self.assertEqual(self.pragma(writer, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(writer, 'synchronous'), 1)
+        self.assertEqual(self.pragma(writer, 'busy_timeout'), db.DEFAULT_PRAGMAS['busy_timeout'])
+        self.assertEqual(self.pragma(writer, 'query_only'), 0)
+        self.assertEqual(self.pragma(reader, 'query_only'), 1)
+        with self.assertRaises(OperationalError):
+            with reader.cursor() as cursor:
+                cursor.execute('CREATE TABLE deneme (id INTEGER)')
+
+        with override_settings(SQLITE_PRODUCTION=False):
+            self.assertEqual(self.pragma(self.open(db.WRITE_ALIAS), 'journal_mode'), 'delete')
+
+    def test_router_sends_public_reads_to_replica(self):
+        router = db.ReadWriteRouter()
+        self.assertEqual(router.db_for_read(Product), db.READ_ALIAS)
+        self.assertEqual(router.db_for_write(Product), db.WRITE_ALIAS)
+        with db.writer():
+            self.assertEqual(router.db_for_read(Product), db.WRITE_ALIAS)
+        self.assertFalse(router.allow_migrate(db.READ_ALIAS, 'core'))
+
+        seen = {}
+
+        def view(request):
+            seen[request.method, request.path] = router.db_for_read(Product)
+            return HttpResponse()
+
+        with override_settings(SQLITE_PRODUCTION=True):
+            middleware = DatabaseRoutingMiddleware(view)
+        factory = RequestFactory()
+        middleware(factory.get('/katalog/'))
+        middleware(factory.post('/iletisim/'))
+        middleware(factory.get(reverse('admin:core_product_changelist')))
+        self.assertEqual(seen, {
+            ('GET', '/katalog/'): db.READ_ALIAS,
+            ('POST', '/iletisim/'): db.WRITE_ALIAS,
+            ('GET', reverse('admin:core_product_changelist')): db.WRITE_ALIAS,
+        })
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+    def test_seed_is_deterministic_and_repeatable(self):
+        summary = seed.seed(10, branches=2, renditions=False)
+        self.assertEqual(summary['products'], 10)
+        self.assertEqual(summary['branches'], 2)
+        products = Product.objects.filter(sku__startswith=seed.SKU_PREFIX)
+        self.assertFalse(products.filter(cover_image__isnull=True).exists())
+        self.assertTrue(all(product.description_html for product in products))
+        names = list(products.order_by('sku').values_list('name', flat=True))
+
+        # ikinci çalıştırma ağacı yeniden kullanır, stok kodları devam eder
+        seed.seed(5, branches=2, renditions=False)
+        self.assertEqual(Product.objects.filter(sku__startswith=seed.SKU_PREFIX).count(), 15)
+        self.assertEqual(Branch.objects.count(), 2)
+
+        real = Category.objects.create(name='Gerçek Kategori')
+        seed.clear()
+        self.assertFalse(Product.objects.exists())
+        self.assertEqual(list(Category.objects.all()), [real])
+        seed.seed(10, branches=2, renditions=False)
+        self.assertEqual(list(Product.objects.order_by('sku').values_list('name', flat=True)), names)
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('seed_catalog', scale='small', branches=1, no_renditions=True, stdout=out)
+        self.assertEqual(Product.objects.count(), seed.SCALES['small'])
+        self.assertIn('10', out.getvalue())
+
+
+@skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN yalnızca SQLite'ta")
+class QueryPlanTests(TestCase):
+    """
+    Sık çalışan sorguların planı tam tablo taramasına ya da geçici B-tree
+    sıralamasına düşerse test başarısız olur. Her SCAN adımı (indeksli olsa da)
+    taramadır; yalnızca sıralama için bilerek yürünen indeksler çağrıda
+    scans=[(Model, alanlar), ...] ile izin listesine alınır.
+    """
+    FULL_SCAN = re.compile(r'^SCAN ')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = create_catalog(5)[0]
+
+    def plan(self, query):
+        # query: QuerySet ya da yakalanmış (parametreleri gömülü) SQL
+        sql, params = (query, ()) if isinstance(query, str) else query.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [row[3] for row in cursor.fetchall()]
+
+    def index_scans(self, model, fields, condition=None):
+        index = next(index for index in model._meta.indexes
+                     if index.fields == list(fields) and index.condition == condition)
+        return {f'SCAN {model._meta.db_table} USING {kind} {index.name}' for kind in ('INDEX', 'COVERING INDEX')}
+
+    def assertIndexedPlan(self, query, scans=()):
+        allowed = set().union(*(self.index_scans(*scan) for scan in scans))
+        plan = self.plan(query)
+        for step in plan:
+            self.assertNotIn('TEMP B-TREE', step, plan)
+            if step not in allowed:
+                self.assertIsNone(self.FULL_SCAN.match(step), plan)
+
+    def test_catalog_pages(self):
+        # ilk sayfa isim sırasıyla indeksten LIMIT'e kadar okunur; imleçli sayfalar SEARCH
+        by_name = (Product, ['name', 'id'])
+        in_stock = (Product, ['name', 'id'], Q(stock__gt=0))
+        cases = [({}, [by_name]), ({'category': 1}, []), ({'series': 1}, []), ({'model': 1}, []),
+                 ({'in_stock': True}, [in_stock]), ({'width_min': 10, 'width_max': 100}, [by_name])]
+        for filters, scans in cases:
+            for cursor in (None, encode_cursor(self.product)):
+                with self.subTest(filters=filters, cursor=cursor):
+                    with CaptureQueriesContext(connection) as captured:
+                        catalog_page(filters, cursor)
+                    self.assertIndexedPlan(captured.captured_queries[0]['sql'], scans if cursor is None else ())
+
+    def test_product_images(self):
+        self.assertIndexedPlan(self.product.images.order_by('-is_cover', 'id')[:1])
+        self.assertIndexedPlan(self.product.images.all())
+        # tüm ürünlerin görselleri (dışa aktarım) sıralı indeksten okunur
+        self.assertIndexedPlan(ProductImage.objects.order_by('product_id', '-is_cover', 'id'),
+                               scans=[(ProductImage, ['product', '-is_cover', 'id'])])
+
+    def test_taxonomy_lists(self):
+        self.assertIndexedPlan(SeriesCategory.objects.all(), scans=[(SeriesCategory, ['name'])])
+        self.assertIndexedPlan(ModelCategory.objects.order_by('name'), scans=[(ModelCategory, ['name'])])
+        self.assertIndexedPlan(ModelCategory.objects.filter(series_id=1).order_by('name'))
+
+    def test_product_admin_changelist(self):
+        request = RequestFactory().get('/admin/core/product/')
+        request.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        changelist = site._registry[Product].get_changelist_instance(request)
+        self.assertIndexedPlan(changelist.get_queryset(request)[:100], scans=[(Product, ['name', 'id'])])
+        self.assertIndexedPlan(changelist.get_queryset(request).filter(series_id=1)[:100])
+
+
+class StaticPipelineTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        storages = {**settings.STORAGES, 'staticfiles': {'BACKEND': 'core.staticfiles.CompressedManifestStaticFilesStorage'}}
+        cls.enterClassContext(override_settings(
+            STATIC_ROOT=cls.static_root, STORAGES=storages, SERVE_STATIC_FILES=True,
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        ))
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def get(self, path, **headers):
+        return self.client.get(static(path), headers=headers)
+
+    def test_bundle_rewrites_relative_urls(self):
+        with staticfiles_storage.open(staticfiles_storage.stored_name('core/bundles/site.css')) as fp:
+            css = fp.read().decode()
+        self.assertRegex(css, r'url\("\.\./vendor/bootstrap-icons/fonts/bootstrap-icons\.[0-9a-f]{12}\.woff2\?')
+        self.assertNotIn('sourceMappingURL', css)
+
+    def test_template_uses_hashed_bundles(self):
+        html = Template("{% load bundles %}{% bundle 'core/bundles/vendor.js' %}").render(Context())
+        self.assertRegex(html, r'^<script src="/static/core/bundles/vendor\.[0-9a-f]{12}\.js"></script>$')
+
+    def test_serves_precompressed_with_immutable_cache(self):
+        response = self.get('core/bundles/site.css', accept_encoding='br;q=1.0, gzip;q=0.8')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertTrue(response['Content-Type'].startswith('text/css'))
+        body = gzip.decompress(b''.join(response.streaming_content))
+        self.assertIn(b'bootstrap', body)
+
+        plain = self.get('core/bundles/site.css', accept_encoding='gzip;q=0')
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(b''.join(plain.streaming_content), body)
+
+    def test_unhashed_names_get_short_cache_and_304(self):
+        response = self.client.get('/static/core/bundles/site.css')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+        response = self.client.get('/static/core/bundles/site.css', headers={'if-modified-since': response['Last-Modified']})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get('/static/yok.css').status_code, 404)
+
+
+class BundleTagTests(SimpleTestCase):
+    def test_development_storage_renders_each_source(self):
+        html = Template("{% load bundles %}{% bundle 'core/bundles/site.js' %}").render(Context())
+        self.assertEqual(html, '<script src="/static/core/js/main.js"></script>\n  '
+                               '<script src="/static/core/js/catalog.js"></script>')
+
+
+class MediaServeTests(SimpleTestCase):
+    DATA = bytes(range(256)) * 40
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        with open(f'{self.root}/video.mp4', 'wb') as fp:
+            fp.write(self.DATA)
+        with open(f'{self.root}/logo.svg', 'wb') as fp:
+            fp.write(b'<svg></svg>')
+
+    def get(self, path='video.mp4', **headers):
+        return serve_media(RequestFactory().get(f'/media/{path}', headers=headers), path, self.root)
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_file(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'video/mp4')
+        self.assertEqual(response['Content-Length'], str(len(self.DATA)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(self.body(response), self.DATA)
+
+    def test_ranges(self):
+        cases = {
+            'bytes=100-199': (100, 199),
+            'bytes=10000-': (10000, len(self.DATA) - 1),
+            'bytes=-24': (len(self.DATA) - 24, len(self.DATA) - 1),
+            'bytes=10230-99999': (10230, len(self.DATA) - 1),
+        }
+        for header, (start, end) in cases.items():
+            with self.subTest(header=header):
+                response = self.get(range=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/{len(self.DATA)}')
+                self.assertEqual(response['Content-Length'], str(end - start + 1))
+                self.assertEqual(self.body(response), self.DATA[start:end + 1])
+
+    def test_unsatisfiable_and_multiple_ranges(self):
+        response = self.get(range='bytes=20000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.DATA)}')
+        self.assertEqual(self.get(range='bytes=0-1,5-6').status_code, 200)
+
+    def test_if_range_and_conditional_get(self):
+        etag = self.get()['ETag']
+        self.assertEqual(self.get(range='bytes=0-9', if_range=etag).status_code, 206)
+        self.assertEqual(self.get(range='bytes=0-9', if_range='"eski"').status_code, 200)
+        self.assertEqual(self.get(if_none_match=etag).status_code, 304)
+
+    def test_content_type_enforcement(self):
+        response = self.get('logo.svg')
+        self.assertTrue(response['Content-Disposition'].startswith('attachment'))
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+        with self.assertRaises(Http404):
+            self.get('../etc/passwd')
+
+    async def test_asgi_streams_asynchronously(self):
+        request = AsyncRequestFactory().get('/media/video.mp4', headers={'range': 'bytes=5-1004'})
+        response = serve_media(request, 'video.mp4', self.root)
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(body, self.DATA[5:1005])
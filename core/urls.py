@@ -1,12 +1,20 @@
 
-from django.urls import path, include
-from django.conf.urls.static import static
 from django.conf import settings
+from django.urls import path, include
 from . import views
 
-urlpatterns = [
-    path('',views.index, name='index'),
-]
+# ASGI sunucusunda (uvicorn) async görünümler, WSGI'de (gunicorn) senkron olanlar
+if settings.ASYNC_VIEWS:
+    index, catalog, catalog_api = views.index_async, views.catalog_async, views.catalog_api_async
+else:
+    index, catalog, catalog_api = views.index, views.catalog, views.catalog_api
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+urlpatterns = [
+    path('', index, name='index'),
+    path('katalog/', catalog, name='catalog'),
+    path('urun/<int:pk>/', views.product_detail, name='product_detail'),
+    path('api/katalog/', catalog_api, name='catalog_api'),
+    path('api/katalog/facetler/', views.catalog_facets_api, name='catalog_facets_api'),
+    path('api/arama/', views.product_search, name='product_search'),
+    path('api/stok/hareketler/', views.stock_movements_api, name='stock_movements_api'),
+]
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""
+Ürün videoları için çevrimdışı işleme: yerel ffmpeg ile web'e uygun (faststart)
+H.264/AAC MP4 kopyalar, bir kapak karesi (poster) ve süre/boyut bilgisi üretilir.
+
+Admin isteği içinde çalışmaz; kayıt sonrası 'videos.process' işi kuyruğa
+girer (bkz. core.tasks) ya da `manage.py process_videos` ile toplu çalıştırılır.
+"""
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from .renditions import generate_for_instance
+
+logger = logging.getLogger(__name__)
+
+FFMPEG_BINARY = getattr(settings, 'FFMPEG_BINARY', 'ffmpeg')
+FFPROBE_BINARY = getattr(settings, 'FFPROBE_BINARY', 'ffprobe')
+# (alan, en fazla yükseklik, video bit hızı); kaynak daha küçükse büyütülmez
+VIDEO_LADDER = getattr(settings, 'VIDEO_LADDER', (
+    ('web_video', 720, 2500),
+    ('web_video_small', 480, 1000),
+))
+AUDIO_BITRATE = 128
+POSTER_AT_SECONDS = 1.0
+TIMEOUT = getattr(settings, 'FFMPEG_TIMEOUT', 60 * 30)
+
+
+class VideoProcessingError(RuntimeError):
+    pass
+
+
+def is_available():
+    return bool(shutil.which(FFMPEG_BINARY) and shutil.which(FFPROBE_BINARY))
+
+
+def _run(args):
+    try:
+        result = subprocess.run(args, capture_output=True, timeout=TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        raise VideoProcessingError(f"{args[0]} çalıştırılamadı: {exc}") from exc
+    if result.returncode != 0:
+        raise VideoProcessingError(result.stderr.decode(errors='replace').strip()[-2000:])
+    return result.stdout
+
+
+def probe(path):
+    """{'duration', 'width', 'height', 'has_audio'}; genişlik/yükseklik döndürme uygulanmış haliyle."""
+    output = _run([
+        FFPROBE_BINARY, '-v', 'error', '-print_format', 'json',
+        '-show_entries', 'format=duration:stream=codec_type,width,height:stream_side_data=rotation',
+        path,
+    ])
+    data = json.loads(output or b'{}')
+    streams = data.get('streams', [])
+    video = next((s for s in streams if s.get('codec_type') == 'video'), None)
+    if video is None:
+        raise VideoProcessingError(f"Video akışı bulunamadı: {path}")
+    width, height = video.get('width'), video.get('height')
+    rotation = next((int(side['rotation']) for side in video.get('side_data_list', []) if 'rotation' in side), 0)
+    if abs(rotation) % 180 == 90:
+        # telefon videoları: ffmpeg çıktıda döndürmeyi uygular
+        width, height = height, width
+    duration = data.get('format', {}).get('duration')
+    return {
+        'duration': float(duration) if duration else None,
+        'width': width,
+        'height': height,
+        'has_audio': any(s.get('codec_type') == 'audio' for s in streams),
+    }
+
+
+def transcode_args(source, destination, max_height, bitrate, has_audio=True):
+    args = [
+        FFMPEG_BINARY, '-y', '-v', 'error', '-i', source,
+        '-map', '0:v:0',
+        # çift sayılı genişlik (yuv420p), kaynak küçükse büyütme yok
+        '-vf', f'scale=-2:min({max_height}\\,trunc(ih/2)*2)',
+        '-c:v', 'libx264', '-preset', 'slow', '-profile:v', 'high', '-pix_fmt', 'yuv420p',
+        '-b:v', f'{bitrate}k', '-maxrate', f'{bitrate * 3 // 2}k', '-bufsize', f'{bitrate * 2}k',
+    ]
+    if has_audio:
+        args += ['-map', '0:a:0', '-c:a', 'aac', '-b:a', f'{AUDIO_BITRATE}k', '-ac', '2']
+    # moov atomu başa: oynatma tüm dosya inmeden başlar
+    args += ['-movflags', '+faststart', destination]
+    return args
+
+
+def poster_args(source, destination, at):
+    return [
+        FFMPEG_BINARY, '-y', '-v', 'error', '-ss', f'{at:.3f}', '-i', source,
+        '-frames:v', '1', '-q:v', '3', destination,
+    ]
+
+
+def _local_copy(field_file, directory):
+    """Depolama yerel değilse kaynağı geçici dizine indirir."""
+    try:
+        return field_file.path
+    except NotImplementedError:
+        path = os.path.join(directory, os.path.basename(field_file.name))
+        with field_file.open('rb') as source, open(path, 'wb') as target:
+            shutil.copyfileobj(source, target)
+        return path
+
+
+def _store(path, name, storage):
+    if storage.exists(name):
+        storage.delete(name)
+    with open(path, 'rb') as fp:
+        return storage.save(name, File(fp))
+
+
+def _delete(name, storage):
+    if name and storage.exists(name):
+        storage.delete(name)
+
+
+def process_video(video, force=False, storage=default_storage):
+    """
+    ProductVideo için web kopyalarını ve posteri üretir, alanları günceller.
+    Aynı kaynak daha önce işlendiyse (force verilmedikçe) hiçbir şey yapmaz.
+    Güncellenen alanları sözlük olarak döner.
+    """
+    if not video.video:
+        return {}
+    if video.is_processed and not force:
+        return {}
+    if not is_available():
+        raise VideoProcessingError("ffmpeg/ffprobe bulunamadı (FFMPEG_BINARY / FFPROBE_BINARY).")
+
+    stem = os.path.splitext(os.path.basename(video.video.name))[0]
+    with tempfile.TemporaryDirectory() as directory:
+        source = _local_copy(video.video, directory)
+        info = probe(source)
+
+        fields = {'duration': info['duration']}
+        for field_name, max_height, bitrate in VIDEO_LADDER:
+            output = os.path.join(directory, f'{stem}-{max_height}p.mp4')
+            _run(transcode_args(source, output, max_height, bitrate, info['has_audio']))
+            _delete(getattr(video, field_name).name, storage)
+            fields[field_name] = _store(output, f'product_videos/web/{stem}-{max_height}p.mp4', storage)
+            if field_name == VIDEO_LADDER[0][0]:
+                fields.update({key: value for key, value in probe(output).items() if key in ('width', 'height')})
+
+        poster = os.path.join(directory, f'{stem}.jpg')
+        at = min(POSTER_AT_SECONDS, (info['duration'] or 0) / 2)
+        _run(poster_args(source, poster, at))
+        _delete(video.poster.name, storage)
+        fields['poster'] = _store(poster, f'product_videos/posters/{stem}.jpg', storage)
+
+    fields['processed_source'] = video.video.name
+    # update(): post_save tetiklenmez, iş tekrar kuyruğa girmez
+    type(video).objects.filter(pk=video.pk).update(**fields)
+    for key, value in fields.items():
+        setattr(video, key, value)
+    # poster için WebP/AVIF türevleri
+    generate_for_instance(video, 'poster')
+    return fields
@@ -1,11 +1,29 @@
-from django.shortcuts import render
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError
+from django.shortcuts import get_object_or_404, render
 from homepage.models import *
 from companyinfo.models import *
 from urllib.parse import urlparse, parse_qs
 from core.models import *
+from core.loaders import HOMEPAGE_PARTS, ahomepage_context, homepage_context, homepage_parts
+from core.catalog import (
+    InvalidCatalogQuery, acatalog_page, catalog_page, next_page_url, parse_filters, parse_limit, product_as_dict,
+)
+from core import facets, search, stock
+from core.cache import versioned_cache_page, content_condition
+from core.preload import homepage_preloads, preload_hints
 # Create your views here.
 
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.template.context import make_context
+from django.template.loader import get_template, render_to_string
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 
 
 def yt_embed_url(raw_url: str) -> str:
@@ -28,25 +46,184 @@ def yt_embed_url(raw_url: str) -> str:
         video_id = (qs.get('v') or [''])[0]
 
     return f'https://www.youtube.com/embed/{video_id}' if video_id else ''
+
+
+def _render_parts(request, parts, context):
+    """
+    (şablon adı, context eki) çiftlerini sırayla render edip parça parça
+    döner. Parçalar tek bir RequestContext'i paylaşır; context işlemcileri
+    bir kez çalışır.
+    """
+    context = make_context(context, request)
+    parts = iter(parts)
+    template_name, data = next(parts)
+    template = get_template(template_name).template
+    with context.bind_template(template):
+        context.update(data)
+        yield template.render(context)
+        for template_name, data in parts:
+            context.update(data)
+            yield get_template(template_name).template.render(context)
+
+
+def _homepage_streaming():
+    return getattr(settings, 'HOMEPAGE_STREAMING', True)
+
+
+@preload_hints(homepage_preloads)
+@content_condition
+@versioned_cache_page('index')
 def index(request):
-    hero = Hero_section.objects.first()
-    context = {
-        'hero_section': Hero_section.objects.first(),
-        'about_section': About_section.objects.first(),
-        'statistic_area': Statistics_area.objects.all(),
-        'our_values' : Our_values.objects.all(),
-        'faq' : Faq.objects.all(),
-        'company' : Company.objects.first(),
-        'hero_youtube_embed': yt_embed_url(hero.youtube_url) if hero else '',
-        'categories' : Category.objects.all(),
-        'series' : SeriesCategory.objects.all(),
-        'models' : ModelCategory.objects.all(),
-        'products' : Product.objects.all(),
-        'product_img' : ProductImage.objects.first(),
-        'business_partner' : Business_partner.objects.all(),
-        'branches' : Branch.objects.all(),
-        'phone_number' : BranchPhoneNumber.objects.all(),
+    if not _homepage_streaming():
+        return render(request, 'core/index.html', {**homepage_context(), 'preloads': homepage_preloads()})
+    # <head> sorgusuz gider; her bölüm verisi yüklenince arkasından akar
+    return StreamingHttpResponse(_render_parts(request, homepage_parts(), {'preloads': homepage_preloads()}))
+
+
+async def _astream_homepage(request, preloads):
+    parts = [(template_name, {}) for template_name, keys in HOMEPAGE_PARTS]
+    chunks = _render_parts(request, parts, {'preloads': preloads})
+    # şablon render'ı event loop'u bloklamasın
+    yield await sync_to_async(next)(chunks)
+    # <head> gönderildi; bölümler aynı anda yüklenir, kalan parçalar tek seferde render edilir
+    parts[1][1].update(await ahomepage_context())
+    yield await sync_to_async(''.join)(chunks)
+
+
+# ASGI (uvicorn) altında settings.ASYNC_VIEWS ile bu sürümler kullanılır
+@preload_hints(homepage_preloads)
+@content_condition
+@versioned_cache_page('index')
+async def index_async(request):
+    preloads = await sync_to_async(homepage_preloads)()
+    if not _homepage_streaming():
+        context = await ahomepage_context()
+        return await sync_to_async(render)(request, 'core/index.html', {**context, 'preloads': preloads})
+    return StreamingHttpResponse(_astream_homepage(request, preloads))
+
+
+def _catalog_context(request, filters, products, next_cursor, facet_groups):
+    total, groups = facet_groups
+    return {
+        'products': products,
+        'filters': filters,
+        'next_url': next_page_url('catalog', next_cursor, request.GET),
+        'total': total,
+        'facet_groups': groups,
+    }
+
 
+def catalog(request):
+    try:
+        filters = parse_filters(request.GET)
+        products, next_cursor = catalog_page(filters, request.GET.get('cursor'))
+    except InvalidCatalogQuery as exc:
+        return HttpResponseBadRequest(str(exc))
+    context = _catalog_context(request, filters, products, next_cursor, facets.facet_groups(filters))
+    return render(request, 'core/catalog.html', context)
+
+
+async def catalog_async(request):
+    try:
+        filters = parse_filters(request.GET)
+        (products, next_cursor), facet_groups = await asyncio.gather(
+            acatalog_page(filters, request.GET.get('cursor')),
+            sync_to_async(facets.facet_groups)(filters),
+        )
+    except InvalidCatalogQuery as exc:
+        return HttpResponseBadRequest(str(exc))
+    context = _catalog_context(request, filters, products, next_cursor, facet_groups)
+    return await sync_to_async(render)(request, 'core/catalog.html', context)
+
+
+def catalog_facets_api(request):
+    """Seçili filtrelerle eşleşen ürün sayısı ve her seçeneğin sayısı (sorgusuz, bellekteki indeksten)."""
+    try:
+        filters = parse_filters(request.GET)
+    except InvalidCatalogQuery as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    total, groups = facets.facet_groups(filters)
+    return JsonResponse({'total': total, 'facets': groups})
+
+
+def product_detail(request, pk):
+    queryset = (Product.objects
+                .select_related('category', 'series', 'model')
+                .prefetch_related('images', 'video'))
+    product = get_object_or_404(queryset, pk=pk)
+    return render(request, 'core/product_detail.html', {'product': product})
+
+
+def _catalog_api_data(request, products, next_cursor):
+    return {
+        'results': [product_as_dict(product) for product in products],
+        'next_cursor': next_cursor,
+        'next': next_page_url('catalog_api', next_cursor, request.GET),
     }
-    return render(request,'core/index.html',context)
 
+
+def catalog_api(request):
+    try:
+        filters = parse_filters(request.GET)
+        products, next_cursor = catalog_page(filters, request.GET.get('cursor'), parse_limit(request.GET))
+    except InvalidCatalogQuery as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    data = _catalog_api_data(request, products, next_cursor)
+    # "daha fazla" butonu hazır HTML kartları ister
+    if request.GET.get('html'):
+        data['html'] = render_to_string('core/partials/product_cards.html', {'products': products}, request)
+    return JsonResponse(data)
+
+
+async def catalog_api_async(request):
+    try:
+        filters = parse_filters(request.GET)
+        products, next_cursor = await acatalog_page(filters, request.GET.get('cursor'), parse_limit(request.GET))
+    except InvalidCatalogQuery as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    data = _catalog_api_data(request, products, next_cursor)
+    if request.GET.get('html'):
+        data['html'] = await sync_to_async(render_to_string)(
+            'core/partials/product_cards.html', {'products': products}, request)
+    return JsonResponse(data)
+
+
+def product_search(request):
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 20)), 100))
+        offset = max(0, int(request.GET.get('offset', 0)))
+    except ValueError:
+        return JsonResponse({'error': "'limit' ve 'offset' sayısal olmalı."}, status=400)
+    results = []
+    for hit in search.search(query, limit=limit, offset=offset):
+        item = product_as_dict(hit['product'])
+        item.update({'name': hit['name'], 'snippet': hit['snippet'], 'rank': hit['rank']})
+        results.append(item)
+    return JsonResponse({'query': query, 'results': results})
+
+
+@csrf_exempt
+@require_POST
+def stock_movements_api(request):
+    """
+    Depo sisteminin stok hareketleri (bkz. core.stock.parse_movements).
+    Aynı istek tekrar gönderilirse daha önce uygulanan referanslar
+    'duplicates' içinde döner, stok ikinci kez değişmez.
+    """
+    token = settings.WAREHOUSE_API_TOKEN
+    if not token or not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return JsonResponse({'error': "Yetkisiz."}, status=401)
+    try:
+        payload = json.loads(request.body)
+        movements = stock.parse_movements(payload)
+        result = stock.apply_movements(movements, allow_negative=payload.get('allow_negative') is not False)
+    except ValueError as exc:
+        # JSON hatası ya da InvalidStockMovement
+        return JsonResponse({'error': str(exc)}, status=400)
+    except stock.StockError as exc:
+        return JsonResponse({'error': str(exc), 'products': exc.product_ids}, status=409)
+    except IntegrityError:
+        # aynı referans eşzamanlı başka bir istekle yazıldı; tekrar denenebilir
+        return JsonResponse({'error': "Eşzamanlı istek çakıştı, tekrar deneyin."}, status=409)
+    return JsonResponse({'applied': result.applied, 'duplicates': result.duplicates})
@@ -4,6 +4,8 @@ from django.utils.html import format_html
 from django.db import models            # <-- DB alan tipi buradan
 from django.forms import Textarea        # <-- Widget buradan
 
+from core.site_settings import site_settings
+
 from .models import Hero_section, About_section, Statistics_area, Our_values, Faq, Business_partner
 
 class CompactTextareaAdmin(admin.ModelAdmin):
@@ -39,7 +41,8 @@ class HeroSectionAdmin(CompactTextareaAdmin):
 
     # Bu alan genelde tek kayıtla yönetilir; istersen eklemeyi 1 kayıtla sınırla:
     def has_add_permission(self, request):
-        if Hero_section.objects.count() >= 1:
+        # her admin sayfasında count() yerine süreç içi önbellek
+        if site_settings()['hero'] is not None:
             return False
         return super().has_add_permission(request)
 
@@ -5,6 +5,7 @@ class Hero_section(models.Model):
     description = models.TextField(verbose_name='Açıklama')
     image = models.ImageField(upload_to='home_page_images', verbose_name='Fotoğraf')
     youtube_url = models.URLField(verbose_name='Youtube URL')
+    updated = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
@@ -20,6 +21,7 @@ class About_section(models.Model):
     home_description = models.TextField(verbose_name='Ana Sayfa Açıklaması')
     detail_description = models.TextField(verbose_name='Detaylı Açıklama')  # yazım düzeltildi
     image = models.ImageField(verbose_name='Fotoğraf')
+    updated = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.header
@@ -34,6 +36,7 @@ class Statistics_area(models.Model):
     title= models.CharField(max_length=100, verbose_name='Başlık')
     value = models.IntegerField(verbose_name='Değer')
     icon  = models.CharField(max_length=100, verbose_name='İkon')
+    updated = models.DateTimeField(auto_now=True)
 
 
     def __str__(self):
@@ -48,6 +51,7 @@ class Our_values(models.Model):
     title = models.CharField(max_length=100, verbose_name="Başlık")
     description = models.TextField(verbose_name='Açıklama')
     image = models.ImageField(verbose_name='Fotoğraf')
+    updated = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
@@ -60,6 +64,7 @@ class Our_values(models.Model):
 class Faq(models.Model):
     question = models.TextField(verbose_name='Soru')
     answer = models.TextField(verbose_name='Cevap')
+    updated = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.question
@@ -73,6 +78,7 @@ class Business_partner(models.Model):
     name = models.CharField(max_length=100, verbose_name="Firma İsmi")
     image = models.ImageField(upload_to='business_partner', verbose_name='Fotoğraf')
     img_alt = models.CharField(max_length=100,verbose_name="Fotoğraf Alt Etiketi")
+    updated = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -0,0 +1,24 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'key', 'status', 'attempts', 'max_attempts', 'run_after', 'updated')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'key', 'last_error')
+    ordering = ('-updated',)
+    readonly_fields = ('name', 'key', 'payload', 'status', 'attempts', 'locked_by', 'locked_at',
+                       'last_error', 'created', 'updated')
+    actions = ('retry_jobs',)
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Seçili işleri yeniden kuyruğa al")
+    def retry_jobs(self, request, queryset):
+        count = queryset.exclude(status=Job.RUNNING).update(
+            status=Job.PENDING, attempts=0, run_after=timezone.now(), last_error='')
+        self.message_user(request, f"{count} iş yeniden kuyruğa alındı.")
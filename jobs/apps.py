@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+    verbose_name = 'Arka Plan İşleri'
+
+    def ready(self):
+        # her uygulamanın tasks.py modülündeki işleyiciler kayıt olsun
+        from django.utils.module_loading import autodiscover_modules
+        autodiscover_modules('tasks')
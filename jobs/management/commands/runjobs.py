@@ -0,0 +1,89 @@
+import logging
+import os
+import socket
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from jobs.queue import claim_jobs, heartbeat, release_stale_jobs, run_job_by_id
+
+logger = logging.getLogger('jobs.queue')
+
+
+def _run_in_thread(pk):
+    try:
+        return run_job_by_id(pk)
+    finally:
+        # her iş parçacığı kendi bağlantısını açar; iş bitince kapatılır
+        connections.close_all()
+
+
+def _init_process():
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = "Kuyruktaki arka plan işlerini çalıştırır."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--executor', choices=('thread', 'process'), default='thread')
+        parser.add_argument('--concurrency', type=int, default=2)
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Boş kuyrukta bekleme süresi (sn)")
+        parser.add_argument('--once', action='store_true', help="Hazır işleri bitirip çık")
+
+    def make_executor(self, kind, concurrency):
+        if kind == 'process':
+            executor = ProcessPoolExecutor(
+                max_workers=concurrency,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_process,
+            )
+            return executor, run_job_by_id
+        return ThreadPoolExecutor(max_workers=concurrency), _run_in_thread
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        executor, task = self.make_executor(options['executor'], concurrency)
+
+        self.stdout.write(f"İşçi başladı: {worker_id} ({options['executor']} x{concurrency})")
+        running = {}
+        try:
+            while True:
+                close_old_connections()
+                heartbeat(worker_id, list(running.values()))
+                release_stale_jobs()
+                free = concurrency - len(running)
+                claimed = claim_jobs(worker_id, limit=free) if free else []
+                running.update((executor.submit(task, pk), pk) for pk in claimed)
+
+                if not running:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                done, _ = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    pk = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as exc:
+                        # iş RUNNING kalır; release_stale_jobs süresi dolunca tekrar kuyruğa alır
+                        logger.exception("İş #%s çalıştırılamadı", pk)
+                        broken = broken or isinstance(exc, BrokenExecutor)
+                if broken:
+                    # çöken süreç havuzu yeni iş kabul etmez; bekleyenler de aynı hatayla döner
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    for pk in running.values():
+                        logger.error("İş #%s çalışırken süreç havuzu çöktü", pk)
+                    running = {}
+                    executor, task = self.make_executor(options['executor'], concurrency)
+        except KeyboardInterrupt:
+            self.stdout.write("İşçi durduruluyor...")
+        finally:
+            executor.shutdown()
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='İş Tipi')),
+                ('key', models.CharField(blank=True, max_length=255, null=True, unique=True, verbose_name='Anahtar')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Veri')),
+                ('status', models.CharField(choices=[('pending', 'Bekliyor'), ('running', 'Çalışıyor'), ('done', 'Tamamlandı'), ('failed', 'Başarısız')], default='pending', max_length=10, verbose_name='Durum')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Deneme')),
+                ('max_attempts', models.PositiveIntegerField(default=5, verbose_name='Azami Deneme')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Çalışma Zamanı')),
+                ('requeue', models.BooleanField(default=False, editable=False)),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='İşçi')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='Alınma Zamanı')),
+                ('last_error', models.TextField(blank=True, verbose_name='Son Hata')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'İş',
+                'verbose_name_plural': 'İşler',
+                'ordering': ['run_after', 'id'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='jobs_job_status_babf0b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Bekliyor'),
+        (RUNNING, 'Çalışıyor'),
+        (DONE, 'Tamamlandı'),
+        (FAILED, 'Başarısız'),
+    )
+
+    name = models.CharField(max_length=100, verbose_name='İş Tipi')
+    # aynı anahtarla ikinci kez kuyruğa eklenen iş yeni kayıt oluşturmaz
+    key = models.CharField(max_length=255, unique=True, blank=True, null=True, verbose_name='Anahtar')
+    payload = models.JSONField(default=dict, blank=True, verbose_name='Veri')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name='Durum')
+    attempts = models.PositiveIntegerField(default=0, verbose_name='Deneme')
+    max_attempts = models.PositiveIntegerField(default=5, verbose_name='Azami Deneme')
+    run_after = models.DateTimeField(default=timezone.now, verbose_name='Çalışma Zamanı')
+    # çalışırken tekrar kuyruğa eklendiyse bittiğinde yeniden çalıştırılır
+    requeue = models.BooleanField(default=False, editable=False)
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name='İşçi')
+    locked_at = models.DateTimeField(blank=True, null=True, verbose_name='Alınma Zamanı')
+    last_error = models.TextField(blank=True, verbose_name='Son Hata')
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.get_status_display()})"
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        verbose_name = 'İş'
+        verbose_name_plural = 'İşler'
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
@@ -0,0 +1,171 @@
+"""
+Veritabanı tabanlı basit iş kuyruğu. Broker gerektirmez; SQLite'ta da çalışır.
+
+    from jobs.queue import register, enqueue
+
+    @register('images.process')
+    def process_image(payload):
+        ...
+
+    enqueue('images.process', {'pk': 1}, key='images.process:1')
+
+İşler `manage.py runjobs` ile çalıştırılır.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+RETRY_BASE_SECONDS = getattr(settings, 'JOBS_RETRY_BASE_SECONDS', 30)
+RETRY_MAX_SECONDS = getattr(settings, 'JOBS_RETRY_MAX_SECONDS', 60 * 60)
+# bu süreden uzun RUNNING kalan iş, çöken bir işçiden kalmış sayılır. Çalışan
+# işçi işlerinin locked_at'ini her turda yeniler (heartbeat); uzun işler (video
+# dönüştürme) bu süreyi aşsa da ikinci bir işçiye verilmez
+STALE_AFTER = timedelta(seconds=getattr(settings, 'JOBS_STALE_AFTER_SECONDS', 30 * 60))
+
+
+def register(name):
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def get_handler(name):
+    return _handlers[name]
+
+
+def enqueue(name, payload=None, key=None, max_attempts=5, delay=0, keep_schedule=False):
+    """
+    İşi kuyruğa ekler. Aynı anahtarlı iş bekliyorsa yeni kayıt açılmaz;
+    çalışıyorsa bittikten sonra bir kez daha çalıştırılmak üzere işaretlenir.
+    keep_schedule: bekleyen işin çalışma zamanı ertelenmez; sık tetiklenen
+    gecikmeli işler (ör. facets.prune) böylece sonsuza dek ötelenmez.
+    JOBS_EAGER ayarı açıksa iş hemen bu süreçte çalıştırılır.
+    """
+    payload = payload or {}
+    run_after = timezone.now() + timedelta(seconds=delay)
+    defaults = {
+        'name': name, 'payload': payload, 'status': Job.PENDING, 'attempts': 0,
+        'max_attempts': max_attempts, 'run_after': run_after, 'last_error': '',
+    }
+    if key is None:
+        job = Job.objects.create(**defaults)
+    else:
+        job = _enqueue_keyed(key, defaults, keep_schedule)
+
+    if getattr(settings, 'JOBS_EAGER', False) and job.status == Job.PENDING:
+        run_job(job)
+    return job
+
+
+def _enqueue_keyed(key, defaults, keep_schedule=False):
+    with transaction.atomic():
+        job = Job.objects.filter(key=key).first()
+        if job is None:
+            try:
+                with transaction.atomic():
+                    return Job.objects.create(key=key, **defaults)
+            except IntegrityError:
+                # başka bir süreç aynı anda ekledi
+                job = Job.objects.get(key=key)
+
+        if job.status == Job.RUNNING:
+            Job.objects.filter(pk=job.pk).update(requeue=True, payload=defaults['payload'])
+        elif keep_schedule and job.status == Job.PENDING:
+            Job.objects.filter(pk=job.pk).update(**{k: v for k, v in defaults.items() if k != 'run_after'})
+        else:
+            Job.objects.filter(pk=job.pk).update(**defaults)
+        job.refresh_from_db()
+        return job
+
+
+def heartbeat(worker_id, job_ids):
+    """İşçinin hâlâ çalıştırdığı işlerin kilit zamanını yeniler."""
+    if not job_ids:
+        return 0
+    return (Job.objects
+            .filter(pk__in=job_ids, status=Job.RUNNING, locked_by=worker_id)
+            .update(locked_at=timezone.now()))
+
+
+def release_stale_jobs():
+    cutoff = timezone.now() - STALE_AFTER
+    return (Job.objects
+            .filter(status=Job.RUNNING, locked_at__lt=cutoff)
+            .update(status=Job.PENDING, locked_by='', locked_at=None))
+
+
+def claim_jobs(worker_id, limit=1):
+    """
+    Çalışma zamanı gelmiş işlerden en fazla `limit` tanesini bu işçiye ayırır.
+    Koşullu UPDATE ile alınır; iki işçi aynı işi alamaz (SELECT FOR UPDATE gerekmez).
+    """
+    now = timezone.now()
+    # adaylar, hemen ardından güncellenecekleri yazar bağlantısından okunur (okuma replikası varsa)
+    candidates = (Job.objects.using(router.db_for_write(Job))
+                  .filter(status=Job.PENDING, run_after__lte=now)
+                  .values_list('pk', flat=True)[:limit * 2])
+    claimed = []
+    for pk in candidates:
+        updated = (Job.objects
+                   .filter(pk=pk, status=Job.PENDING)
+                   .update(status=Job.RUNNING, locked_by=worker_id, locked_at=now,
+                           attempts=F('attempts') + 1))
+        if updated:
+            claimed.append(pk)
+            if len(claimed) >= limit:
+                break
+    return claimed
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), RETRY_MAX_SECONDS))
+
+
+def run_job(job):
+    """Tek bir işi çalıştırır ve sonucunu kaydeder. Başarılıysa True döner."""
+    if job.status != Job.RUNNING:
+        Job.objects.filter(pk=job.pk).update(status=Job.RUNNING, attempts=F('attempts') + 1,
+                                             locked_at=timezone.now())
+        job.refresh_from_db()
+    try:
+        get_handler(job.name)(job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("İş başarısız oldu: %s (deneme %s/%s)", job, job.attempts, job.max_attempts)
+        with transaction.atomic():
+            # çalışırken gelen yeni istek (ve yükü) başarısızlıkta da kaybolmaz; sayaç sıfırlanır
+            requeue = Job.objects.filter(pk=job.pk, requeue=True).update(
+                status=Job.PENDING, requeue=False, attempts=0, run_after=timezone.now(),
+                last_error=error, locked_by='', locked_at=None)
+            if not requeue:
+                if job.attempts >= job.max_attempts:
+                    fields = {'status': Job.FAILED}
+                else:
+                    fields = {'status': Job.PENDING, 'run_after': timezone.now() + retry_delay(job.attempts)}
+                Job.objects.filter(pk=job.pk).update(last_error=error, locked_by='', locked_at=None, **fields)
+        return False
+
+    with transaction.atomic():
+        requeue = Job.objects.filter(pk=job.pk, requeue=True).update(
+            status=Job.PENDING, requeue=False, attempts=0, run_after=timezone.now(),
+            locked_by='', locked_at=None)
+        if not requeue:
+            Job.objects.filter(pk=job.pk).update(status=Job.DONE, last_error='', locked_by='', locked_at=None)
+    return True
+
+
+def run_job_by_id(pk):
+    job = Job.objects.using(router.db_for_write(Job)).filter(pk=pk).first()
+    return run_job(job) if job else False
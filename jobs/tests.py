@@ -0,0 +1,107 @@
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from .models import Job
+from .queue import STALE_AFTER, claim_jobs, enqueue, heartbeat, register, release_stale_jobs, run_job
+
+calls = []
+
+
+@register('test.record')
+def record(payload):
+    calls.append(payload)
+
+
+@register('test.fail')
+def fail(payload):
+    raise ValueError('bozuk')
+
+
+class QueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_keyed_enqueue_is_idempotent(self):
+        enqueue('test.record', {'n': 1}, key='k')
+        enqueue('test.record', {'n': 2}, key='k')
+        job = Job.objects.get()
+        self.assertEqual(job.payload, {'n': 2})
+        self.assertEqual(job.status, Job.PENDING)
+
+    def test_keep_schedule_does_not_postpone_pending_job(self):
+        job = enqueue('test.record', key='k', delay=60)
+        enqueue('test.record', {'n': 2}, key='k', delay=3600, keep_schedule=True)
+        self.assertEqual(Job.objects.get().run_after, job.run_after)
+        enqueue('test.record', key='k', delay=3600)
+        self.assertGreater(Job.objects.get().run_after, job.run_after)
+
+    def test_claim_is_exclusive(self):
+        enqueue('test.record', key='k')
+        self.assertEqual(len(claim_jobs('a')), 1)
+        self.assertEqual(claim_jobs('b'), [])
+
+    def test_heartbeat_keeps_long_job_from_going_stale(self):
+        job = enqueue('test.record', key='k')
+        claim_jobs('a')
+        Job.objects.update(locked_at=timezone.now() - STALE_AFTER * 2)
+        self.assertEqual(heartbeat('b', [job.pk]), 0)
+        self.assertEqual(heartbeat('a', [job.pk]), 1)
+        self.assertEqual(release_stale_jobs(), 0)
+        Job.objects.update(locked_at=timezone.now() - STALE_AFTER * 2)
+        self.assertEqual(release_stale_jobs(), 1)
+
+    def test_failure_backs_off_then_fails(self):
+        job = enqueue('test.fail', max_attempts=2)
+        self.assertFalse(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.PENDING, 1))
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn('bozuk', job.last_error)
+
+        self.assertFalse(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+    def test_enqueue_while_failing_job_runs_is_kept(self):
+        job = enqueue('test.fail', {'n': 1}, key='k', max_attempts=1)
+        claim_jobs('a')
+        enqueue('test.fail', {'n': 2}, key='k', max_attempts=1)
+        self.assertFalse(run_job(Job.objects.get(pk=job.pk)))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.payload, job.attempts, job.requeue), (Job.PENDING, {'n': 2}, 0, False))
+        self.assertIn('bozuk', job.last_error)
+
+    def test_enqueue_while_running_requeues(self):
+        job = enqueue('test.record', {'n': 1}, key='k')
+        claim_jobs('a')
+        enqueue('test.record', {'n': 2}, key='k')
+        job.refresh_from_db()
+        self.assertTrue(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.payload), (Job.PENDING, {'n': 2}))
+
+
+
+class WorkerTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_worker_runs_ready_jobs(self):
+        enqueue('test.record', {'n': 1})
+        enqueue('test.record', {'n': 2}, delay=3600)
+        call_command('runjobs', '--once', '--concurrency', '1', stdout=open('/dev/null', 'w'))
+        self.assertEqual(calls, [{'n': 1}])
+        self.assertEqual(Job.objects.filter(status=Job.DONE).count(), 1)
+
+    def test_worker_survives_task_error(self):
+        first = enqueue('test.record', {'n': 1})
+        enqueue('test.record', {'n': 2})
+        run_job_by_id = mock.Mock(side_effect=[RuntimeError('bağlantı koptu'), True])
+        with mock.patch('jobs.management.commands.runjobs.run_job_by_id', run_job_by_id), \
+                self.assertLogs('jobs.queue', 'ERROR') as logs:
+            call_command('runjobs', '--once', '--concurrency', '1', stdout=open('/dev/null', 'w'))
+        self.assertEqual(run_job_by_id.call_count, 2)
+        self.assertIn(f'İş #{first.pk} çalıştırılamadı', logs.output[0])
@@ -5,6 +5,16 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+uvicorn ile çalıştırma:
+
+    pip install uvicorn
+    # settings.ASYNC_VIEWS = True: ana sayfa ve katalog async görünümlerle sunulur
+    uvicorn omeroglu.asgi:application --host 0.0.0.0 --port 8000 --workers 4
+
+Statik dosyalar (StaticFilesMiddleware) ve medya (core.media.serve) ASGI'de
+async iterator ile parça parça gönderilir. Tüm yollar aynı sunucudan çıkar.
+WSGI ile ölçüm karşılaştırması: manage.py bench_server --test-db
 """
 
 import os
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,10 +42,15 @@ INSTALLED_APPS = [
     'django_ckeditor_5',
     'homepage',
     'companyinfo',
+    'jobs',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticFilesMiddleware',
+    'core.middleware.ProfilingMiddleware',
+    'core.middleware.InstrumentationMiddleware',
+    'core.middleware.DatabaseRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -66,12 +72,19 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.site_settings',
+                'core.context_processors.taxonomy',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'omeroglu.wsgi.application'
+ASGI_APPLICATION = 'omeroglu.asgi.application'
+# uvicorn ile (omeroglu.asgi) çalışırken True yapın: ana sayfa ve katalog async görünümlerle sunulur
+ASYNC_VIEWS = False
+# ana sayfa parça parça akıtılır: <head> ve preload'lar ilk sorgudan önce gönderilir (core.views.index)
+HOMEPAGE_STREAMING = True
 
 
 # Database
@@ -84,6 +97,44 @@ DATABASES = {
     }
 }
 
+# SQLite üretim modu (core.db): bağlantı başına WAL ve performans pragmaları,
+# kalıcı bağlantılar ve herkese açık okumalar için aynı dosyaya salt okunur
+# 'replica' bağlantısı. Admin ve yazma istekleri 'default'u kullanır.
+SQLITE_PRODUCTION = os.environ.get('SQLITE_PRODUCTION', '0') == '1'
+if SQLITE_PRODUCTION:
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': int(os.environ.get('CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    })
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': DATABASES['default']['NAME'],
+        'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['core.db.ReadWriteRouter']
+
+
+# Cache
+# Ana sayfa cache'i sürüm anahtarıyla çalışır; dosya tabanlı backend gunicorn
+# işçileri arasında paylaşılır ve Redis gerektirmez. Tek süreçte
+# 'django.core.cache.backends.locmem.LocMemCache' de kullanılabilir.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    }
+}
+# testler bu klasör yerine LocMem cache kullanır (bkz. core.test_runner)
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -131,8 +182,89 @@ STATICFILES_DIRS = (
     BASE_DIR / 'core/static',
 )
 STATIC_ROOT = BASE_DIR / "static_collected"
+
+# DEBUG kapalıyken collectstatic özetli adlar, paketler ve .gz kopyaları üretir;
+# dosyalar nginx olmadan StaticFilesMiddleware ile sunulur
+SERVE_STATIC_FILES = not DEBUG
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': ('django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+                    else 'core.staticfiles.CompressedManifestStaticFilesStorage'),
+    },
+}
+STATIC_BUNDLES = {
+    'core/bundles/site.css': [
+        'core/vendor/bootstrap/css/bootstrap.min.css',
+        'core/vendor/bootstrap-icons/bootstrap-icons.css',
+        'core/vendor/aos/aos.css',
+        'core/vendor/glightbox/css/glightbox.min.css',
+        'core/vendor/swiper/swiper-bundle.min.css',
+        'core/css/main.css',
+    ],
+    'core/bundles/vendor.js': [
+        'core/vendor/bootstrap/js/bootstrap.bundle.min.js',
+        'core/vendor/php-email-form/validate.js',
+        'core/vendor/aos/aos.js',
+        'core/vendor/glightbox/js/glightbox.min.js',
+        'core/vendor/purecounter/purecounter_vanilla.js',
+        'core/vendor/imagesloaded/imagesloaded.pkgd.min.js',
+        'core/vendor/isotope-layout/isotope.pkgd.min.js',
+        'core/vendor/swiper/swiper-bundle.min.js',
+    ],
+    'core/bundles/site.js': [
+        'core/js/main.js',
+        'core/js/catalog.js',
+    ],
+}
 MEDIA_ROOT = BASE_DIR / 'media'
 MEDIA_URL = '/media/'
+# yüklenen dosyalar Range/If-Range destekli core.media.serve ile sunulur; üretimde
+# bunu önündeki sunucu (nginx) yapar, uygulama yalnızca SERVE_MEDIA_FILES=1 ile sunar
+SERVE_MEDIA_FILES = os.environ.get('SERVE_MEDIA_FILES', '1' if DEBUG else '0') == '1'
+
+# Arka plan işleri (jobs uygulaması). True ise işler kuyruğa yazılmadan
+# hemen o süreçte çalıştırılır; worker çalıştırmadan geliştirme için.
+JOBS_EAGER = False
+
+# İstek başına sorgu/şablon/cache ölçümleri (core.instrumentation): Server-Timing
+# başlığı ve 'core.metrics' log satırı; eşiği aşan isteklerde en yavaş sorguların
+# EXPLAIN çıktısı da loglanır. Her sorguyu sardığından varsayılan kapalıdır;
+# REQUEST_METRICS=1 ortam değişkeniyle açılır
+REQUEST_METRICS = os.environ.get('REQUEST_METRICS', '0') == '1'
+REQUEST_METRICS_SLOW_MS = int(os.environ.get('REQUEST_METRICS_SLOW_MS', '1000'))
+REQUEST_METRICS_HEADER = 'all' if DEBUG else 'staff'
+
+# İsteğe bağlı örnekleyici profil (core.profiling): isteklerin REQUEST_PROFILE_RATE
+# oranı ya da `manage.py profile_token` belirteci taşıyanlar profillenir ve
+# admin'de "Profil Kayıtları" altında listelenir
+REQUEST_PROFILE = os.environ.get('REQUEST_PROFILE', '1') == '1'
+REQUEST_PROFILE_RATE = float(os.environ.get('REQUEST_PROFILE_RATE', '0'))
+REQUEST_PROFILE_INTERVAL_MS = float(os.environ.get('REQUEST_PROFILE_INTERVAL_MS', '5'))
+REQUEST_PROFILE_TOKEN_MAX_AGE = 3600
+REQUEST_PROFILE_KEEP = 500
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        # INFO: her istek için bir satır; varsayılan yalnızca yavaş istekler
+        'core.metrics': {
+            'handlers': ['console'],
+            'level': os.environ.get('REQUEST_METRICS_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+# Depo sisteminin stok API'si (core.views.stock_movements_api) için
+# "Authorization: Bearer <token>"; boşsa API kapalıdır.
+WAREHOUSE_API_TOKEN = os.environ.get('WAREHOUSE_API_TOKEN', '')
 
 CKEDITOR_5_UPLOAD_PATH = "uploads/"
 CKEDITOR_5_IMAGE_BACKEND = "pillow"